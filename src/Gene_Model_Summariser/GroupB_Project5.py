@@ -1,44 +1,207 @@
 # Project 5 - Gene Model Summariser
-import pandas as pd
-import os
-import gffutils
+# Heavy dependencies (pandas, gffutils, Bio, jinja2, matplotlib) are imported inside the stages that use them,
+# so the CLI starts quickly and --validate-only never loads the reporting stack.
 import logging
+import os
 import sqlite3
-from typing import Optional
+from collections.abc import Callable, Mapping
+from dataclasses import replace
 from pathlib import Path
-from .fasta_validator import FastaChecker
-from .QC_check import QC_flags
-from .gff_parser import GFF_Parser
+from typing import TYPE_CHECKING
+
 from .gff_validator import check_db, validate_raw_gff_lines
-from .qc_flags_bed import TranscriptWithFlags, write_qc_bed
-from .build_gff import build_gff
-from .run_json_builder import make_run_json_file
-from .run_json_builder import finalise_run_json_file
-from .html_generation import run_report
+from .log_pipeline import flush_logs, start_run_log
+from .parquet_output import PARQUET_FILENAME, parquet_available
+from .results_db import RESULTS_DB_FILENAME
+from .run_json_builder import finalise_run_json_file, make_run_json_file
+from .run_options import RunOptions
+from .stage_cache import StageCache, stage_key
+
+#per-transcript outputs written by output_results, reused together by the stage cache
+QC_OUTPUTS = ["transcript_summary.tsv", "qc_flagged.bed", "qc_flags.gff3", "explorer"]
+
+if TYPE_CHECKING:
+    import gffutils
+
+    from .fasta_validator import FastaChecker
+    from .packed_genome import PackedGenome
 
 
 # This is the main function for the Gene Model Summariser. 
-def main(gff_file: str, fasta_file: Optional[str] = None, output_dir: str = ".") -> None:
+def main(gff_file: str, fasta_file: str | None = None, output_dir: str = ".", options: RunOptions | None = None, *,
+         reference: Mapping | None = None, db: "gffutils.FeatureDB | None" = None,
+         progress: Callable[[str], None] | None = None, resume: bool = False) -> None:
     """
     Main function for the Gene Model Summariser.
     gff_file: Path to the GFF file.
     fasta_file: Optional path to the FASTA file.
     output_dir: Directory where output files will be saved.
+    options: the run's options (report, outputs, caches; see run_options.RunOptions); the defaults when None.
+    reference: fasta_file already validated and loaded ({seqid: SeqRecord} or a SharedGenome), e.g. by batch mode; FASTA validation and parsing are skipped.
+    db: gff_file's database already loaded and validated (e.g. cached by the daemon); GFF validation and loading are skipped.
+    progress: called with the name of each stage as it starts (validate, qc, outputs, report) and "done" at the end.
+    resume: continue the interrupted streaming run in output_dir from its checkpoint (see checkpoint.py) instead of starting
+    again; validation and the chromosomes already committed are skipped. Streaming runs always keep a checkpoint.
     """
+    def stage(name: str) -> None:
+        if progress:
+            progress(name)
+
     out_dir = Path(output_dir) #makes and set the output dir for run.json file 
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    logger = setup_logger(out_dir / "gene_model_summariser.log") # Setup logger to save into the same outdir
+    options = options or RunOptions()
+    if resume:
+        options = replace(options, streaming=True)
+    logger = setup_logger(out_dir / "gene_model_summariser.log", json_log=options.json_log) # Setup logger to save into the same outdir
+    if options.parquet and not parquet_available():
+        logger.error("Parquet output needs pyarrow: pip install 'GroupB-tool[parquet]'")
+        raise SystemExit(1)
+
+    if not (resume and (out_dir / "run.json").exists()): # a resumed run keeps its original start time and inputs
+        make_run_json_file(
+            gff_file=Path(gff_file),
+            fasta_file=Path(fasta_file) if fasta_file else None,
+            output_dir=out_dir,
+            results_filename="transcript_summary.tsv",
+            html_filename="report.html",
+            run_filename="run.json",
+        )
 
-    make_run_json_file(
-        gff_file=Path(gff_file),
-        fasta_file=Path(fasta_file) if fasta_file else None,
-        output_dir=out_dir,
-        results_filename="transcript_summary.tsv",
-        html_filename="report.html",
-        run_filename="run.json",
-    )
+    cache = StageCache(out_dir, enabled=options.stage_cache) # reuse of unchanged stages from earlier runs (see stage_cache.py)
+    #content hashes read the whole GFF and FASTA, so they are only taken for the stage cache and streaming checkpoints
+    hash_inputs = options.stage_cache or options.streaming
+    gff_digest = cache.fingerprint(gff_file) if hash_inputs else None
+    fasta_digest = cache.fingerprint(fasta_file) if hash_inputs else None
+    gff_key = stage_key("gff_validation", gff=gff_digest)
+    fasta_key = stage_key("fasta_validation", fasta=fasta_digest)
+    qc_key = stage_key("qc", gff=gff_digest, fasta=fasta_digest, explorer=options.explorer, streaming=options.streaming,
+                       sqlite=options.sqlite, parquet=options.parquet)
 
+    checkpoint = None
+    if options.streaming:
+        from .checkpoint import Checkpoint
+        checkpoint = Checkpoint(out_dir) # per-chromosome QC results, so an interrupted run can be resumed
+        if resume:
+            problem = checkpoint.resume_problem({"gff": gff_digest, "fasta": fasta_digest})
+            if problem:
+                logger.error(f"Cannot resume {out_dir}: {problem}. Exiting.")
+                raise SystemExit(1)
+            logger.info(f"Resuming from checkpoint: {len(checkpoint.done)} chromosome(s) already checked")
+
+    stage("validate")
+    report_stats = None
+    qc_source = None if resume else cache.reuse("qc", qc_key) # same input content and options as an earlier run: copy its outputs
+    if qc_source is None:
+        gff_checked = resume or cache.lookup("gff_validation", gff_key) is not None # this exact GFF content already passed validation
+        fasta_checked = resume or cache.lookup("fasta_validation", fasta_key) is not None
+        if db is None and reference is None and fasta_file:
+            db, reference = load_inputs_concurrently(gff_file, fasta_file, logger, options.packed_genome, gff_checked=gff_checked,
+                                                     fasta_checked=fasta_checked, streaming=options.streaming) # GFF and FASTA branches overlap
+        else:
+            if db is None:
+                db = validate_gff_input(gff_file, logger, checked=gff_checked) # Raw line and database validation
+            else:
+                logger.info(f"Using pre-validated GFF database for: {gff_file}")
+            if reference is not None: # FASTA was validated once up front (batch mode / daemon)
+                logger.info(f"Using pre-validated reference for FASTA: {fasta_file}")
+            elif fasta_file:
+                reference = load_reference(fasta_file, logger, options.packed_genome, checked=fasta_checked,
+                                               streaming=options.streaming)
+    cache.record("gff_validation", gff_key)
+    if fasta_file:
+        cache.record("fasta_validation", fasta_key)
+
+    stage("qc")
+    qc_stats: dict = {} # QC work metrics for run.json
+    if qc_source is None:
+        from .gff_parser import GFF_Parser
+        from .QC_check import QC_flags
+        from .qc_memo import default_memo_path, open_memo
+        memo = None
+        if options.qc_memo and fasta_file: # per-transcript results kept between runs; falls back to the results folder
+            memo = open_memo(options.qc_memo_path or default_memo_path(fasta_file), out_dir.resolve().parent)
+        qc = QC_flags(db, reference, memo=memo) # GFF-only flags when there is no reference
+        try:
+            if checkpoint is not None: # streaming: QC and outputs together, one chromosome at a time (see streaming.py)
+                from .streaming import stream_outputs
+                if not resume:
+                    checkpoint.start(resume_args(gff_file, fasta_file, options),
+                                     {"gff": gff_digest, "fasta": fasta_digest})
+                stage("outputs")
+                report_stats = stream_outputs(db, qc, output_dir, gff_file, explorer=options.explorer, sqlite=options.sqlite,
+                                              parquet=options.parquet,
+                                              checkpoint=checkpoint)
+            else:
+                tsv_results = GFF_Parser(db).tsv_output() # Parse GFF and generate TSV results
+                results = qc.transcript_QC() # Generate QC flags
+                stage("outputs")
+                report_stats = output_results(tsv_results, results, output_dir, gff_file, db, explorer=options.explorer,
+                                              sqlite=options.sqlite, parquet=options.parquet) # Output combined results to TSV file
+        finally:
+            if memo is not None:
+                memo.close()
+        if reference is not None:
+            qc_stats["cds_dedup"] = qc.cds_dedup # isoforms sharing a CDS structure are checked once
+            logger.info(f"CDS dedup: {qc.cds_dedup['distinct_cds']} distinct CDS structures checked, {qc.cds_dedup['shared_cds']} shared by other isoforms")
+        if memo is not None:
+            qc_stats["memo"] = memo.stats()
+            logger.info(f"QC memo: {memo.hits} of {memo.hits + memo.misses} transcripts reused ({memo.stats()['hit_rate']:.1%}) from {memo.path}")
+    else:
+        stage("outputs")
+        if options.sqlite: # the copied database still describes the run it came from
+            from .results_db import run_metadata, write_run_metadata
+            write_run_metadata(out_dir / RESULTS_DB_FILENAME, run_metadata(out_dir))
+    cache.record("qc", qc_key, QC_OUTPUTS + ([RESULTS_DB_FILENAME] if options.sqlite else [])
+                 + ([PARQUET_FILENAME] if options.parquet else []))
+    from .region_index import build_region_index
+    build_region_index(out_dir / "transcript_summary.tsv") # transcript_index.npz, for GroupB-tool query (see region_index.py)
+
+    stage("report")
+    from .html_generation import run_report
+    figures_key = stage_key("figures", qc=qc_key, dpi=options.dpi)
+    if options.chart_mode == "png":
+        cache.reuse("figures", figures_key) # save_report_figures still checks each copied PNG against its own hash
+    template_dir = Path(__file__).resolve().parent  # folder containing groupB.html.j2
+    report_path = run_report(output_dir=out_dir, template_dir=template_dir, report_stats=report_stats, dpi=options.dpi,
+                             chart_mode=options.chart_mode, figure_workers=options.figure_workers)  #writes output_dir/report.html (report_stats=None re-reads the reused Parquet file or TSV)
+    logger.info(f"HTML report written to: {report_path}") #tells user where HTML is stored 
+    if options.chart_mode == "png":
+        cache.record("figures", figures_key, ["figures"])
+    finalise_run_json_file(output_dir=out_dir, run_filename=Path("run.json"), stages=cache.stages, qc=qc_stats)
+    flush_logs() # the log is complete once the run returns
+    stage("done")
+
+def resume_args(gff_file: str, fasta_file: str | None, options: RunOptions) -> dict:
+    """The main() arguments a checkpointed run is resumed with (see checkpoint.resume_run); input paths are made absolute."""
+    return {"gff_file": os.path.abspath(gff_file), "fasta_file": os.path.abspath(fasta_file) if fasta_file else None,
+            "options": options.to_dict()}
+
+
+def validate_inputs(gff_file: str, fasta_file: str | None, logger: logging.Logger) -> tuple["gffutils.FeatureDB", "FastaChecker | None"]:
+    """
+    Runs the raw-line, database and FASTA checks. Raises SystemExit(1) (after logging why) if any fail.
+    gff_file: Path to the GFF file.
+    fasta_file: Optional path to the FASTA file.
+    Returns the loaded database and the FastaChecker (None when no FASTA was given).
+    """
+    db = validate_gff_input(gff_file, logger)
+    fasta_checker = validate_fasta_input(fasta_file, logger) if fasta_file else None
+    return db, fasta_checker
+
+
+def validate_gff_input(gff_file: str, logger: logging.Logger, checked: bool = False) -> "gffutils.FeatureDB":
+    """
+    Runs the raw-line and database checks and returns the loaded database. Raises SystemExit(1) (after logging why) if any fail.
+    checked: this GFF content already passed validation in an earlier run (stage cache), so only the database is loaded.
+    """
+    if checked:
+        logger.info(f"Stage cache: GFF already validated, skipping raw line and database checks: {gff_file}")
+        try:
+            return load_gff_database(gff_file)
+        except SystemExit:
+            logger.error("Failed to load or create GFF database. Exiting.")
+            raise SystemExit(1)
     if not validate_raw_gff_lines(gff_file):
         logger.error("Input GFF failed raw line validation. Exiting.")
         raise SystemExit(1)
@@ -52,41 +215,140 @@ def main(gff_file: str, fasta_file: Optional[str] = None, output_dir: str = ".")
     except SystemExit:
         logger.error("GFF database validation encountered an error. Exiting.") # Log error if validation fails
         raise SystemExit(1)
-    
-    if db_check: # If database is valid, proceed
-        tsv_results = GFF_Parser(db).tsv_output() # Parse GFF and generate TSV results
-        if fasta_file: # If a FASTA file is provided, validate and parse it
-            fasta_checker = FastaChecker(fasta_file, logger) # Create FastaChecker instance
-            if not fasta_checker.validate_fasta(): # If the FASTA file is invalid, log error and exit
-                logger.error("Invalid FASTA file provided. Exiting.") # Log error for invalid FASTA
-                raise SystemExit(1)
-            fasta = fasta_checker.fasta_parse() # Parse the FASTA file
-            results = QC_flags(db, fasta).transcript_QC() # Generate QC flags using both GFF and FASTA data
-        else:
-            results = QC_flags(db).transcript_QC() # Generate QC flags using only GFF data
-        output_results(tsv_results, results, output_dir, gff_file, db) # Output combined results to TSV file
-    else:
+    if not db_check:
         logger.error("GFF database validation failed. Exiting.") # Log error if GFF validation fails
         raise SystemExit(1)
-    
-    template_dir = Path(__file__).resolve().parent  # folder containing groupB.html.j2
-    report_path = run_report(output_dir=out_dir, template_dir=template_dir)  #writes output_dir/report.html
-    logger.info(f"HTML report written to: {report_path}") #tells user where HTML is stored 
-    finalise_run_json_file(output_dir=out_dir, run_filename=Path("run.json"))
+    return db
+
+
+def validate_fasta_input(fasta_file: str, logger: logging.Logger) -> "FastaChecker":
+    """
+    Validates the FASTA file and returns its FastaChecker (ready for fasta_parse). Raises SystemExit(1) (after logging why) if invalid.
+    """
+    from .fasta_validator import FastaChecker
+    fasta_checker = FastaChecker(fasta_file, logger) # Create FastaChecker instance
+    if not fasta_checker.validate_fasta(): # If the FASTA file is invalid, log error and exit
+        logger.error("Invalid FASTA file provided. Exiting.") # Log error for invalid FASTA
+        raise SystemExit(1)
+    return fasta_checker
+
+
+def load_packed_reference(fasta_file: str, logger: logging.Logger) -> "PackedGenome":
+    """
+    Opens the 2-bit packed cache for fasta_file, validating the FASTA and (re)building the cache first if it is
+    missing or older than the FASTA. A fresh cache was built from a validated FASTA, so it is not re-validated.
+    Raises SystemExit(1) (after logging why) if the FASTA is invalid.
+    """
+    from .packed_genome import PackedGenome, default_cache_path, is_cache_fresh
+
+    cache_path = default_cache_path(fasta_file)
+    if is_cache_fresh(fasta_file, cache_path):
+        logger.info(f"Using packed genome cache: {cache_path}")
+        return PackedGenome(cache_path)
+    validate_fasta_input(fasta_file, logger)
+    logger.info(f"Building packed genome cache: {cache_path}")
+    return PackedGenome.open_or_build(fasta_file, cache_path)
+
+
+def load_reference(fasta_file: str, logger: logging.Logger, packed_genome: bool = False,
+                   checked: bool = False, streaming: bool = False) -> Mapping | None:
+    """
+    The FASTA branch of a run: validates and parses fasta_file into {seqid: SeqRecord}, or opens the packed cache.
+    checked: this FASTA content already passed validation in an earlier run (stage cache), so it is only parsed.
+    streaming: index the FASTA on disk instead of parsing it, keeping one chromosome in memory (streaming.ChromosomeReference).
+    Raises SystemExit(1) (after logging why) if the FASTA is invalid.
+    """
+    if packed_genome:
+        return load_packed_reference(fasta_file, logger) # FASTA is only validated when the cache is (re)built
+    from .fasta_validator import FastaChecker
+    if checked:
+        logger.info(f"Stage cache: FASTA already validated, skipping FASTA checks: {fasta_file}")
+        fasta_checker = FastaChecker(fasta_file, logger)
+    else:
+        fasta_checker = validate_fasta_input(fasta_file, logger)
+    if streaming:
+        from .streaming import ChromosomeReference
+        return ChromosomeReference(fasta_file)
+    records: Mapping = fasta_checker.fasta_parse()
+    return records
+
+
+def load_inputs_concurrently(gff_file: str, fasta_file: str, logger: logging.Logger, packed_genome: bool = False,
+                             gff_checked: bool = False, fasta_checked: bool = False,
+                             streaming: bool = False) -> tuple["gffutils.FeatureDB", Mapping | None]:
+    """
+    Runs the GFF branch (raw lines, database build, check_db) and the FASTA branch (load_reference) at the same time;
+    they are independent until QC. The FASTA branch runs on a worker thread and the GFF branch stays on this one,
+    because the database's sqlite connection can only be used from the thread that opened it.
+    Both branches always run to the end so every validation error is logged, then SystemExit(1) is raised if either failed.
+    gff_checked/fasta_checked: skip the checks for content that already passed them (see validate_gff_input, load_reference).
+    streaming: passed on to load_reference.
+    Returns the database and the reference.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    failed = False
+    db = reference = None
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="fasta-branch") as pool:
+        fasta_branch = pool.submit(load_reference, fasta_file, logger, packed_genome, fasta_checked, streaming)
+        try:
+            db = validate_gff_input(gff_file, logger, checked=gff_checked)
+        except SystemExit:
+            failed = True
+        try:
+            reference = fasta_branch.result()
+        except SystemExit:
+            failed = True
+    if failed:
+        logger.error("Input validation failed. Exiting.")
+        raise SystemExit(1)
+    return db, reference
+
+
+def validate_only(gff_file: str, fasta_file: str | None = None, output_dir: str = ".") -> None:
+    """
+    Lightweight entry point for --validate-only: runs validate_inputs and writes only the log file.
+    The parsing, QC and reporting stages (and their dependencies) are never loaded.
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    logger = setup_logger(out_dir / "gene_model_summariser.log")
+    validate_inputs(gff_file, fasta_file, logger)
+    logger.info("Validation passed; skipping QC and report generation (--validate-only).")
+    flush_logs()
 
 # Join tsv_results and results on transcript IDs for output in singular transcript_summary.tsv file. 
-def output_results(tsv_data: dict, qc_data: dict, output_dir: str, gff_file: str, db) -> None:
+def output_results(tsv_data: dict, qc_data: dict, output_dir: str, gff_file: str, db, explorer: bool = True, sqlite: bool = False,
+                   parquet: bool = False) -> dict:
     """
     combine tsv_data and qc_data into a single TSV file in output_dir.
     tsv_data: Dictionary containing TSV metrics keyed by transcript IDs.
     qc_data: Dictionary containing QC flags keyed by transcript IDs.
     output_dir: Directory where the transcript_summary.tsv file will be saved.
+    explorer: also write the compressed explorer shards (see transcript_explorer.py).
+    sqlite: also write the rows to an indexed transcript_summary.sqlite (see results_db.py).
+    parquet: also write the rows to transcript_summary.parquet, one row group at a time (see parquet_output.py).
+    Returns the report stats accumulated while the rows were produced (see html_generation.run_report).
     """
+    import pandas as pd
+
+    from .build_gff import build_gff
+    from .html_generation import report_stats_from_aggregator
+    from .parquet_output import ParquetSummaryWriter
+    from .qc_flags_bed import TranscriptWithFlags, write_qc_bed
+    from .results_db import ResultsDBWriter, run_metadata
+    from .stream_stats import TranscriptStatsAggregator
+    from .transcript_explorer import ExplorerWriter
+
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
     combined_data = [] # list to hold combined entries
+    aggregator = TranscriptStatsAggregator() # report stats, collected in one streaming pass as each row is produced
     transcripts_with_flags = []
+    explorer_writer = ExplorerWriter(output_dir) if explorer else None # per-transcript table data for the report, written in shards
+    results_db = ResultsDBWriter(Path(output_dir) / RESULTS_DB_FILENAME, run_metadata(output_dir)) if sqlite else None # indexed copy for dashboards
+    parquet_writer = ParquetSummaryWriter(Path(output_dir) / PARQUET_FILENAME) if parquet else None # typed columnar copy
 
     gff_path = os.path.join(output_dir, 'qc_flags.gff3')
     with open(gff_path,'w') as gff_out:
@@ -100,6 +362,13 @@ def output_results(tsv_data: dict, qc_data: dict, output_dir: str, gff_file: str
             qc_flags_str = ','.join(qc_flags) if qc_flags else '' # Convert QC flags list to comma-separated string
             combined_entry = {**tsv_metrics, 'flags': qc_flags_str} # merge dictionaries
             combined_data.append(combined_entry) # add to combined list
+            aggregator.add(combined_entry)
+            if explorer_writer:
+                explorer_writer.add(combined_entry)
+            if results_db:
+                results_db.add(combined_entry)
+            if parquet_writer:
+                parquet_writer.add(combined_entry)
             
             # Create BED entry if transcript has flags
             if qc_flags:
@@ -116,6 +385,13 @@ def output_results(tsv_data: dict, qc_data: dict, output_dir: str, gff_file: str
                     # Also write to GFF with QC flags
                 build_gff(transcript_id, db, qc_flags_str, gff_out)
         
+    if explorer_writer:
+        explorer_writer.close()
+    if results_db:
+        results_db.close()
+    if parquet_writer:
+        parquet_writer.close()
+
     # Write BED file if there are flagged transcripts
     if transcripts_with_flags:
         bed_path = Path(output_dir) / "qc_flagged.bed"
@@ -124,33 +400,31 @@ def output_results(tsv_data: dict, qc_data: dict, output_dir: str, gff_file: str
     df = pd.DataFrame(combined_data) # create DataFrame from combined data
     output_path = os.path.join(output_dir, "transcript_summary.tsv") # define output file path
     df.to_csv(output_path, sep='\t', index=False) # save DataFrame to TSV file
+    return report_stats_from_aggregator(aggregator)
 
-def setup_logger(log_file: str | Path) -> logging.Logger:
+def setup_logger(log_file: str | Path, json_log: bool = False) -> logging.Logger:
     """
     setup_logger: Configures and returns a logger that writes to the specified log file.
     log_file: Path to the log file where log messages will be written.
+    json_log: also write each record as a JSON line to <log_file>.jsonl.
+    Records are queued and written by a background thread (see log_pipeline.py); errors wait until they are written.
     """
-    logger = logging.getLogger("GroupB_logger")
-    logger.setLevel(logging.INFO)
-    logger.handlers.clear() # remove existing handlers so each run logs to the right file
-    #prevent duplicates if run script multiple times
-    if not logger.handlers:
-        file = logging.FileHandler(log_file)
-        file.setFormatter(logging.Formatter("%(levelname)s - %(asctime)s - %(message)s"))
-        logger.addHandler(file)
-    return logger
+    return start_run_log(log_file, json_log=json_log)
 
 
-def load_gff_database(gff_file: str) -> gffutils.FeatureDB: # Create or connect to GFF database.
+def load_gff_database(gff_file: str) -> "gffutils.FeatureDB": # Create or connect to GFF database.
     """
     gff_file: Path to the GFF file with normalized extension. returns a gffutils FeatureDB object.
     db_path: Path to the database file (.db) derived from the GFF file.
-    If the database file does not exist, it creates one from the GFF file.
-    If it exists, it connects to the existing database.
+    If the database file does not exist, or is older than the GFF file, it creates one from the GFF file.
+    Otherwise it connects to the existing database.
     """
+    import gffutils
+
     # Create db_path by replacing extensions, but keep original gff_file for reading
     db_path = gff_file.replace('.gff3', '.db').replace('.gff.gz', '.db').replace('.gff', '.db')
-    if not os.path.isfile(db_path): # if the gff.db file does not exist, create it
+    # (re)create the database if it does not exist or the GFF has been edited since it was built
+    if not os.path.isfile(db_path) or os.path.getmtime(db_path) < os.path.getmtime(gff_file):
         try:
             db = gffutils.create_db(gff_file, dbfn=db_path, force=True, keep_order=True)
         except (sqlite3.OperationalError, ValueError):
@@ -1,13 +1,26 @@
+from collections.abc import Mapping
+
 import gffutils
-from typing import Optional
 from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
 from .gff_parser import GFF_Parser
+from .packed_genome import PackedChromosome
+from .qc_memo import QCMemo, transcript_key
+from .shared_genome import ChromosomeView
+
 
 class QC_flags:
     # Class to generate QC flags for gene models from parser data
-    def __init__(self, db: gffutils.FeatureDB, fasta: Optional[dict] = None) -> None:
+    def __init__(self, db: gffutils.FeatureDB, fasta: Mapping | None = None, memo: QCMemo | None = None) -> None:
+        # fasta: {seqid: SeqRecord} from FastaChecker.fasta_parse, a SharedGenome (shared_genome.py) or a PackedGenome (packed_genome.py)
+        # memo: persistent per-transcript results (qc_memo.py); only used when there is a FASTA
         self.db = db
         self.fasta = fasta
+        self.memo = memo
+        self._cached_chrom: tuple[str | None, str] = (None, '') # last chromosome converted to str
+        self._cds_flags: dict[tuple, list[str]] = {} # (seqid, strand, CDS coordinates/phases) -> CDS flags, for the current chromosome
+        self.cds_dedup = {'distinct_cds': 0, 'shared_cds': 0} # CDS structures checked vs. reused from another isoform
     
     def gc_content(self, sequence: str) -> float:
         '''
@@ -43,6 +56,16 @@ class QC_flags:
         
         results = {}
         for chrom_id, seq_record in self.fasta.items():
+            if isinstance(seq_record, PackedChromosome): # counted on the packed bases, never decoded
+                length = len(seq_record)
+                n_count = seq_record.n_count()
+                results[chrom_id] = {
+                    'gc_content': seq_record.gc_count() / length * 100 if length else 0,
+                    'sequence_length': length,
+                    'n_count': n_count,
+                    'n_percent': n_count / length * 100 if length else 0.0
+                }
+                continue
             sequence = str(seq_record.seq)
             n_count, n_percent = self.N_content(sequence)
             results[chrom_id] = {
@@ -76,6 +99,19 @@ class QC_flags:
                 return True
         return False
     
+    def chrom_sequence(self, chrom_id: str, seq_record: SeqRecord | ChromosomeView | PackedChromosome) -> str | ChromosomeView | PackedChromosome:
+        """
+        Returns a sliceable sequence for a chromosome.
+        SharedGenome and PackedGenome views are returned as they are (slices decode only the requested range);
+        SeqRecord sequences are converted to str once and reused until another chromosome is requested.
+        """
+        seq = seq_record.seq
+        if isinstance(seq, (ChromosomeView, PackedChromosome)):
+            return seq
+        if self._cached_chrom[0] != chrom_id:
+            self._cached_chrom = (chrom_id, str(seq))
+        return self._cached_chrom[1]
+
     def cds_start(self, cds_seq: str) -> bool:
         """Returns True if the CDS sequence starts with 'ATG', otherwise False."""
         start_atg = True
@@ -120,7 +156,7 @@ class QC_flags:
             cds_list = cds_list[::-1]
         return cds_list
     
-    def cds_sequence(self, features, cds_list, chrom_sequence: str, strand: str, transcript_flags, transcript_id) -> str:
+    def cds_sequence(self, features, cds_list, chrom_sequence: str | ChromosomeView | PackedChromosome, strand: str, transcript_flags, transcript_id) -> str:
         """
         builds the complete CDS sequence from the list of CDS features, applying phase adjustments.
         features: Dictionary of features for the transcript.
@@ -149,7 +185,7 @@ class QC_flags:
             cds_seq += cds_segment[phase:]
         return cds_seq
     
-    def check_cds_quality(self, transcript_id: str, features, chrom_sequence: str, strand: str, transcript_flags) -> None:
+    def check_cds_quality(self, transcript_id: str, features, chrom_sequence: str | ChromosomeView | PackedChromosome, strand: str, transcript_flags) -> None:
         """
         Calls all quality check functions for the CDS of a given transcript.
         Updates transcript_flags dictionary with any issues found.
@@ -182,6 +218,24 @@ class QC_flags:
         if len(cds_seq) < 3:
             transcript_flags[transcript_id].append('CDS_too_short')
     
+    def shared_cds_flags(self, transcript_id: str, features: dict, chrom_id: str, chrom_sequence: str | ChromosomeView | PackedChromosome, strand: str) -> list[str]:
+        """
+        CDS flags for a transcript, checked once per distinct CDS structure: isoforms that differ only in their UTRs
+        share the same (seqid, strand, CDS coordinates and phases) and get the flags of the first one checked.
+        Only the current chromosome's structures are kept.
+        """
+        key = (chrom_id, strand, tuple(sorted((cds.start, cds.end, cds.frame) for cds in features['CDS(s)'])))
+        if self._cds_flags and next(iter(self._cds_flags))[0] != chrom_id:
+            self._cds_flags = {}
+        if key in self._cds_flags:
+            self.cds_dedup['shared_cds'] += 1
+            return self._cds_flags[key]
+        cds_flags: dict[str, list[str]] = {transcript_id: []}
+        self.check_cds_quality(transcript_id, features, chrom_sequence, strand, cds_flags)
+        self._cds_flags[key] = cds_flags[transcript_id]
+        self.cds_dedup['distinct_cds'] += 1
+        return cds_flags[transcript_id]
+
     def fasta_qc(self, transcript_id: str, features, transcript_flags) -> None:
         """
         Performs QC checks on the FASTA sequence corresponding to the given transcript ID and features.
@@ -193,10 +247,10 @@ class QC_flags:
         chrom_id = gene_feature.seqid
         seq_record = self.fasta.get(chrom_id) if self.fasta else None
         if seq_record:
-            chrom_sequence = str(seq_record.seq)
+            chrom_sequence = self.chrom_sequence(chrom_id, seq_record)
             strand = gene_feature.strand
             if features['CDS(s)']:
-                self.check_cds_quality(transcript_id, features, chrom_sequence, strand, transcript_flags)
+                transcript_flags[transcript_id].extend(self.shared_cds_flags(transcript_id, features, chrom_id, chrom_sequence, strand))
             else:
                 transcript_flags[transcript_id].append('no_CDS')
         
@@ -206,26 +260,63 @@ class QC_flags:
         creates QC flags based on GFF data and optional FASTA data.
         returns a dictionary with transcript IDs as keys and lists of QC flags as values.
         """
+        if self.memo is not None and self.fasta:
+            return self.memoised_transcript_QC()
         model = GFF_Parser(self.db).transcript_model()
         transcript_flags = {}
         for transcript_id, features in model.items():
-            transcript_flags[transcript_id] = []
-            '''counting exons'''
-            exon_count = len(features['exon(s)'])
-            if exon_count > 5:
-                exon_flag = 'exon_count>5'
-                transcript_flags[transcript_id].append(exon_flag)
-            exon_positions = [(exon.start, exon.end) for exon in features['exon(s)']]
-            exon_positions.sort()
-            for i in range(1, len(exon_positions)):
-                if exon_positions[i][0] < exon_positions[i-1][1]:
-                    overlaps = 'overlapping_exons'
-                    transcript_flags[transcript_id].append(overlaps)
-                    break
-            if self.fasta:
-                self.fasta_qc(transcript_id, features, transcript_flags)
-            if not self.fasta:
-                if not features['CDS(s)']:
-                    transcript_flags[transcript_id].append('no_CDS')
-                        
-        return transcript_flags         
\ No newline at end of file
+            transcript_flags[transcript_id] = self.flags_for_transcript(transcript_id, features)
+        return transcript_flags
+
+    def memoised_transcript_QC(self) -> dict[str, list[str]]:
+        """
+        transcript_QC with the memo: each transcript's structure is read with one query (GFF_Parser.transcript_structure)
+        and hashed with its CDS bases; only transcripts whose key is not in the memo are checked.
+        """
+        parser = GFF_Parser(self.db)
+        transcript_flags = {}
+        for gene, transcript in parser.iter_transcripts():
+            exons, cds = parser.transcript_structure(transcript.id)
+            transcript_flags[transcript.id] = self.flags_for_structure(gene, transcript.id, exons, cds)
+        return transcript_flags
+
+    def flags_for_structure(self, gene: gffutils.Feature, transcript_id: str, exons: list, cds: list) -> list[str]:
+        """
+        flags_for_transcript for the exons/CDS from GFF_Parser.transcript_structure, answered from the memo when one is set.
+        """
+        features = {'gene': gene.id, 'exon(s)': exons, 'CDS(s)': cds}
+        memo = self.memo
+        seq_record = self.fasta.get(gene.seqid) if memo is not None and self.fasta else None
+        if memo is None or not seq_record: # no memo, or no sequence to check (only the cheap exon flags)
+            return self.flags_for_transcript(transcript_id, features)
+        key = transcript_key(gene.seqid, gene.strand, exons, cds, self.chrom_sequence(gene.seqid, seq_record))
+        flags = memo.get(key)
+        if flags is None:
+            flags = self.flags_for_transcript(transcript_id, features)
+            memo.put(key, flags)
+        return flags
+
+    def flags_for_transcript(self, transcript_id: str, features: dict) -> list[str]:
+        """
+        QC flags for a single transcript.
+        features: one entry of GFF_Parser.transcript_model ({'gene', 'exon(s)', 'CDS(s)'}).
+        """
+        transcript_flags: dict[str, list[str]] = {transcript_id: []}
+        '''counting exons'''
+        exon_count = len(features['exon(s)'])
+        if exon_count > 5:
+            exon_flag = 'exon_count>5'
+            transcript_flags[transcript_id].append(exon_flag)
+        exon_positions = [(exon.start, exon.end) for exon in features['exon(s)']]
+        exon_positions.sort()
+        for i in range(1, len(exon_positions)):
+            if exon_positions[i][0] < exon_positions[i-1][1]:
+                overlaps = 'overlapping_exons'
+                transcript_flags[transcript_id].append(overlaps)
+                break
+        if self.fasta:
+            self.fasta_qc(transcript_id, features, transcript_flags)
+        if not self.fasta:
+            if not features['CDS(s)']:
+                transcript_flags[transcript_id].append('no_CDS')
+        return transcript_flags[transcript_id]
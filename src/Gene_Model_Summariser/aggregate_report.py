@@ -0,0 +1,159 @@
+'''
+Docstring for Gene_Model_Summariser.aggregate_report
+Cross-run comparison (GroupB-tool aggregate). Every run writes a small summary.json sidecar next to report.html
+(written by html_generation.run_report): the summary metrics (as compute_summary_metrics), the count of transcripts
+per QC flag, and the tool version, start time and inputs from run.json.
+The aggregate command finds the sidecars under a results tree and renders one comparison report from them alone,
+so it never re-reads a TSV and stays fast across thousands of runs.
+
+Outputs (default: inside the scanned directory):
+    aggregate_report.html - one row per run (metrics, flag counts, link to its report.html), sortable by any column
+    aggregate_summary.tsv - the same table for spreadsheets and scripts
+
+Usage:
+    GroupB-tool aggregate results/
+'''
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .run_json_builder import whats_the_time_mr_wolf
+
+SUMMARY_FILENAME = "summary.json"
+REPORT_FILENAME = "aggregate_report.html"
+TABLE_FILENAME = "aggregate_summary.tsv"
+SUMMARY_SCHEMA_VERSION = 1
+#metric columns of the aggregate table, in order: summary_metrics key -> heading
+METRIC_COLUMNS = {
+    "total_genes": "Genes",
+    "total_transcripts": "Transcripts",
+    "transcript_mean": "Transcripts/gene (mean)",
+    "has_cds_percent": "CDS (%)",
+    "flagged_transcripts_count": "Flagged",
+    "flagged_transcripts_percent": "Flagged (%)",
+}
+
+
+def build_run_summary(report_stats: dict, run_info: dict) -> dict[str, Any]:
+    """The summary.json sidecar of one run, from its report stats (see html_generation.run_report) and run.json."""
+    return {
+        "schema_version": SUMMARY_SCHEMA_VERSION,
+        "tool": run_info.get("tool", {}),
+        "timestamp": {"start": run_info.get("timestamp", {}).get("start")},
+        "inputs": run_info.get("inputs", {}),
+        "summary_metrics": report_stats["summary_metrics"],
+        "flag_counts": dict(sorted(report_stats["plot_inputs"]["qc_flag_counts_per_transcript_data"].items())),
+    }
+
+
+def write_run_summary(output_dir: str | Path, report_stats: dict, run_info: dict) -> Path:
+    path = Path(output_dir) / SUMMARY_FILENAME
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(build_run_summary(report_stats, run_info), handle, indent=2)
+        handle.write("\n")
+    return path
+
+
+def find_run_summaries(results_dir: str | Path) -> Iterator[Path]:
+    """summary.json files under results_dir. A run directory's own subfolders (figures/, explorer/) are not searched."""
+    for dirpath, dirnames, filenames in os.walk(results_dir):
+        if SUMMARY_FILENAME in filenames:
+            dirnames.clear()
+            yield Path(dirpath) / SUMMARY_FILENAME
+        else:
+            dirnames.sort()
+
+
+def load_run_summaries(results_dir: str | Path) -> list[dict[str, Any]]:
+    """The sidecars under results_dir (unreadable ones are skipped with a warning), sorted by run start time."""
+    runs = []
+    for path in find_run_summaries(results_dir):
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"warning: skipping {path}: {e}", file=sys.stderr)
+            continue
+        if not isinstance(summary, dict) or "summary_metrics" not in summary:
+            print(f"warning: skipping {path}: not a run summary", file=sys.stderr)
+            continue
+        summary["run_dir"] = path.parent
+        runs.append(summary)
+    runs.sort(key=lambda run: (run.get("timestamp", {}).get("start") or "", str(run["run_dir"])))
+    return runs
+
+
+def _input_name(run: dict, name: str) -> str:
+    path = (run.get("inputs", {}).get(name) or {}).get("path")
+    return Path(path).name if path else ""
+
+
+def aggregate_table(runs: list[dict[str, Any]], relative_to: str | Path) -> tuple[list[str], list[str], list[dict[str, Any]]]:
+    """(metric keys, flag names, rows) of the comparison table; run paths are given relative to relative_to."""
+    flags = sorted({flag for run in runs for flag in run.get("flag_counts", {})})
+    rows = []
+    for run in runs:
+        run_dir = run["run_dir"]
+        metrics = run["summary_metrics"]
+        rows.append({
+            "run": os.path.relpath(run_dir, relative_to),
+            "report": os.path.relpath(run_dir / "report.html", relative_to) if (run_dir / "report.html").exists() else None,
+            "start": ((run.get("timestamp", {}).get("start") or "")[:19]).replace("T", " "),
+            "version": run.get("tool", {}).get("version") or "",
+            "gff": _input_name(run, "gff"),
+            "fasta": _input_name(run, "fasta"),
+            "metrics": {key: metrics.get(key) for key in METRIC_COLUMNS},
+            "flags": {flag: run.get("flag_counts", {}).get(flag, 0) for flag in flags},
+        })
+    return list(METRIC_COLUMNS), flags, rows
+
+
+def aggregate_runs(results_dir: str | Path, output_dir: str | Path | None = None) -> Path:
+    """Render aggregate_report.html (and aggregate_summary.tsv) for every run under results_dir. Returns the report path."""
+    from .html_generation import generate_html_report
+
+    results_dir = Path(results_dir)
+    output_dir = Path(output_dir) if output_dir else results_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    runs = load_run_summaries(results_dir)
+    metric_keys, flags, rows = aggregate_table(runs, output_dir)
+
+    with open(output_dir / TABLE_FILENAME, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, delimiter="\t", lineterminator="\n")
+        writer.writerow(["run", "start", "version", "gff", "fasta", *metric_keys, *flags])
+        for row in rows:
+            writer.writerow([row["run"], row["start"], row["version"], row["gff"], row["fasta"],
+                             *(row["metrics"][key] for key in metric_keys), *(row["flags"][flag] for flag in flags)])
+
+    report_data = {
+        "generated": whats_the_time_mr_wolf()[:19].replace("T", " "),
+        "results_dir": str(results_dir),
+        "metric_columns": METRIC_COLUMNS,
+        "flags": flags,
+        "rows": rows,
+        "table_file": TABLE_FILENAME,
+    }
+    html = generate_html_report(report_data, Path(__file__).resolve().parent, template_name="aggregate.html.j2")
+    report_path = output_dir / REPORT_FILENAME
+    report_path.write_text(html, encoding="utf-8")
+    return report_path
+
+
+def aggregate_app(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="GroupB-tool aggregate", description="Compare every run under a results directory in one report.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("results", help="Directory to scan for runs (e.g. results/)")
+    parser.add_argument("-o", "--outdir", default=None, help="Where to write aggregate_report.html (default: the scanned directory)")
+    args = parser.parse_args(argv)
+
+    if not Path(args.results).is_dir():
+        print(f"error: {args.results} is not a directory", file=sys.stderr)
+        return 1
+    report_path = aggregate_runs(args.results, args.outdir)
+    print(f"Aggregate report written to: {report_path}")
+    return 0
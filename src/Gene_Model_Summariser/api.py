@@ -0,0 +1,324 @@
+'''
+Docstring for Gene_Model_Summariser.api
+Importable Python API for using the summariser inside other pipelines, without the CLI or temporary directories.
+
+iter_transcripts() validates the inputs and yields one TranscriptResult (metrics + QC flags) per transcript,
+walking the annotation database one gene at a time, so memory stays constant however many transcripts there are
+(apart from the reference genome, which is parsed whole into memory; pass packed_genome=True to keep it at 2 bits per base).
+Failures raise SummariserError subclasses instead of SystemExit. Writing files is optional: pass results through
+consume() with any of the sinks below (TSVSink, BEDSink, GFFSink, ExplorerSink, SQLiteSink, ParquetSink, StatsSink) or your own object with add()/close().
+query_region() reads back the transcripts of a finished run that overlap a region, through its interval index.
+
+    from Gene_Model_Summariser.api import iter_transcripts, consume, TSVSink
+
+    for result in iter_transcripts("models.gff3", "ref.fa"):
+        if result.flagged:
+            ...
+    consume(iter_transcripts("models.gff3"), [TSVSink("transcript_summary.tsv")])
+'''
+
+import csv
+import logging
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from .GroupB_Project5 import (
+    load_packed_reference,
+    validate_fasta_input,
+    validate_gff_input,
+)
+
+if TYPE_CHECKING:
+    import gffutils
+
+#a reference QC can read by seqid: {seqid: SeqRecord} from a parsed FASTA, a PackedGenome or a SharedGenome
+Reference = Mapping[str, Any]
+
+#column order of transcript_summary.tsv
+TSV_COLUMNS = ["gene_id", "transcript_id", "exon_count", "has_cds", "chrom", "start", "end", "strand", "flags"]
+
+
+class SummariserError(Exception):
+    """Base class for errors raised by the API."""
+
+
+class InputValidationError(SummariserError):
+    """An input file failed validation. `errors` holds the validation messages that were logged."""
+
+    def __init__(self, message: str, errors: list[str] | None = None) -> None:
+        self.errors = errors or []
+        super().__init__(message + (": " + "; ".join(self.errors) if self.errors else ""))
+
+
+class GFFValidationError(InputValidationError):
+    """The GFF failed raw line or database validation."""
+
+
+class FastaValidationError(InputValidationError):
+    """The FASTA failed validation."""
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptResult:
+    gene_id: str
+    transcript_id: str
+    exon_count: int
+    has_cds: bool
+    chrom: str
+    start: int
+    end: int
+    strand: str
+    flags: tuple[str, ...]
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self.flags)
+
+    def as_row(self) -> dict[str, Any]:
+        """The transcript_summary.tsv row (flags comma-separated), as output_results builds it."""
+        return {"gene_id": self.gene_id, "transcript_id": self.transcript_id, "exon_count": self.exon_count,
+                "has_cds": self.has_cds, "chrom": self.chrom, "start": self.start, "end": self.end,
+                "strand": self.strand, "flags": ",".join(self.flags)}
+
+    @classmethod
+    def from_row(cls, row: dict[str, str]) -> "TranscriptResult":
+        """Inverse of as_row for a row read back from a transcript_summary.tsv (all values strings)."""
+        return cls(gene_id=row["gene_id"], transcript_id=row["transcript_id"], exon_count=int(row["exon_count"]),
+                   has_cds=row["has_cds"] == "True", chrom=row["chrom"], start=int(row["start"]), end=int(row["end"]),
+                   strand=row["strand"], flags=tuple(flag for flag in row["flags"].split(",") if flag))
+
+
+class _ErrorCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(level=logging.ERROR)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@contextmanager
+def _raise_on_exit(error_type: type[InputValidationError], message: str) -> Iterator[None]:
+    #the pipeline logs validation errors and raises SystemExit; turn that into error_type carrying the messages
+    logger = logging.getLogger("GroupB_logger")
+    collector = _ErrorCollector()
+    logger.addHandler(collector)
+    try:
+        yield
+    except SystemExit:
+        raise error_type(message, collector.messages) from None
+    finally:
+        logger.removeHandler(collector)
+
+
+def open_annotation(gff_file: str | Path) -> "gffutils.FeatureDB":
+    """Validate a GFF and return its database (built next to the GFF, as the CLI does). Raises GFFValidationError."""
+    with _raise_on_exit(GFFValidationError, f"GFF validation failed for {gff_file}"):
+        return validate_gff_input(str(gff_file), logging.getLogger("GroupB_logger"))
+
+
+def open_reference(fasta_file: str | Path, packed_genome: bool = False) -> Reference:
+    """
+    Validate a FASTA and return it as a {seqid: record} mapping for QC. Raises FastaValidationError.
+    Without packed_genome the whole FASTA is parsed into memory as SeqRecords, so memory grows with the genome
+    (iterating results is constant-memory only on the annotation side).
+    packed_genome: return the 2-bit PackedGenome cache instead of parsed SeqRecords (see packed_genome.py).
+    """
+    logger = logging.getLogger("GroupB_logger")
+    with _raise_on_exit(FastaValidationError, f"FASTA validation failed for {fasta_file}"):
+        if packed_genome:
+            return load_packed_reference(str(fasta_file), logger)
+        records: Reference | None = validate_fasta_input(str(fasta_file), logger).fasta_parse()
+    if records is None:
+        raise FastaValidationError(f"could not parse {fasta_file}")
+    return records
+
+
+def iter_transcripts(gff_file: str | Path | None = None, fasta_file: str | Path | None = None, *,
+                     db: "gffutils.FeatureDB | None" = None, reference: Reference | None = None,
+                     packed_genome: bool = False) -> Iterator[TranscriptResult]:
+    """
+    Yield a TranscriptResult for every transcript, in annotation order.
+    Either give gff_file (validated and loaded here) or an already open db; likewise fasta_file or reference
+    (both optional - without a reference only the annotation-level flags are computed).
+    A fasta_file is parsed whole into memory unless packed_genome is set (see open_reference).
+    Inputs are validated before the first result is yielded.
+    """
+    from .gff_parser import GFF_Parser
+    from .QC_check import QC_flags
+
+    if db is None:
+        if gff_file is None:
+            raise ValueError("iter_transcripts needs gff_file or db")
+        db = open_annotation(gff_file)
+    if reference is None and fasta_file is not None:
+        reference = open_reference(fasta_file, packed_genome=packed_genome)
+    return _iter_results(GFF_Parser(db), QC_flags(db, reference))
+
+
+def _iter_results(parser: Any, qc: Any) -> Iterator[TranscriptResult]:
+    #separate generator so iter_transcripts validates (and raises) eagerly, before iteration starts
+    for gene, transcript in parser.iter_transcripts():
+        exons = parser.get_exons(transcript.id)
+        cds = parser.get_cds(transcript.id)
+        flags = qc.flags_for_transcript(transcript.id, {'gene': gene.id, 'exon(s)': exons, 'CDS(s)': cds})
+        yield TranscriptResult(gene_id=gene.id, transcript_id=transcript.id, exon_count=len(exons), has_cds=bool(cds),
+                               chrom=transcript.chrom, start=transcript.start, end=transcript.end,
+                               strand=transcript.strand, flags=tuple(flags))
+
+
+def query_region(run: str | Path, region: str, flagged_only: bool = False) -> list[TranscriptResult]:
+    """
+    Transcripts of a finished run (its directory or transcript_summary.tsv) overlapping region, e.g. "chr3:1200000-1400000"
+    (1-based, inclusive; a bare "chr3" is the whole chromosome), in start order. Uses transcript_index.npz (see region_index.py).
+    flagged_only: keep only transcripts with at least one QC flag.
+    """
+    from .region_index import RegionIndex, parse_region
+
+    chrom, start, end = parse_region(region)
+    results = []
+    for row in RegionIndex(run).query(chrom, start, end):
+        result = TranscriptResult.from_row(row)
+        if result.flagged or not flagged_only:
+            results.append(result)
+    return results
+
+
+class Sink(Protocol):
+    def add(self, result: TranscriptResult) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class TSVSink:
+    """Streams results into a transcript_summary.tsv identical to the one the CLI writes."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.handle = open(path, "w", newline="")  # noqa: SIM115 - closed by close()
+        self.writer = csv.DictWriter(self.handle, fieldnames=TSV_COLUMNS, delimiter="\t", lineterminator="\n")
+        self.writer.writeheader()
+
+    def add(self, result: TranscriptResult) -> None:
+        self.writer.writerow(result.as_row())
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+class BEDSink:
+    """Writes flagged transcripts to a qc_flagged.bed (rows are spooled to disk until close(), see qc_flags_bed.QCBedWriter)."""
+
+    def __init__(self, path: str | Path) -> None:
+        from .qc_flags_bed import QCBedWriter
+        self.writer = QCBedWriter(Path(path))
+
+    def add(self, result: TranscriptResult) -> None:
+        from .qc_flags_bed import TranscriptWithFlags
+        if result.flags:
+            self.writer.add(TranscriptWithFlags(chrom=result.chrom, start=result.start, end=result.end,
+                                                transcript_id=result.transcript_id, qc_flags=set(result.flags),
+                                                strand=result.strand))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ExplorerSink:
+    """Writes the report's explorer/ shards into output_dir; each chromosome is flushed as soon as the next one starts."""
+
+    def __init__(self, output_dir: str | Path) -> None:
+        from .transcript_explorer import ExplorerWriter
+        self.writer = ExplorerWriter(output_dir)
+        self.chrom: str | None = None
+
+    def add(self, result: TranscriptResult) -> None:
+        if result.chrom != self.chrom and self.chrom is not None:
+            self.writer.flush(self.chrom)
+        self.chrom = result.chrom
+        self.writer.add(result.as_row())
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SQLiteSink:
+    """Writes the results to an indexed SQLite database (see results_db.py); the file appears when the sink is closed."""
+
+    def __init__(self, path: str | Path, metadata: dict[str, Any] | None = None) -> None:
+        from .results_db import ResultsDBWriter
+        self.writer = ResultsDBWriter(path, metadata)
+
+    def add(self, result: TranscriptResult) -> None:
+        self.writer.add(result.as_row())
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ParquetSink:
+    """Writes the results to a typed Parquet file in row groups (see parquet_output.py; needs pyarrow)."""
+
+    def __init__(self, path: str | Path) -> None:
+        from .parquet_output import ParquetSummaryWriter
+        self.writer = ParquetSummaryWriter(path)
+
+    def add(self, result: TranscriptResult) -> None:
+        self.writer.add(result.as_row())
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class GFFSink:
+    """Writes flagged transcripts with a QC_flags attribute to a qc_flags.gff3 (header directives copied from gff_file)."""
+
+    def __init__(self, path: str | Path, db: "gffutils.FeatureDB", gff_file: str | Path) -> None:
+        self.db = db
+        self.handle = open(path, "w")  # noqa: SIM115 - closed by close()
+        with open(gff_file, "r") as gff_in:
+            for line in gff_in:
+                if line.startswith("##"):
+                    self.handle.write(line)
+
+    def add(self, result: TranscriptResult) -> None:
+        from .build_gff import build_gff
+        if result.flags:
+            build_gff(result.transcript_id, self.db, ",".join(result.flags), self.handle)
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+class StatsSink:
+    """Accumulates the report statistics (stream_stats.TranscriptStatsAggregator) without keeping rows."""
+
+    def __init__(self) -> None:
+        from .stream_stats import TranscriptStatsAggregator
+        self.aggregator: TranscriptStatsAggregator = TranscriptStatsAggregator()
+
+    def add(self, result: TranscriptResult) -> None:
+        self.aggregator.add(result.as_row())
+
+    def close(self) -> None:
+        pass
+
+    def summary_metrics(self) -> dict:
+        return self.aggregator.summary_metrics()
+
+
+def consume(results: Iterable[TranscriptResult], sinks: Iterable[Sink]) -> int:
+    """Feed every result to every sink, close the sinks and return the number of results."""
+    sinks = list(sinks)
+    count = 0
+    try:
+        for result in results:
+            for sink in sinks:
+                sink.add(result)
+            count += 1
+    finally:
+        for sink in sinks:
+            sink.close()
+    return count
@@ -0,0 +1,240 @@
+'''
+Docstring for Gene_Model_Summariser.batch
+Batch mode: QC many GFF (and optional FASTA) inputs in one invocation.
+Jobs come from a manifest and run on a bounded worker pool, each into its own run directory.
+Identical FASTA files (same content hash) are validated once in the parent process and loaded once into a
+SharedGenome (shared_genome.py); workers attach to that shared memory instead of re-reading the FASTA per job.
+
+Manifest: tab-separated, one job per line, columns gff, fasta (optional) and outdir (optional).
+Blank lines and lines starting with '#' are ignored, and a header line starting with "gff" is skipped.
+Relative paths are resolved against the manifest's directory.
+
+Usage:
+    GroupB-tool batch manifest.tsv --workers 4
+'''
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .api import _ErrorCollector
+from .cli import allocate_run_dir
+from .log_pipeline import SharedLogWriter, forward_to_shared_log, stop_forwarding
+from .run_options import RunOptions
+from .shared_genome import SharedGenome
+from .stage_cache import file_digest
+
+
+@dataclass
+class BatchJob:
+    gff: str
+    fasta: str | None = None
+    outdir: str | None = None #base directory; the run goes into <outdir>/results/run_NNN like the single-run CLI
+    run_dir: str | None = None #allocated by the parent before the pool starts
+    fasta_digest: str | None = None
+
+
+def read_manifest(manifest_path: str | Path) -> list[BatchJob]:
+    manifest_path = Path(manifest_path)
+    base = manifest_path.parent
+
+    def resolve(value: str) -> str | None:
+        value = value.strip()
+        if not value or value in (".", "-", "NA"):
+            return None
+        path = Path(value)
+        return str(path if path.is_absolute() else base / path)
+
+    jobs = []
+    with open(manifest_path, "r") as manifest:
+        for line_number, line in enumerate(manifest, start=1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if line_number == 1 and fields[0].strip().lower() == "gff":
+                continue #header
+            if len(fields) > 3:
+                raise ValueError(f"{manifest_path}:{line_number}: expected at most 3 tab-separated columns (gff, fasta, outdir)")
+            gff = resolve(fields[0])
+            if gff is None:
+                raise ValueError(f"{manifest_path}:{line_number}: missing GFF path")
+            fasta = resolve(fields[1]) if len(fields) > 1 else None
+            outdir = resolve(fields[2]) if len(fields) > 2 else None
+            jobs.append(BatchJob(gff=gff, fasta=fasta, outdir=outdir))
+    return jobs
+
+
+def allocate_run_dirs(jobs: list[BatchJob]) -> None:
+    """
+    Claim each job's run directory up front, in manifest order, so jobs sharing a base directory
+    get consecutive run_NNN directories (see cli.allocate_run_dir).
+    """
+    for job in jobs:
+        base_dir = os.path.abspath(job.outdir) if job.outdir else (os.path.dirname(job.gff) or ".")
+        job.run_dir = allocate_run_dir(base_dir)
+
+
+def prepare_references(jobs: list[BatchJob], logger: logging.Logger) -> tuple[dict[str, list[str]], dict[str, SharedGenome]]:
+    """
+    Validate every distinct FASTA once (by content hash) and load the valid ones into shared memory.
+    Returns ({digest: validation errors}, {digest: SharedGenome}); the errors are empty for a valid FASTA, and jobs
+    whose FASTA failed validation are reported as failed, with those errors, without running.
+    The caller owns the genomes and must unlink() them.
+    """
+    from .fasta_validator import FastaChecker
+
+    digests_by_path: dict[str, str] = {}
+    fasta_errors: dict[str, list[str]] = {}
+    genomes: dict[str, SharedGenome] = {}
+    for job in jobs:
+        if not job.fasta:
+            continue
+        real_path = os.path.realpath(job.fasta)
+        if real_path not in digests_by_path:
+            digests_by_path[real_path] = file_digest(real_path)
+        job.fasta_digest = digests_by_path[real_path]
+        if job.fasta_digest in fasta_errors:
+            continue
+        #no job's run log is open yet, so keep the reasons to report them in the failed jobs' results
+        collector = _ErrorCollector()
+        logger.addHandler(collector)
+        try:
+            valid = FastaChecker(job.fasta, logger).validate_fasta()
+        finally:
+            logger.removeHandler(collector)
+        fasta_errors[job.fasta_digest] = [] if valid else collector.messages or ["FASTA validation failed"]
+        if valid:
+            genomes[job.fasta_digest] = SharedGenome.from_fasta(job.fasta)
+    return fasta_errors, genomes
+
+
+def run_job(job: BatchJob, options: RunOptions, reference: SharedGenome | None = None) -> dict[str, Any]:
+    """
+    Run one manifest entry through GroupB_Project5.main. Never raises: failures are returned in the result.
+    reference: the job's already validated FASTA in shared memory (None when the job has no FASTA).
+    """
+    from .GroupB_Project5 import flush_logs, main
+
+    start = time.perf_counter()
+    result: dict[str, Any] = {"gff": job.gff, "fasta": job.fasta, "run_dir": job.run_dir, "status": "ok", "error": None}
+    if job.run_dir is None:
+        raise ValueError("run_job needs the job's run_dir (see allocate_run_dirs)")
+    try:
+        main(job.gff, job.fasta, job.run_dir, options, reference=reference)
+    except SystemExit:
+        result["status"] = "failed"
+        result["error"] = "validation failed (see gene_model_summariser.log in the run directory)"
+    except Exception as e:  # noqa: BLE001 - one broken input must not stop the rest of the batch
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        flush_logs() # a failed job's log is complete too
+        if reference is not None and not reference.owner:
+            reference.close() #detach this worker's mapping; the parent frees the memory
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(jobs: list[BatchJob], options: RunOptions | None = None, workers: int | None = None,
+              log_file: str | Path | None = None) -> list[dict[str, Any]]:
+    """
+    Run all jobs, at most `workers` at a time (default: one per CPU), and return one result dict per job in manifest order.
+    options: passed to GroupB_Project5.main for every job (the defaults when None).
+    log_file: also collect every job's log records (tagged with the job's run directory) in this one file, written by
+    this process only (see log_pipeline.SharedLogWriter); each run directory keeps its own log as well.
+    """
+    options = options or RunOptions()
+    logger = logging.getLogger("GroupB_logger")
+    shared_log = SharedLogWriter(log_file, json_log=options.json_log) if log_file else None
+    if shared_log:
+        forward_to_shared_log(shared_log.queue)
+    try:
+        allocate_run_dirs(jobs)
+        fasta_errors, genomes = prepare_references(jobs, logger)
+        try:
+            return _run_jobs(jobs, workers, options, fasta_errors, genomes, shared_log)
+        finally:
+            for genome in genomes.values():
+                genome.unlink()
+    finally:
+        if shared_log:
+            stop_forwarding()
+            shared_log.close()
+
+
+def _init_worker(log_queue: Any | None) -> None:
+    #ProcessPoolExecutor initializer: forward the worker's log records to the shared log, if there is one
+    if log_queue is not None:
+        forward_to_shared_log(log_queue)
+
+
+def _run_jobs(jobs: list[BatchJob], workers: int | None, options: RunOptions, fasta_errors: dict[str, list[str]],
+              genomes: dict[str, SharedGenome], shared_log: SharedLogWriter | None = None) -> list[dict[str, Any]]:
+    results: list[dict[str, Any] | None] = [None] * len(jobs)
+    runnable = []
+    for i, job in enumerate(jobs):
+        if job.fasta_digest and fasta_errors[job.fasta_digest]:
+            results[i] = {"gff": job.gff, "fasta": job.fasta, "run_dir": job.run_dir, "status": "failed",
+                          "error": "invalid FASTA file: " + "; ".join(fasta_errors[job.fasta_digest]), "seconds": 0.0}
+        else:
+            runnable.append(i)
+
+    workers = min(len(runnable), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for i in runnable:
+            results[i] = run_job(jobs[i], options, genomes.get(jobs[i].fasta_digest or ""))
+    else:
+        #load the pipeline once here so (forked) workers start with it already imported
+        from . import GroupB_Project5, QC_check, gff_parser, html_generation  # noqa: F401
+        #workers forward their log records to the shared log's queue (the parent is its only writer)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared_log.queue if shared_log else None,)) as pool:
+            #a SharedGenome pickles as its block name + offset table, so this does not copy the sequences
+            futures = {i: pool.submit(run_job, jobs[i], options, genomes.get(jobs[i].fasta_digest or "")) for i in runnable}
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                except Exception as e:  # noqa: BLE001 - e.g. BrokenProcessPool when a worker dies; the other jobs are still collected
+                    job = jobs[i]
+                    results[i] = {"gff": job.gff, "fasta": job.fasta, "run_dir": job.run_dir, "status": "failed",
+                                  "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+    return [r for r in results if r is not None]
+
+
+def batch_app(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="GroupB-tool batch", description="Run many GFF/FASTA pairs from a manifest.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("manifest", help="Tab-separated manifest: gff, optional fasta, optional outdir per line")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum jobs run at once (default: number of CPUs)")
+    parser.add_argument("--dpi", type=int, default=200, help="Resolution (dots per inch) of the PNG figures in each report")
+    parser.add_argument("--charts", choices=["png", "inline"], default="png", help="Report charts (see GroupB-tool --help)")
+    parser.add_argument("--no-explorer", action="store_true", help="Do not write the per-transcript explorer data")
+    parser.add_argument("--streaming", action="store_true", help="Chromosome-at-a-time processing (see GroupB-tool --help)")
+    parser.add_argument("--qc-memo", action="store_true", help="Reuse per-transcript QC results (see GroupB-tool --help)")
+    parser.add_argument("--qc-memo-path", metavar="FILE", default=None,
+                        help="Keep the QC memo of every job in FILE instead of next to each FASTA (implies --qc-memo)")
+    parser.add_argument("--sqlite", action="store_true", help="Also write transcript_summary.sqlite (see GroupB-tool --help)")
+    parser.add_argument("--parquet", action="store_true", help="Also write transcript_summary.parquet (see GroupB-tool --help)")
+    parser.add_argument("--stage-cache", action="store_true", help="Reuse outputs of earlier runs on identical inputs (see GroupB-tool --help)")
+    parser.add_argument("--log", default=None, metavar="FILE",
+                        help="Also collect the log records of every job in FILE, each tagged with its run directory")
+    parser.add_argument("--log-json", action="store_true", help="Also write the logs as JSON lines (<log>.jsonl)")
+    args = parser.parse_args(argv)
+
+    jobs = read_manifest(args.manifest)
+    qc_memo_path = os.path.abspath(args.qc_memo_path) if args.qc_memo_path else None
+    options = RunOptions(dpi=args.dpi, chart_mode=args.charts, explorer=not args.no_explorer, stage_cache=args.stage_cache,
+                         qc_memo=args.qc_memo or qc_memo_path is not None, qc_memo_path=qc_memo_path,
+                         streaming=args.streaming, sqlite=args.sqlite, parquet=args.parquet, json_log=args.log_json)
+    results = run_batch(jobs, options, workers=args.workers, log_file=args.log)
+    for result in results:
+        line = f"{result['status']}\t{result['seconds']:.2f}s\t{result['gff']}\t{result['run_dir']}"
+        print(line + (f"\t{result['error']}" if result["error"] else ""))
+    failed = sum(1 for r in results if r["status"] != "ok")
+    print(f"{len(results) - failed} of {len(results)} jobs succeeded")
+    return 1 if failed else 0
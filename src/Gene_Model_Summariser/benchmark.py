@@ -0,0 +1,245 @@
+'''
+Docstring for Gene_Model_Summariser.benchmark
+Benchmark runner for the Gene Model Summariser.
+Generates synthetic datasets of growing size (synthetic_data.py), runs GroupB_Project5.main on each, times every
+pipeline stage it reports through its progress callback and records peak Python memory per stage. Results are written as JSON so runs from different versions
+can be compared with --compare.
+
+Usage:
+    python -m Gene_Model_Summariser.benchmark --genes 100 1000 10000 --out bench.json
+    python -m Gene_Model_Summariser.benchmark --genes 1000 --compare old_bench.json
+'''
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+from .run_json_builder import TOOL_VERSION, whats_the_time_mr_wolf
+from .run_options import RunOptions
+from .synthetic_data import SyntheticConfig, write_synthetic_dataset
+
+#the stages GroupB_Project5.main reports through its progress callback, in the order they run
+STAGES = ["validate", "qc", "outputs", "report"]
+
+
+class StageTimer:
+    """
+    Records the wall time and (optionally) peak traced memory of each stage main() reports: pass progress as main's
+    progress callback inside tracing(). A stage lasts from its progress call until the next one ("done" ends the last).
+    tracemalloc slows Python code down noticeably, so timing and memory are measured in separate passes.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.seconds: dict[str, float] = {}
+        self.peak_bytes: dict[str, int] = {}
+        self._stage: str | None = None
+        self._start = 0.0
+
+    @contextmanager
+    def tracing(self) -> Iterator[None]:
+        if self.trace_memory:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            self._stage = None
+            if self.trace_memory:
+                tracemalloc.stop()
+
+    def progress(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.seconds[self._stage] = round(now - self._start, 6)
+            if self.trace_memory:
+                self.peak_bytes[self._stage] = tracemalloc.get_traced_memory()[1]
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self._stage = None if name == "done" else name
+        self._start = time.perf_counter()
+
+
+def run_pipeline_stages(gff_file: Path, fasta_file: Path, output_dir: Path, timer: StageTimer) -> None:
+    """
+    Run GroupB_Project5.main with the default options, timing the stages it reports through timer.progress.
+    The database file next to the GFF is removed first so validate always includes a fresh database build.
+    """
+    #imported here so importing this module (e.g. for --help) stays cheap
+    from .GroupB_Project5 import main
+
+    db_path = gff_file.with_suffix(".db")
+    if db_path.exists():
+        db_path.unlink()
+    with timer.tracing():
+        main(str(gff_file), str(fasta_file), str(output_dir), RunOptions(), progress=timer.progress)
+
+
+def benchmark_size(config: SyntheticConfig, workdir: Path, trace_memory: bool = True) -> dict[str, Any]:
+    """
+    Generate one dataset and benchmark it.
+    Returns a dict with the dataset description and per-stage seconds/peak_bytes.
+    """
+    data_dir = workdir / f"genes_{config.genes}"
+    gff_file, fasta_file = write_synthetic_dataset(data_dir, config)
+
+    #timing pass
+    timer = StageTimer(trace_memory=False)
+    run_pipeline_stages(gff_file, fasta_file, data_dir / "run_time", timer)
+    peak_bytes: dict[str, int] = {}
+
+    #memory pass
+    if trace_memory:
+        mem_timer = StageTimer(trace_memory=True)
+        run_pipeline_stages(gff_file, fasta_file, data_dir / "run_memory", mem_timer)
+        peak_bytes = mem_timer.peak_bytes
+
+    return {
+        "genes": config.genes,
+        "isoforms": config.isoforms,
+        "exons": config.exons,
+        "transcripts": config.genes * config.isoforms,
+        "chrom_size": config.chrom_size,
+        "seed": config.seed,
+        "gff_bytes": gff_file.stat().st_size,
+        "fasta_bytes": fasta_file.stat().st_size,
+        "total_seconds": round(sum(timer.seconds.values()), 6),
+        "stages": {name: {"seconds": seconds, "peak_bytes": peak_bytes.get(name)} for name, seconds in timer.seconds.items()},
+    }
+
+
+def run_benchmarks(gene_counts: list[int], isoforms: int = 2, exons: int = 4, chrom_size: int = 1_000_000,
+                   seed: int = 0, workdir: Path | None = None, trace_memory: bool = True,
+                   cold_start: bool = True) -> dict[str, Any]:
+    """
+    Benchmark each gene count in turn and return the full (JSON-serialisable) results document.
+    workdir: where datasets and run outputs go; a temporary directory is used (and removed) if None.
+    cold_start: also time fresh interpreter launches of the CLI (see measure_cold_start).
+    """
+    #benchmarks should not fill the terminal with validation logging
+    logger = logging.getLogger("GroupB_logger")
+    logger.handlers.clear()
+    logger.addHandler(logging.NullHandler())
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="gms_bench_") if workdir is None else nullcontext(str(workdir)) as base_dir:
+        base = Path(base_dir)
+        for genes in gene_counts:
+            config = SyntheticConfig(genes=genes, isoforms=isoforms, exons=exons, chrom_size=chrom_size, seed=seed)
+            results.append(benchmark_size(config, base, trace_memory=trace_memory))
+
+    return {
+        "tool_version": TOOL_VERSION,
+        "timestamp": whats_the_time_mr_wolf(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": STAGES,
+        "cold_start_seconds": measure_cold_start() if cold_start else {},
+        "results": results,
+    }
+
+
+def measure_cold_start(repeats: int = 5) -> dict[str, float]:
+    """
+    Time fresh interpreter launches of the CLI (median of `repeats`), as the shell would run GroupB-tool.
+    help: `GroupB-tool --help`; import_pipeline: importing the full pipeline module set used by main().
+    """
+    commands = {
+        "help": "import sys; sys.argv = ['GroupB-tool', '--help']\n"
+                "from Gene_Model_Summariser.cli import app\n"
+                "try:\n    app()\nexcept SystemExit:\n    pass",
+        "import_pipeline": "import Gene_Model_Summariser.GroupB_Project5, Gene_Model_Summariser.QC_check, "
+                           "Gene_Model_Summariser.html_generation",
+    }
+    timings = {}
+    for name, code in commands.items():
+        runs = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+            runs.append(time.perf_counter() - start)
+        timings[name] = round(statistics.median(runs), 6)
+    return timings
+
+
+def compare_benchmarks(baseline: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Compare two benchmark documents stage by stage for gene counts present in both.
+    Returns rows of {genes, stage, baseline_seconds, current_seconds, ratio}; ratio > 1 means slower now.
+    """
+    baseline_by_genes = {r["genes"]: r for r in baseline.get("results", [])}
+    rows = []
+    for name, new_seconds in current.get("cold_start_seconds", {}).items():
+        old_seconds = baseline.get("cold_start_seconds", {}).get(name)
+        ratio = round(new_seconds / old_seconds, 3) if old_seconds else None
+        rows.append({"genes": None, "stage": f"cold_start_{name}", "baseline_seconds": old_seconds,
+                     "current_seconds": new_seconds, "ratio": ratio})
+    for result in current.get("results", []):
+        old = baseline_by_genes.get(result["genes"])
+        if old is None:
+            continue
+        for stage, timing in result["stages"].items():
+            old_seconds = old["stages"].get(stage, {}).get("seconds")
+            new_seconds = timing["seconds"]
+            ratio = round(new_seconds / old_seconds, 3) if old_seconds else None
+            rows.append({"genes": result["genes"], "stage": stage, "baseline_seconds": old_seconds,
+                         "current_seconds": new_seconds, "ratio": ratio})
+    return rows
+
+
+def format_results(document: dict[str, Any]) -> str:
+    #plain text table: one row per dataset size, one column per stage (seconds)
+    stages = document["stages"]
+    header = ["genes", "transcripts"] + stages + ["total"]
+    lines = [f"cold start (s): {document['cold_start_seconds']}", "\t".join(header)]
+    for result in document["results"]:
+        row = [str(result["genes"]), str(result["transcripts"])]
+        row += [f"{result['stages'][s]['seconds']:.3f}" if s in result["stages"] else "NA" for s in stages]
+        row.append(f"{result['total_seconds']:.3f}")
+        lines.append("\t".join(row))
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Gene Model Summariser on synthetic data.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--genes", type=int, nargs="+", default=[100, 1000, 5000], help="Gene counts to benchmark")
+    parser.add_argument("--isoforms", type=int, default=2, help="Isoforms per gene")
+    parser.add_argument("--exons", type=int, default=4, help="Exons per isoform")
+    parser.add_argument("--chrom-size", type=int, default=1_000_000, help="Maximum chromosome length (bp)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generator")
+    parser.add_argument("--workdir", default=None, help="Keep generated data and outputs here instead of a temp dir")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass")
+    parser.add_argument("--no-cold-start", action="store_true", help="Skip timing fresh CLI launches")
+    parser.add_argument("--out", default=None, help="Write JSON results to this file")
+    parser.add_argument("--compare", default=None, help="Baseline JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    document = run_benchmarks(args.genes, isoforms=args.isoforms, exons=args.exons, chrom_size=args.chrom_size,
+                              seed=args.seed, workdir=Path(args.workdir) if args.workdir else None,
+                              trace_memory=not args.no_memory, cold_start=not args.no_cold_start)
+    print(format_results(document))
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print("\ngenes\tstage\tbaseline_s\tcurrent_s\tratio")
+        for row in compare_benchmarks(baseline, document):
+            print(f"{row['genes']}\t{row['stage']}\t{row['baseline_seconds']}\t{row['current_seconds']}\t{row['ratio']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+'''
+Docstring for Gene_Model_Summariser.checkpoint
+Chunked checkpoints for long streaming runs, so a run killed during QC or output (OOM, node preemption) can continue
+where it stopped with GroupB-tool --resume results/run_NNN instead of starting again from validation.
+
+A streaming run (see streaming.py) checks one chromosome at a time. Each chromosome's QC results are committed to
+<run>/checkpoint/chunk_NNNNN.tsv - written under a temporary name, fsynced and renamed into place - and only then
+recorded in checkpoint/manifest.json (replaced the same way), so the manifest only ever lists complete chunks.
+The manifest also keeps the run's inputs, their content hashes and the options it was started with.
+Each committed chunk is then passed straight on to the output sinks, so the outputs grow chromosome by chromosome;
+the checkpoint directory is removed once they are complete.
+
+Resuming skips validation (the inputs passed it before the first chunk was committed, and their hashes must still
+match): the committed chunks are replayed, in order, into fresh output files and only the remaining chromosomes are
+checked (an incomplete chunk is simply redone), so a resumed run produces byte-identical outputs to an uninterrupted one.
+'''
+
+import csv
+import json
+import os
+import shutil
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .api import TSV_COLUMNS, TranscriptResult
+
+CHECKPOINT_DIRNAME = "checkpoint"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 2 #2: main_args keeps the run options as one RunOptions dict
+
+
+def write_atomic(path: Path, text: str) -> None:
+    #write, fsync and rename, so path holds either its old or its new content
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpoint:
+    """
+    The checkpoint of one run directory: committed chunks of QC results plus the manifest describing them.
+    """
+
+    def __init__(self, output_dir: str | Path) -> None:
+        self.dir = Path(output_dir) / CHECKPOINT_DIRNAME
+        self.manifest_path = self.dir / MANIFEST_FILENAME
+        self.manifest: dict[str, Any] = {}
+        self.done: set[str] = set()
+
+    def start(self, main_args: dict[str, Any], digests: dict[str, str | None]) -> None:
+        """Begin a new checkpoint (dropping any earlier one). main_args: the GroupB_Project5.main arguments to resume with."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.dir.mkdir(parents=True)
+        self.manifest = {"version": MANIFEST_VERSION, "main_args": main_args, "digests": digests, "chunks": []}
+        self.done = set()
+        write_atomic(self.manifest_path, json.dumps(self.manifest, indent=2))
+
+    def load(self) -> bool:
+        """Read an existing manifest. False if there is none (never started, or the run already finished)."""
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        self.done = {chunk["name"] for chunk in self.manifest["chunks"]}
+        return self.manifest.get("version") == MANIFEST_VERSION
+
+    def resume_problem(self, digests: dict[str, str | None]) -> str | None:
+        """Why this run cannot be resumed with inputs of these content hashes, or None if it can."""
+        if not self.load():
+            return f"no checkpoint in {self.dir} (only interrupted --streaming runs can be resumed)"
+        changed = [name for name, digest in digests.items() if self.manifest["digests"].get(name) != digest]
+        if changed:
+            return f"the {' and '.join(changed)} input changed since the run started"
+        return None
+
+    def is_done(self, chunk: str) -> bool:
+        return chunk in self.done
+
+    def commit(self, chunk: str, results: Iterable[TranscriptResult]) -> int:
+        """Write one chunk's results and record it in the manifest. Returns the number of transcripts."""
+        filename = f"chunk_{len(self.manifest['chunks']) + 1:05d}.tsv"
+        tmp = self.dir / (filename + ".tmp")
+        count = 0
+        with open(tmp, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=TSV_COLUMNS, delimiter="\t", lineterminator="\n")
+            for result in results:
+                writer.writerow(result.as_row())
+                count += 1
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.dir / filename)
+        self.manifest["chunks"].append({"name": chunk, "file": filename, "transcripts": count})
+        write_atomic(self.manifest_path, json.dumps(self.manifest, indent=2))
+        self.done.add(chunk)
+        return count
+
+    def iter_results(self) -> Iterator[TranscriptResult]:
+        """Every result committed so far, chunk by chunk in commit order."""
+        for chunk in self.manifest["chunks"]:
+            with open(self.dir / chunk["file"], newline="", encoding="utf-8") as handle:
+                for row in csv.DictReader(handle, fieldnames=TSV_COLUMNS, delimiter="\t"):
+                    yield TranscriptResult.from_row(row)
+
+    def remove(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def resume_run(run_dir: str | Path, progress: Callable[[str], None] | None = None) -> int:
+    """Continue an interrupted streaming run in run_dir with the inputs and options it was started with (GroupB-tool --resume)."""
+    from .GroupB_Project5 import main
+    from .run_options import RunOptions
+
+    checkpoint = Checkpoint(run_dir)
+    if not checkpoint.load():
+        print(f"error: nothing to resume in {run_dir} (no {CHECKPOINT_DIRNAME}/{MANIFEST_FILENAME}; "
+              "only interrupted --streaming runs can be resumed)", file=sys.stderr)
+        return 1
+    main_args = checkpoint.manifest["main_args"]
+    main(main_args["gff_file"], main_args["fasta_file"], str(run_dir), RunOptions.from_dict(main_args["options"]),
+         progress=progress, resume=True)
+    return 0
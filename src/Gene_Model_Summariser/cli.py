@@ -1,7 +1,30 @@
 import argparse
 import os
-import re
-from .GroupB_Project5 import main
+import sys
+
+#next free run number under results/, kept by allocate_run_dir so it never has to list the directory again
+RUN_COUNTER_FILENAME = ".next_run"
+
+
+def _run_number(name: str) -> int | None:
+    #run_NNN (or run_NNN<suffix>) -> NNN, without a regex
+    if not name.startswith("run_"):
+        return None
+    digits = name[4:]
+    end = 0
+    while end < len(digits) and digits[end].isdigit():
+        end += 1
+    return int(digits[:end]) if end else None
+
+
+def _scan_next_run(results_dir: str) -> int:
+    highest = 0
+    with os.scandir(results_dir) as entries:
+        for entry in entries:
+            number = _run_number(entry.name)
+            if number is not None and number > highest:
+                highest = number
+    return highest + 1
 
 
 def get_next_run_dir(base_dir: str) -> str:
@@ -12,26 +35,45 @@ def get_next_run_dir(base_dir: str) -> str:
     If 'results' directory does not exist, return 'results/run_001'.
     If 'results' directory exists, find existing 'run_XXX' directories,
     determine the next run number, and return the path for the new run directory.
+    The directory is not created, so two callers can get the same answer; use allocate_run_dir to claim one.
     """
     results_dir = os.path.join(base_dir, 'results')
     
     if not os.path.exists(results_dir):
         return os.path.join(results_dir, 'run_001')
-    
-    # Find existing run directories
-    existing_runs = []
-    for item in os.listdir(results_dir):
-        match = re.match(r'run_(\d+)', item)
-        if match:
-            existing_runs.append(int(match.group(1)))
-    
-    # Get next run number
-    if existing_runs:
-        next_run = max(existing_runs) + 1
-    else:
-        next_run = 1
-    
-    return os.path.join(results_dir, f'run_{next_run:03d}')
+    return os.path.join(results_dir, f'run_{_scan_next_run(results_dir):03d}')
+
+
+def allocate_run_dir(base_dir: str) -> str:
+    """
+    Create and return the next base_dir/results/run_XXX directory, safely when many jobs start at once against the same results folder.
+    Each candidate is claimed with an exclusive mkdir, so two processes can never get the same directory; on a clash the next number is tried.
+    The next number is kept in results/.next_run and updated under an exclusive lock on it (where the platform has fcntl),
+    so allocation does not list results/ again; the directory is only scanned when the counter file is first created.
+    """
+    results_dir = os.path.join(base_dir, 'results')
+    os.makedirs(results_dir, exist_ok=True)
+    with open(os.path.join(results_dir, RUN_COUNTER_FILENAME), 'a+') as counter:
+        try:
+            import fcntl
+            fcntl.flock(counter, fcntl.LOCK_EX) # released when the file is closed
+        except ImportError:
+            pass # no lock: the exclusive mkdir below still keeps runs apart
+        counter.seek(0)
+        text = counter.read().strip()
+        next_run = int(text) if text.isdigit() else _scan_next_run(results_dir)
+        while True:
+            run_dir = os.path.join(results_dir, f'run_{next_run:03d}')
+            try:
+                os.mkdir(run_dir)
+                break
+            except FileExistsError:
+                next_run += 1 # taken (e.g. by a run started without the counter): try the next number
+        counter.seek(0)
+        counter.truncate()
+        counter.write(f"{next_run + 1}\n")
+        counter.flush()
+    return run_dir
 
 
 def app():
@@ -39,21 +81,90 @@ def app():
     Command-line interface for the Gene Model Summariser.
     Parses arguments for GFF file, optional FASTA file, and output directory.
     Calls the main function with the provided arguments.
+    Subcommands (e.g. `GroupB-tool batch manifest.tsv`) are dispatched on the first argument.
     """
+    if sys.argv[1:2] == ["batch"]:
+        from .batch import batch_app
+        return batch_app(sys.argv[2:])
+    if sys.argv[1:2] == ["serve"]:
+        from .daemon import serve_app
+        return serve_app(sys.argv[2:])
+    if sys.argv[1:2] == ["query"]:
+        from .region_index import query_app
+        return query_app(sys.argv[2:])
+    if sys.argv[1:2] == ["diff"]:
+        from .run_diff import diff_app
+        return diff_app(sys.argv[2:])
+    if sys.argv[1:2] == ["aggregate"]:
+        from .aggregate_report import aggregate_app
+        return aggregate_app(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description="A simple CLI tool.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    parser.add_argument('-g','--gff', required=True, help='Path to GFF file')
+    parser.add_argument('-g','--gff', help='Path to GFF file (required unless --resume)')
     parser.add_argument('-f','--fasta', help='Path to optional reference FASTA file for sequence-derived metrics')
     parser.add_argument('-o','--outdir', help='Output directory for results', default=None)
+    parser.add_argument('--dpi', type=int, default=200, help='Resolution (dots per inch) of the PNG figures in the report')
+    parser.add_argument('--charts', choices=['png', 'inline'], default='png',
+                        help='Report charts: matplotlib PNGs in figures/, or inline SVG drawn in the browser (single-file report, no matplotlib)')
+    parser.add_argument('--figure-workers', type=int, default=1,
+                        help='Processes rendering the PNG figures (1 renders them in this process)')
+    parser.add_argument('--no-explorer', action='store_true',
+                        help='Do not write the per-transcript explorer data (explorer/) behind the report\'s transcript table')
+    parser.add_argument('--packed-genome', action='store_true',
+                        help='Use a 2-bit packed copy of the FASTA, cached next to it as <fasta>.gms2bit (built and validated on first use)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Process one chromosome at a time in (seqid, start) order, writing rows as they are produced (memory bounded by the largest chromosome)')
+    parser.add_argument('--resume', metavar='RUN_DIR', default=None,
+                        help='Continue an interrupted --streaming run in RUN_DIR from its last checkpointed chromosome, with the inputs and options it was started with')
+    parser.add_argument('--qc-memo', action='store_true',
+                        help='Keep per-transcript QC results next to the FASTA (<fasta>.qcmemo.sqlite) and only re-check models that changed')
+    parser.add_argument('--qc-memo-path', metavar='FILE', default=None,
+                        help='Keep the QC memo in FILE instead of next to the FASTA (implies --qc-memo)')
+    parser.add_argument('--sqlite', action='store_true',
+                        help='Also write the results to an indexed SQLite database (transcript_summary.sqlite) for fast filtering by gene, transcript, flag or region')
+    parser.add_argument('--parquet', action='store_true',
+                        help='Also write the results to a typed, columnar transcript_summary.parquet (needs pyarrow: pip install "GroupB-tool[parquet]")')
+    parser.add_argument('--log-json', action='store_true',
+                        help='Also write the run log as JSON lines (gene_model_summariser.log.jsonl) for log collectors')
+    parser.add_argument('--stage-cache', action='store_true',
+                        help='Reuse the outputs of an earlier run on identical inputs (same results directory) instead of recomputing them')
+    parser.add_argument('--daemon', nargs='?', const='', default=None, metavar='SOCKET',
+                        help='Submit the run to a running `GroupB-tool serve` daemon (optionally on SOCKET) instead of running it here')
+    parser.add_argument('--validate-only', action='store_true',
+                        help='Only run the raw-line, database and FASTA checks (no QC, outputs or report)')
     args = parser.parse_args()
+    if args.resume is not None:
+        from .checkpoint import resume_run
+        return resume_run(args.resume)
+    if args.gff is None:
+        parser.error("the following arguments are required: -g/--gff")
     
     # Set default output directory relative to input file location with auto-increment
     if args.outdir is None:
         gff_dir = os.path.dirname(args.gff) or '.'
-        args.outdir = get_next_run_dir(gff_dir)
+        args.outdir = allocate_run_dir(gff_dir)
     else:
-        args.outdir = get_next_run_dir(os.path.abspath(args.outdir))
+        args.outdir = allocate_run_dir(os.path.abspath(args.outdir))
     
+    # Imported after argument parsing so --help and usage errors return without loading the pipeline
+    if args.validate_only:
+        from .GroupB_Project5 import validate_only
+        validate_only(args.gff, args.fasta, args.outdir)
+        return 0
+
+    from .run_options import RunOptions
+    qc_memo_path = os.path.abspath(args.qc_memo_path) if args.qc_memo_path else None
+    options = RunOptions(dpi=args.dpi, chart_mode=args.charts, explorer=not args.no_explorer, packed_genome=args.packed_genome,
+                         stage_cache=args.stage_cache, qc_memo=args.qc_memo or qc_memo_path is not None, qc_memo_path=qc_memo_path,
+                         streaming=args.streaming, sqlite=args.sqlite, parquet=args.parquet, json_log=args.log_json,
+                         figure_workers=args.figure_workers)
+
+    if args.daemon is not None:
+        from .daemon import DEFAULT_SOCKET, submit
+        return submit(args.gff, args.fasta, args.outdir, options, socket_path=args.daemon or DEFAULT_SOCKET)
+
     # Call the main function from GroupB_Project5.py with the parsed arguments
-    main(args.gff, args.fasta, args.outdir)
+    from .GroupB_Project5 import main
+    main(args.gff, args.fasta, args.outdir, options)
     
     return 0
\ No newline at end of file
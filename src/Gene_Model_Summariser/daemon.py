@@ -0,0 +1,270 @@
+'''
+Docstring for Gene_Model_Summariser.daemon
+Long-running local service that keeps the pipeline warm between runs.
+The server imports the whole stack once and keeps recently used (already validated) GFF databases and reference
+genomes in LRU caches, keyed by path, size and modification time, so an edited input is always reloaded.
+Jobs are the same as GroupB_Project5.main; progress events and the output paths are streamed back as they happen.
+
+Protocol: the client connects to a Unix socket and sends one JSON line, e.g.
+    {"command": "run", "gff": "/abs/models.gff3", "fasta": "/abs/ref.fa", "outdir": "/abs/results/run_004", "options": {"dpi": 200}}
+where options is a RunOptions dict (see run_options.py; options left out keep their defaults),
+and the server answers with JSON lines: {"event": "progress", "stage": ...} ..., then one final
+{"event": "done", "status": "ok" | "failed", ...}. Other commands: "ping", "stats" and "shutdown".
+Jobs run one at a time in the server thread (gffutils databases can only be used from the thread that opened them).
+
+Usage:
+    GroupB-tool serve [--socket PATH]
+    GroupB-tool -g models.gff3 -f ref.fa --daemon
+'''
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .run_options import RunOptions
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"groupb-tool-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+
+
+class DaemonError(Exception):
+    """Raised by the client when the daemon cannot be reached or breaks the protocol."""
+
+
+class LRUCache:
+    """
+    Small least-recently-used cache. on_evict is called with each value dropped to stay within maxsize.
+    """
+
+    def __init__(self, maxsize: int, on_evict: Callable[[Any], None] | None = None) -> None:
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.items: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Any, loader: Callable[[], Any]) -> tuple[Any, bool]:
+        """Returns (value, hit). A loader that raises leaves the cache unchanged."""
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return self.items[key], True
+        value = loader()
+        self.misses += 1
+        self.items[key] = value
+        while len(self.items) > self.maxsize:
+            _, evicted = self.items.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(evicted)
+        return value, False
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self.items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def file_key(path: str) -> tuple[str, int, int]:
+    #cache key that changes whenever the file is edited or replaced
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    return real_path, stat.st_size, stat.st_mtime_ns
+
+
+def close_db(db: Any) -> None:
+    db.conn.close()
+
+
+def close_genome(genome: Any) -> None:
+    if hasattr(genome, "close"):
+        genome.close()
+
+
+class SummariserDaemon:
+    """
+    Holds the caches and runs jobs. Used by the socket server, but independent of it (tests drive it directly).
+    """
+
+    def __init__(self, max_dbs: int = 8, max_genomes: int = 2) -> None:
+        #import the whole stack once, up front, so no job pays for it
+        from . import GroupB_Project5, QC_check, gff_parser, html_generation  # noqa: F401
+        self.dbs = LRUCache(max_dbs, on_evict=close_db)
+        self.genomes = LRUCache(max_genomes, on_evict=close_genome)
+        self.jobs_run = 0
+        self.started = time.time()
+
+    def run(self, request: dict, send: Callable[[dict], None]) -> dict:
+        """Run one job; progress events go through send(); returns the final event."""
+        from .GroupB_Project5 import (
+            flush_logs,
+            load_reference,
+            main,
+            setup_logger,
+            validate_gff_input,
+        )
+
+        start = time.perf_counter()
+        gff_file, fasta_file, outdir = request["gff"], request.get("fasta"), request["outdir"]
+        options = RunOptions.from_dict(request.get("options") or {}) # ValueError (a bad request) on an unknown option
+        out_dir = Path(outdir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        final: dict[str, Any] = {"event": "done", "status": "ok", "run_dir": str(out_dir), "cache": {}}
+        try:
+            #the databases/genomes are validated once when loaded; that validation is logged to this run's log
+            logger = setup_logger(out_dir / "gene_model_summariser.log", json_log=options.json_log)
+            db, hit = self.dbs.get_or_load(file_key(gff_file), lambda: validate_gff_input(gff_file, logger))
+            final["cache"]["db"] = "hit" if hit else "miss"
+            reference = None
+            if fasta_file:
+                reference, hit = self.genomes.get_or_load(file_key(fasta_file) + (options.packed_genome,),
+                                                          lambda: load_reference(fasta_file, logger, options.packed_genome))
+                final["cache"]["genome"] = "hit" if hit else "miss"
+            main(gff_file, fasta_file, str(out_dir), options, db=db, reference=reference,
+                 progress=lambda stage: send({"event": "progress", "stage": stage,
+                                              "seconds": round(time.perf_counter() - start, 3)}))
+            final["outputs"] = sorted(str(p) for p in out_dir.iterdir())
+        except SystemExit:
+            final.update(status="failed", error="validation failed (see gene_model_summariser.log in the run directory)")
+        except Exception as e:  # noqa: BLE001 - report the failure to the client and keep serving
+            final.update(status="failed", error=f"{type(e).__name__}: {e}")
+        flush_logs() # the job's log is complete before the client hears back
+        self.jobs_run += 1
+        final["seconds"] = round(time.perf_counter() - start, 3)
+        return final
+
+    def stats(self) -> dict:
+        return {"event": "stats", "jobs_run": self.jobs_run, "uptime_seconds": round(time.time() - self.started, 1),
+                "dbs": self.dbs.stats(), "genomes": self.genomes.stats()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: DaemonServer = self.server # type: ignore[assignment]
+
+        def send(message: dict) -> None:
+            self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+        try:
+            request = json.loads(self.rfile.readline())
+            command = request.get("command")
+            if command == "run":
+                send(server.daemon.run(request, send))
+            elif command == "ping":
+                send({"event": "pong", "pid": os.getpid()})
+            elif command == "stats":
+                send(server.daemon.stats())
+            elif command == "shutdown":
+                server.stopping = True
+                send({"event": "bye"})
+            else:
+                send({"event": "error", "error": f"unknown command {command!r}"})
+        except (ValueError, KeyError) as e:
+            send({"event": "error", "error": f"bad request: {e}"})
+        except BrokenPipeError:
+            pass #client went away; the job's outputs are still on disk
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    #single-threaded on purpose: requests are handled one at a time in the thread that owns the caches
+    def __init__(self, socket_path: str, daemon: SummariserDaemon) -> None:
+        self.daemon = daemon
+        self.stopping = False
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o600) #only this user may submit jobs
+
+    def serve_until_shutdown(self, poll_interval: float = 0.5) -> None:
+        self.timeout = poll_interval
+        while not self.stopping:
+            self.handle_request()
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """Delete a socket file left by a daemon that is no longer running; raise if one is still listening."""
+    if not os.path.exists(socket_path):
+        return
+    try:
+        request(socket_path, {"command": "ping"})
+    except DaemonError:
+        os.unlink(socket_path)
+        return
+    raise DaemonError(f"a daemon is already listening on {socket_path}")
+
+
+def serve(socket_path: str = DEFAULT_SOCKET, max_dbs: int = 8, max_genomes: int = 2) -> None:
+    remove_stale_socket(socket_path)
+    daemon = SummariserDaemon(max_dbs=max_dbs, max_genomes=max_genomes)
+    server = DaemonServer(socket_path, daemon)
+    try:
+        server.serve_until_shutdown()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def request(socket_path: str, message: dict, on_event: Callable[[dict], None] | None = None,
+            timeout: float | None = None) -> dict:
+    """
+    Send one request and read events until the final one, which is returned. on_event sees every progress event.
+    Raises DaemonError if the daemon is not running or the connection drops.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                for line in stream:
+                    event: dict = json.loads(line)
+                    if event.get("event") != "progress":
+                        return event
+                    if on_event:
+                        on_event(event)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise DaemonError(f"no daemon running on {socket_path} (start one with `GroupB-tool serve`)") from e
+    except OSError as e:
+        raise DaemonError(f"lost connection to daemon on {socket_path}: {e}") from e
+    raise DaemonError(f"daemon on {socket_path} closed the connection without a result")
+
+
+def submit(gff_file: str, fasta_file: str | None, outdir: str, options: RunOptions, socket_path: str = DEFAULT_SOCKET) -> int:
+    """Client side of `GroupB-tool ... --daemon`: run the job on the daemon, printing progress. Returns an exit code."""
+    message = {"command": "run", "gff": os.path.abspath(gff_file), "fasta": os.path.abspath(fasta_file) if fasta_file else None,
+               "outdir": os.path.abspath(outdir), "options": options.to_dict()}
+    try:
+        final = request(socket_path, message, on_event=lambda event: print(f"[{event['seconds']:.2f}s] {event['stage']}"))
+    except DaemonError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if final.get("status") != "ok":
+        print(f"error: {final.get('error')}", file=sys.stderr)
+        return 1
+    print(f"Outputs written to {final['run_dir']} (cache: {final['cache']})")
+    return 0
+
+
+def serve_app(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="GroupB-tool serve", description="Run the summariser as a local daemon.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket to listen on")
+    parser.add_argument("--max-dbs", type=int, default=8, help="GFF databases kept open")
+    parser.add_argument("--max-genomes", type=int, default=2, help="Reference genomes kept in memory")
+    parser.add_argument("--stop", action="store_true", help="Stop the daemon listening on --socket")
+    args = parser.parse_args(argv)
+    try:
+        if args.stop:
+            request(args.socket, {"command": "shutdown"})
+            return 0
+        print(f"Listening on {args.socket}")
+        serve(args.socket, max_dbs=args.max_dbs, max_genomes=args.max_genomes)
+    except DaemonError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -1,5 +1,23 @@
+from collections.abc import Iterator
+from typing import NamedTuple
+
 import gffutils
 
+# exon and CDS children of one transcript, as gffutils.FeatureDB.children queries them (any depth, each feature once:
+# distinct on the feature id, so separate features with the same coordinates are all kept, as get_exons/get_cds do)
+STRUCTURE_QUERY = """
+SELECT DISTINCT features.id, features.featuretype, features.start, features.end, features.frame
+FROM features JOIN relations ON relations.child = features.id
+WHERE relations.parent = ? AND features.featuretype IN ('exon', 'CDS')
+ORDER BY features.start
+"""
+
+class FeatureCoords(NamedTuple):
+    """The coordinates QC reads from an exon/CDS gffutils.Feature, without building the Feature."""
+    start: int
+    end: int
+    frame: str
+
 class GFF_Parser:
 
     def __init__(self, db: gffutils.FeatureDB) -> None:
@@ -13,6 +31,25 @@ class GFF_Parser:
             genes = list(self.db.features_of_type('protein_coding_gene'))
         return genes
     
+    def iter_genes(self, order_by: tuple[str, ...] | None = None) -> Iterator[gffutils.Feature]:
+        """Yield gene features one at a time from the database (same feature types as get_genes).
+        order_by: database columns to sort by, e.g. ('seqid', 'start'); default is file order."""
+        found = False
+        for gene in self.db.features_of_type('gene', order_by=order_by):
+            found = True
+            yield gene
+        if not found:
+            yield from self.db.features_of_type('protein_coding_gene', order_by=order_by)
+
+    def iter_transcripts(self, order_by: tuple[str, ...] | None = None) -> Iterator[tuple[gffutils.Feature, gffutils.Feature]]:
+        """Yield (gene, transcript) pairs for every gene and transcript with an ID, in gene order (see iter_genes)."""
+        for gene in self.iter_genes(order_by):
+            if not gene.id:
+                continue
+            for transcript in self.get_transcripts(gene.id):
+                if transcript.id:
+                    yield gene, transcript
+
     def get_transcripts(self, gene_id: str) -> list[gffutils.Feature]:
         """Retrieve all transcript features for a given gene ID."""
         transcripts = list(self.db.children(gene_id, featuretype='mRNA', order_by='start'))
@@ -28,6 +65,14 @@ class GFF_Parser:
         cds_features = list(self.db.children(transcript_id, featuretype='CDS', order_by='start'))
         return cds_features
     
+    def transcript_structure(self, transcript_id: str) -> tuple[list[FeatureCoords], list[FeatureCoords]]:
+        """Exons and CDS for a given transcript ID, ordered by start, from one query with no attribute decoding."""
+        exons: list[FeatureCoords] = []
+        cds_features: list[FeatureCoords] = []
+        for _, featuretype, start, end, frame in self.db.conn.execute(STRUCTURE_QUERY, (transcript_id,)):
+            (exons if featuretype == 'exon' else cds_features).append(FeatureCoords(start, end, frame))
+        return exons, cds_features
+
     def count_exons(self, transcript_id: str) -> int:
         """Count the number of exons for a given transcript ID."""
         exons = list(self.db.children(transcript_id, featuretype='exon'))
@@ -42,47 +87,36 @@ class GFF_Parser:
             has_cds = True
         return has_cds
     
+    def transcript_metrics(self, gene: gffutils.Feature, transcript: gffutils.Feature) -> dict:
+        """TSV metrics for one transcript."""
+        return {
+            'gene_id': gene.id,
+            'transcript_id': transcript.id,
+            'exon_count': self.count_exons(transcript.id),
+            'has_cds': self.check_cds(transcript.id),
+            #adding chrom, start, end, strand for later use in BED output
+            'chrom': transcript.chrom,
+            'start': transcript.start,
+            'end': transcript.end,
+            'strand': transcript.strand
+        }
+
     def tsv_output(self) -> dict:
         """putting together the output dictionary for TSV results."""
         output_dict = {}
-        genes = self.get_genes()
-        for gene in genes:
-            if gene.id:
-                transcripts = self.get_transcripts(gene.id)
-            else:
-                continue
-            for transcript in transcripts:
-                if transcript.id:
-                    transcript_id = transcript.id
-                    exon_count = self.count_exons(transcript.id)
-                    has_cds = self.check_cds(transcript.id)
-                    output_dict[transcript.id] = {
-                        'gene_id': gene.id,
-                        'transcript_id': transcript_id,
-                        'exon_count': exon_count,
-                        'has_cds': has_cds,
-                        #adding chrom, start, end, strand for later use in BED output
-                        'chrom': transcript.chrom,
-                        'start': transcript.start,
-                        'end': transcript.end,
-                        'strand': transcript.strand
-                    }
+        for gene, transcript in self.iter_transcripts():
+            output_dict[transcript.id] = self.transcript_metrics(gene, transcript)
         return output_dict
     
     def transcript_model(self) -> dict:
         """Generates a summary model of transcripts with exon counts and CDS presence."""
-        model = {}
-        genes = self.get_genes()
-        for gene in genes:
-            if gene.id:
-                transcripts = self.get_transcripts(gene.id)
-                for transcript in transcripts:
-                    if transcript.id:
-                        exons = self.get_exons(transcript.id)
-                        cds_features = self.get_cds(transcript.id)
-                        model[transcript.id] = {
-                            'gene': gene.id,
-                            'exon(s)': exons,
-                            'CDS(s)': cds_features
-                        }
-        return model
\ No newline at end of file
+        return dict(self.iter_transcript_model())
+
+    def iter_transcript_model(self) -> Iterator[tuple[str, dict]]:
+        """Yields (transcript_id, {'gene', 'exon(s)', 'CDS(s)'}) one transcript at a time (see transcript_model)."""
+        for gene, transcript in self.iter_transcripts():
+            yield transcript.id, {
+                'gene': gene.id,
+                'exon(s)': self.get_exons(transcript.id),
+                'CDS(s)': self.get_cds(transcript.id)
+            }
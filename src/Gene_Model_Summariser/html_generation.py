@@ -4,27 +4,49 @@ This module contains functions to generate HTML reports from the outputs of Pill
 It uses Jinja2 templating to create the HTML structure and pandas to process the TSV data
 '''
 
+from collections.abc import Callable
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 import pandas as pd
+import csv
+import hashlib
 import json
-import matplotlib.pyplot as plt
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .aggregate_report import write_run_summary
+from .parquet_output import (
+    PARQUET_FILENAME,
+    iter_parquet_rows,
+    parquet_available,
+    read_parquet_summary,
+)
+from .stream_stats import TranscriptStatsAggregator
+from .transcript_explorer import COLUMNS, EXPLORER_DIRNAME, INDEX_FILENAME, load_embedded, load_index
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+logger = logging.getLogger("GroupB_logger")
 
 ####################################################################################################################################################################################
 #function used to generate the HTML report using Jinja2 templating
 ############################################################################################################################################################################################
 #the function to generate the HTML report using Jinja2 templating (will be saved into a separate HTML generation file(groupB.html.j2) once finalised)
-def generate_html_report(report_data: dict, template_dir: Path) -> str:
+#template_name: groupB.html.j2 for a run's report, aggregate.html.j2 for the cross-run comparison (aggregate_report.py)
+def generate_html_report(report_data: dict, template_dir: Path, template_name: str = "groupB.html.j2") -> str:
     template_dir = Path(template_dir)
 
     env = Environment(
         loader=FileSystemLoader(str(template_dir)),
         autoescape=select_autoescape(["html", "xml"]),
     )
+    env.policies["json.dumps_kwargs"] = {"sort_keys": True, "separators": (",", ":")} #compact output for the |tojson filter
 
   #load the HTML Jinja2 template from template_dir
-    template_name = "groupB.html.j2"
     try:
         template = env.get_template(template_name)
     except Exception as e:
@@ -43,29 +65,39 @@ def generate_html_report(report_data: dict, template_dir: Path) -> str:
 #loader for run.json for HTML 
 ####################################################################################################################################################################################
 
+#prefers transcript_summary.parquet (typed columns, see parquet_output.py) when the run wrote one and pyarrow is installed
 def load_outputs(output_dir: str | Path) -> tuple[pd.DataFrame, dict]:
     output_dir = Path(output_dir)
 
     tsv_path = output_dir / "transcript_summary.tsv"
-    json_path = output_dir / "run.json"
+    parquet_path = output_dir / PARQUET_FILENAME
 
-    if not tsv_path.exists():
+    if parquet_path.exists() and parquet_available():
+        df = read_parquet_summary(parquet_path)
+    elif not tsv_path.exists():
         raise FileNotFoundError(f"Missing transcript summary TSV: {tsv_path}")
-    if not json_path.exists():
-        raise FileNotFoundError(f"Missing run metadata JSON: {json_path}")
-
-    df = pd.read_csv(tsv_path, sep="\t")
+    else:
+        df = pd.read_csv(tsv_path, sep="\t")
 
     required = {"gene_id","transcript_id","exon_count","has_cds","flags"}
     missing = required - set(df.columns)
     if missing:
         raise ValueError(f"transcript_summary.tsv missing columns: {sorted(missing)}")
 
+    run_info = load_run_info(output_dir)
+
+    return df, run_info
+
+#loader for run.json only - used when the report stats are handed over in memory
+def load_run_info(output_dir: str | Path) -> dict:
+    json_path = Path(output_dir) / "run.json"
+    if not json_path.exists():
+        raise FileNotFoundError(f"Missing run metadata JSON: {json_path}")
 
     with json_path.open("r", encoding="utf-8") as f:
-        run_info = json.load(f)
+        run_info: dict = json.load(f)
 
-    return df, run_info
+    return run_info
 
 ####################################################################################################################################################################################
 #parser for run.json for HTML header 
@@ -107,7 +139,7 @@ def compute_summary_metrics(df: pd.DataFrame) -> dict:
     total_transcripts = int(len(df))  # calculate the total number of transcripts (rows in the DataFrame)
 
     # calculate transcripts per gene statistics: mean, median, maximum
-    transcript_per_gene = df.groupby("gene_id")["transcript_id"].nunique()  # number of transcripots per gene
+    transcript_per_gene = df.groupby("gene_id", observed=True)["transcript_id"].nunique()  # number of transcripots per gene
     transcript_mean = round(float(transcript_per_gene.mean()), 2) if len(transcript_per_gene) else 0.0  # calculate mean transcripts per gene (2 d.p.)
     transcript_median = round(float(transcript_per_gene.median()), 2) if len(transcript_per_gene) else 0.0  # calculate median transcripts per gene (2 d.p.)
     transcript_max = int(transcript_per_gene.max()) if len(transcript_per_gene) else 0  # calculate maximum transcripts per gene
@@ -148,6 +180,15 @@ def summary_metrics_table(metrics: dict) -> pd.DataFrame:
         ("Flagged transcripts (count)", metrics["flagged_transcripts_count"]),
         ("Flagged transcripts (%)", metrics["flagged_transcripts_percent"]),
     ]
+    #percentile metrics only exist when the stats came from the streaming aggregator (stream_stats.py)
+    optional_rows = [
+        ("90th percentile exons per transcript", "exon_count_p90"),
+        ("Median transcript span (bp, approx.)", "transcript_span_median"),
+        ("95th percentile transcript span (bp, approx.)", "transcript_span_p95"),
+    ]
+    for label, key in optional_rows:
+        if metrics.get(key) is not None:
+            rows.append((label, metrics[key]))
     return pd.DataFrame(rows, columns=["metric", "value"]) 
 
 ####################################################################################################################################################################################
@@ -157,25 +198,16 @@ def summary_metrics_table(metrics: dict) -> pd.DataFrame:
 #function to generate histogram data for exon counts 
 def compute_exon_count(df: pd.DataFrame) -> dict[int, int]: 
     # Function to compute the distribution of exon counts from the transcript summary DataFrame
-    exon_count_distribution = {}  #dictionary to hold counts of each exon count
-    for count_exon in df["exon_count"].dropna():  #iterate over non-null exon counts in the DataFrame
-        exon_count = int(count_exon)  #make sure exon_count is an integer
-        exon_count_distribution[exon_count] = exon_count_distribution.get(exon_count, 0) + 1  #increment the count for this exon count
-
-    return exon_count_distribution  #return the dictionary of exon count distribution
+    counts = df["exon_count"].dropna().astype(int).value_counts(sort=False)  #count each exon count in one vectorised pass
+    return {int(exon_count): int(n) for exon_count, n in counts.items()}  #return the dictionary of exon count distribution
 
 #function to generate bar chart data for transcripts per gene distribution
 def compute_transcripts_per_gene_distribution(df: pd.DataFrame) -> dict[int, int]:
     # Function to compute the distribution of transcripts per gene from the transcript summary DataFrame
     transcripts_per_gene = df.groupby("gene_id")["transcript_id"].nunique()  #group by gene_id and count unique transcripts
 
-    distribution = {}  #dictionary to hold counts of each transcripts per gene value
-
-    for count in transcripts_per_gene:  #iterate over the counts of transcripts per gene
-        count = int(count)  #convert count to integer
-        distribution[count] = distribution.get(count, 0) + 1  #increment the count for this transcripts per gene value
-
-    return distribution  #return the dictionary of transcripts per gene distribution
+    counts = transcripts_per_gene.value_counts(sort=False)  #how many genes have each transcripts-per-gene value
+    return {int(count): int(n) for count, n in counts.items()}  #return the dictionary of transcripts per gene distribution
 
 #function to compute counts of flagged vs unflagged transcripts
 def compute_flagged_vs_unflagged(df: pd.DataFrame) -> dict[str, int]:
@@ -213,68 +245,78 @@ def compute_qc_flag_count_per_transcript(df: pd.DataFrame) -> dict[str, int]:
 #functions to build visualisations from the compute data functions above
 ####################################################################################################################################################################################
 
+#all plots use object-oriented matplotlib Figures (no pyplot global state) rendered with the Agg canvas
+#matplotlib is imported inside new_figure so that reports without PNG figures never import it
+DEFAULT_DPI = 200
+
+def new_figure(figsize: tuple[float, float]) -> tuple["Figure", "Axes"]:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize) #set figure size
+    FigureCanvasAgg(fig) #attach the Agg canvas so savefig never touches a GUI backend
+    return fig, fig.add_subplot()
+
 #function to plot exon count distribution (bar chart)
-def plot_exon_count_histogram(exon_count_distribution: dict[int, int], outpath: Path) -> str:
+def plot_exon_count_histogram(exon_count_distribution: dict[int, int], outpath: Path, dpi: int = DEFAULT_DPI) -> str:
     exon_counts = sorted(exon_count_distribution.keys()) #sorted list of exon counts
     transcript_counts = [exon_count_distribution[x] for x in exon_counts] #corresponding transcript counts
 
-    plt.figure(figsize=(8, 4)) #set figure size
-    plt.bar(exon_counts, transcript_counts) #create bar chart
-    plt.xlabel("Number of exons") #label x-axis
-    plt.ylabel("Number of transcripts") #label y-axis
-    plt.title("Exon count distribution") #set chart title
-    plt.xticks(exon_counts)  # show each exon count on the x-axis
-    plt.tight_layout() #adjust layout to prevent clipping
-    plt.savefig(outpath, dpi=200) #save the figure 
-    plt.close() #close the file and return 
+    fig, ax = new_figure((8, 4)) #set figure size
+    ax.bar(exon_counts, transcript_counts) #create bar chart
+    ax.set_xlabel("Number of exons") #label x-axis
+    ax.set_ylabel("Number of transcripts") #label y-axis
+    ax.set_title("Exon count distribution") #set chart title
+    ax.set_xticks(exon_counts)  # show each exon count on the x-axis
+    fig.tight_layout() #adjust layout to prevent clipping
+    fig.savefig(outpath, dpi=dpi) #save the figure 
     return outpath.name  # return image filename for embedding in HTML
 
 
 #function to plot transcripts per gene distribution bar chart
-def plot_transcripts_per_gene_distribution(distribution: dict[int, int], outpath: Path) -> str:
+def plot_transcripts_per_gene_distribution(distribution: dict[int, int], outpath: Path, dpi: int = DEFAULT_DPI) -> str:
     transcripts_per_gene = sorted(distribution.keys()) #sorted list of transcripts per gene counts
     gene_counts = [distribution[x] for x in transcripts_per_gene] #corresponding gene counts
 
-    plt.figure(figsize=(8, 4)) #set figure size
-    plt.bar(transcripts_per_gene, gene_counts) #create bar chart
-    plt.xlabel("Transcripts per gene") #label x-axis
-    plt.ylabel("Number of genes") #label y-axis
-    plt.title("Transcripts per gene distribution") #set chart title
-    plt.xticks(transcripts_per_gene)  # show each integer count on the x-axis (long labels in horizontal will disrupt the chart)
-    plt.tight_layout() #adjust layout to prevent clipping
-    plt.savefig(outpath, dpi=200) #save the figure 
-    plt.close() #close the file and return 
+    fig, ax = new_figure((8, 4)) #set figure size
+    ax.bar(transcripts_per_gene, gene_counts) #create bar chart
+    ax.set_xlabel("Transcripts per gene") #label x-axis
+    ax.set_ylabel("Number of genes") #label y-axis
+    ax.set_title("Transcripts per gene distribution") #set chart title
+    ax.set_xticks(transcripts_per_gene)  # show each integer count on the x-axis (long labels in horizontal will disrupt the chart)
+    fig.tight_layout() #adjust layout to prevent clipping
+    fig.savefig(outpath, dpi=dpi) #save the figure 
     return outpath.name  # return image filename for embedding in HTML
 
 #function to plot flagged vs unflagged transcripts bar chart
-def plot_flagged_vs_unflagged(counts: dict[str, int], outpath: Path) -> str:
+def plot_flagged_vs_unflagged(counts: dict[str, int], outpath: Path, dpi: int = DEFAULT_DPI) -> str:
     labels = ["flagged", "unflagged"] #labels for the two categories
     values = [counts["flagged"], counts["unflagged"]] #corresponding counts
 
-    plt.figure(figsize=(6, 4)) #set figure size
-    plt.bar(labels, values) #create bar chart
-    plt.xlabel("Transcript status") #label x-axis
-    plt.ylabel("Number of transcripts") #label y-axis
-    plt.title("Flagged vs unflagged transcripts") #set chart title
-    plt.tight_layout() #adjust layout to prevent clipping
-    plt.savefig(outpath, dpi=200) #save the figure 
-    plt.close() #close the file and return 
+    fig, ax = new_figure((6, 4)) #set figure size
+    ax.bar(labels, values) #create bar chart
+    ax.set_xlabel("Transcript status") #label x-axis
+    ax.set_ylabel("Number of transcripts") #label y-axis
+    ax.set_title("Flagged vs unflagged transcripts") #set chart title
+    fig.tight_layout() #adjust layout to prevent clipping
+    fig.savefig(outpath, dpi=dpi) #save the figure 
     return outpath.name  # return image filename for embedding in HTML
 
 #function to plot qc flag counts per transcript bar chart
-def plot_qc_flag_counts_per_transcript(flag_counts: dict[str, int], outpath: Path) -> str:
+def plot_qc_flag_counts_per_transcript(flag_counts: dict[str, int], outpath: Path, dpi: int = DEFAULT_DPI) -> str:
     flags = QC_FLAG_NAMES  # fixed order from your definitions
     counts = [flag_counts.get(f, 0) for f in flags] # corresponding counts
 
-    plt.figure(figsize=(10, 4)) #set figure size
-    plt.bar(flags, counts) #create bar chart
-    plt.xlabel("QC flag") #label x-axis
-    plt.ylabel("Number of transcripts") #label y-axis
-    plt.title("QC flag counts (unique per transcript)") #set chart title
-    plt.xticks(rotation=45, ha="right") #rotate x-axis labels for readability (long labels in horizontal will disrupt the chart)
-    plt.tight_layout() #adjust layout to prevent clipping
-    plt.savefig(outpath, dpi=200) #save the figure 
-    plt.close() #close the file and return 
+    fig, ax = new_figure((10, 4)) #set figure size
+    ax.bar(flags, counts) #create bar chart
+    ax.set_xlabel("QC flag") #label x-axis
+    ax.set_ylabel("Number of transcripts") #label y-axis
+    ax.set_title("QC flag counts (unique per transcript)") #set chart title
+    ax.tick_params(axis="x", labelrotation=45) #rotate x-axis labels for readability (long labels in horizontal will disrupt the chart)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    fig.tight_layout() #adjust layout to prevent clipping
+    fig.savefig(outpath, dpi=dpi) #save the figure 
     return outpath.name  # return image filename for embedding in HTML
 
 ####################################################################################################################################################################################
@@ -309,56 +351,178 @@ def compute_report_stats(df: pd.DataFrame) -> dict:
     return report_stats
 
 
+#builds the same report stats dictionary as compute_report_stats from a streaming TranscriptStatsAggregator
+#the aggregator is filled while output_results writes each row, so run_report does not re-read transcript_summary.tsv
+def report_stats_from_aggregator(aggregator: TranscriptStatsAggregator) -> dict:
+    metrics = aggregator.summary_metrics()
+    return {
+        "summary_metrics": metrics,
+        "summary_metrics_table": summary_metrics_table(metrics).to_dict(orient="records"),
+        "plot_inputs": aggregator.plot_inputs(),
+    }
+
+#fallback for standalone report regeneration: stream transcript_summary.tsv row by row into the aggregator (constant memory)
+def stream_report_stats(tsv_path: str | Path) -> dict:
+    tsv_path = Path(tsv_path)
+    if not tsv_path.exists():
+        raise FileNotFoundError(f"Missing transcript summary TSV: {tsv_path}")
+
+    with tsv_path.open("r", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        required = {"gene_id","transcript_id","exon_count","has_cds","flags"}
+        missing = required - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"transcript_summary.tsv missing columns: {sorted(missing)}")
+        aggregator = TranscriptStatsAggregator().add_all(reader)
+
+    return report_stats_from_aggregator(aggregator)
+
+#same as stream_report_stats, from transcript_summary.parquet (typed columns, no text parsing; one batch in memory at a time)
+def parquet_report_stats(parquet_path: str | Path) -> dict:
+    return report_stats_from_aggregator(TranscriptStatsAggregator().add_all(iter_parquet_rows(parquet_path)))
+
+#stats of a finished run read back from disk: its Parquet copy when it has one (and pyarrow is installed), else the TSV
+def load_report_stats(output_dir: str | Path) -> dict:
+    parquet_path = Path(output_dir) / PARQUET_FILENAME
+    if parquet_path.exists() and parquet_available():
+        return parquet_report_stats(parquet_path)
+    return stream_report_stats(Path(output_dir) / "transcript_summary.tsv")
+
+
+#figures in the report: key used in the template -> (png filename, plot_inputs key, plot function)
+REPORT_FIGURES: dict[str, tuple[str, str, Callable[..., str]]] = {
+    "exon_count_plot": ("exon_count_distribution.png", "exon_count_histogram_data", plot_exon_count_histogram),
+    "transcripts_per_gene_plot": ("transcripts_per_gene_distribution.png", "transcripts_per_gene_bar_data", plot_transcripts_per_gene_distribution),
+    "flagged_vs_unflagged_plot": ("flagged_vs_unflagged.png", "flagged_vs_unflagged_bar_data", plot_flagged_vs_unflagged),
+    "qc_flags_per_transcript_plot": ("qc_flags_per_transcript.png", "qc_flag_counts_per_transcript_data", plot_qc_flag_counts_per_transcript),
+}
+FIGURE_HASHES_FILENAME = "figure_hashes.json" #records the content hash each PNG in figures/ was rendered from
+
+#content hash of everything that determines a figure's pixels: its data, the dpi and the plotting code version
+def figure_hash(figure_key: str, data: dict, dpi: int) -> str:
+    from .run_json_builder import TOOL_VERSION
+
+    payload = json.dumps({"figure": figure_key, "data": {str(k): v for k, v in data.items()}, "dpi": dpi,
+                          "tool_version": TOOL_VERSION, "flag_names": QC_FLAG_NAMES}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+#worker entry point - module level so it can be sent to a worker process
+def render_figure(figure_key: str, data: dict, outpath: Path, dpi: int) -> str:
+    plot_function = REPORT_FIGURES[figure_key][2]
+    return plot_function(data, outpath, dpi=dpi)
+
 #used to save the report figures
 #takes in the data from the report_stats and majke the output folder for the figures for the HTML to embed them
-def save_report_figures(plot_inputs: dict, output_dir: Path) -> dict[str, str]:
+#figures whose content hash matches the existing PNG are skipped; the rest are rendered in this process or, with workers > 1, in worker processes
+#dpi: resolution of the PNGs; workers: max worker processes (1 = render in this process, None = one per CPU)
+def save_report_figures(plot_inputs: dict, output_dir: Path, dpi: int = DEFAULT_DPI, workers: int | None = 1) -> dict[str, str]:
     # Create a folder called "figures" inside the output directory
     figures_dir = output_dir / "figures"
     figures_dir.mkdir(parents=True, exist_ok=True) 
 
-    #Plot 1: Exon count distribution - make the plot and save it as a .png 
-    exon_count_plot_filename = plot_exon_count_histogram(plot_inputs["exon_count_histogram_data"],
-        figures_dir / "exon_count_distribution.png")
-
-    #Plot 2: Transcripts per gene distribution - make the plot and save it as a .png  
-    transcripts_per_gene_plot_filename = plot_transcripts_per_gene_distribution(plot_inputs["transcripts_per_gene_bar_data"],
-        figures_dir / "transcripts_per_gene_distribution.png")
-
-    #Plot 3: Flagged vs unflagged transcripts -make the plot and save it as a .png 
-    flagged_vs_unflagged_plot_filename = plot_flagged_vs_unflagged(plot_inputs["flagged_vs_unflagged_bar_data"],
-        figures_dir / "flagged_vs_unflagged.png")
+    #load the hashes of previously rendered figures (missing/corrupt manifest = render everything)
+    hashes_path = figures_dir / FIGURE_HASHES_FILENAME
+    try:
+        previous_hashes = json.loads(hashes_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        previous_hashes = {}
+
+    #work out which figures actually need rendering
+    figures = {}
+    hashes = {}
+    to_render = []
+    for figure_key, (filename, input_key, _) in REPORT_FIGURES.items():
+        data = plot_inputs[input_key]
+        outpath = figures_dir / filename
+        hashes[filename] = figure_hash(figure_key, data, dpi)
+        figures[figure_key] = filename
+        if outpath.exists() and previous_hashes.get(filename) == hashes[filename]:
+            continue #unchanged since the last render
+        to_render.append((figure_key, data, outpath, dpi))
+
+    n_workers = min(len(to_render), workers or os.cpu_count() or 1)
+    if n_workers > 1:
+        import matplotlib.figure  # noqa: F401 - import once here so forked workers inherit it instead of re-importing
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(render_figure, *job) for job in to_render]
+            for future in futures:
+                future.result() #re-raise any plotting error here
+    else:
+        for job in to_render:
+            render_figure(*job)
 
-    #Plot 4: QC flags for one count per transcript - make the plot and save it as a .png
-    qc_flags_plot_filename = plot_qc_flag_counts_per_transcript(plot_inputs["qc_flag_counts_per_transcript_data"],
-        figures_dir / "qc_flags_per_transcript.png")
+    hashes_path.write_text(json.dumps(hashes, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
     #return the image filenames - these are saved to the same root directory as the transcript_summary.tsv but in a seperate directory
     #these figs will then be embedded into the HTML file 
-    return {
-        "exon_count_plot": exon_count_plot_filename,
-        "transcripts_per_gene_plot": transcripts_per_gene_plot_filename,
-        "flagged_vs_unflagged_plot": flagged_vs_unflagged_plot_filename,
-        "qc_flags_per_transcript_plot": qc_flags_plot_filename}
+    return figures
+
+#report chart modes: "png" renders matplotlib figures into figures/, "inline" embeds the chart data as compact JSON
+#and draws the charts in the browser with inline SVG/JS (matplotlib is never imported and the report is a single file)
+CHART_MODES = ("png", "inline")
+
+#compact chart specs for the inline mode - same data and labels as the four matplotlib plots
+def build_inline_charts(plot_inputs: dict) -> list[dict]:
+    exon_counts = plot_inputs["exon_count_histogram_data"]
+    per_gene = plot_inputs["transcripts_per_gene_bar_data"]
+    flagged = plot_inputs["flagged_vs_unflagged_bar_data"]
+    flag_counts = plot_inputs["qc_flag_counts_per_transcript_data"]
+    return [
+        {"id": "exon_count", "title": "Exon count distribution", "x": "Number of exons", "y": "Number of transcripts",
+         "bars": [[int(k), int(exon_counts[k])] for k in sorted(exon_counts)]},
+        {"id": "transcripts_per_gene", "title": "Transcripts per gene distribution", "x": "Transcripts per gene",
+         "y": "Number of genes", "bars": [[int(k), int(per_gene[k])] for k in sorted(per_gene)]},
+        {"id": "flagged_vs_unflagged", "title": "Flagged vs unflagged transcripts", "x": "Transcript status",
+         "y": "Number of transcripts", "bars": [["flagged", flagged["flagged"]], ["unflagged", flagged["unflagged"]]]},
+        {"id": "qc_flags", "title": "QC flag counts (unique per transcript)", "x": "QC flag", "y": "Number of transcripts",
+         "bars": [[f, flag_counts.get(f, 0)] for f in QC_FLAG_NAMES], "rotate_labels": True},
+    ]
 
 #####################################################################################################################
 #Once all built in Python, put into data dictionary in Jinja2 format
 ####################################################################################################################
 #used to build a string with the report data, summary metrics and links to raw .tsv and .json files 
 #as well as qc flag definitions
-def build_report_data(report_stats: dict, figures: dict) -> dict:
+#figures: PNG filenames (png mode); charts: inline chart specs (inline mode)
+def build_report_data(report_stats: dict, figures: dict, chart_mode: str = "png", charts: list[dict] | None = None) -> dict:
     return {
         "summary_metrics": report_stats["summary_metrics"],
         "summary_metrics_table": report_stats["summary_metrics_table"],
         "qc_flag_definitions": QC_FLAG_DEFINITIONS,
         "qc_flag_names": QC_FLAG_NAMES,
+        "chart_mode": chart_mode,
         "figures": figures,
+        "charts": charts or [],
         "artefacts": {"results_tsv": "transcript_summary.tsv", "run_json": "run.json"},
     }
 
 
+# the transcript explorer table is only shown when output_results wrote its shards (explorer/index.js)
+# embed: put the index and the compressed shards into the report itself (inline mode), so it loads no explorer/ files;
+# runs with more than EMBED_MAX_ROWS transcripts keep loading them from explorer/, so report.html stays small enough to open
+EMBED_MAX_ROWS = 100_000
+
+def build_explorer_data(output_dir: Path, embed: bool = False) -> dict | None:
+    index = load_index(output_dir)
+    if index is None:
+        return None
+    if embed and index["total"] > EMBED_MAX_ROWS:
+        logger.info(f"Explorer data has {index['total']} transcripts (more than {EMBED_MAX_ROWS}): "
+                    f"report.html loads it from {EXPLORER_DIRNAME}/ instead of embedding it")
+        embed = False
+    return {"index": f"{EXPLORER_DIRNAME}/{INDEX_FILENAME}", "columns": COLUMNS,
+            "embedded": load_embedded(output_dir) if embed else None}
+
+
 # this is used for the CLI endpoint to generate the report
-def run_report(output_dir: Path, template_dir: Path | None = None) -> Path:
+# report_stats: stats already accumulated in memory (report_stats_from_aggregator) - if None they are re-read from disk (load_report_stats)
+# dpi: resolution of the PNG figures; chart_mode: "png" (matplotlib figures) or "inline" (browser-drawn SVG, single file)
+# figure_workers: processes rendering the PNG figures (1 = in this process, None = one per CPU; see save_report_figures)
+def run_report(output_dir: Path, template_dir: Path | None = None, report_stats: dict | None = None, dpi: int = DEFAULT_DPI,
+               chart_mode: str = "png", figure_workers: int | None = 1) -> Path:
     output_dir = Path(output_dir)  # output directory
+    if chart_mode not in CHART_MODES:
+        raise ValueError(f"chart_mode must be one of {CHART_MODES}, got {chart_mode!r}")
 
     # If template_dir not provided, use the Gene_Model_Summariser package directory
     if template_dir is None:
@@ -366,20 +530,28 @@ def run_report(output_dir: Path, template_dir: Path | None = None) -> Path:
     else:
         template_dir = Path(template_dir)
 
-    df, run_info = load_outputs(output_dir)  # reads transcript_summary.tsv + run.json and load them in
-    report_stats = compute_report_stats(df)  # compute stats for the reports
-    figures = save_report_figures(report_stats["plot_inputs"], output_dir)  # save figures into this report
+    if report_stats is None:
+        report_stats = load_report_stats(output_dir)  # standalone regeneration: one streaming pass over the Parquet file or TSV
+    run_info = load_run_info(output_dir)  # load run.json for the provenance section
+    if chart_mode == "inline":
+        figures: dict[str, str] = {}
+        charts = build_inline_charts(report_stats["plot_inputs"])  # chart data embedded in the HTML, drawn client-side
+    else:
+        figures = save_report_figures(report_stats["plot_inputs"], output_dir, dpi=dpi, workers=figure_workers)  # save figures into this report (unchanged ones are reused)
+        charts = None
 
     # generates the report_data dictionary for Jinja2 loading
-    report_data = build_report_data(report_stats, figures)
+    report_data = build_report_data(report_stats, figures, chart_mode=chart_mode, charts=charts)
 
     # load data in from run.json
     report_data["run_info"] = run_info
     report_data["provenance"] = build_provenance(run_info)
+    report_data["explorer"] = build_explorer_data(output_dir, embed=chart_mode == "inline")  # inline reports stay single-file
 
     html = generate_html_report(report_data, template_dir=template_dir)  # loads groupB.html.j2 from template_dir
 
     # load HTML report into output dir
     out_html = output_dir / "report.html"
     out_html.write_text(html, encoding="utf-8")
+    write_run_summary(output_dir, report_stats, run_info)  # summary.json sidecar read by GroupB-tool aggregate
     return out_html
\ No newline at end of file
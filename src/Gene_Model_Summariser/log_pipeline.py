@@ -0,0 +1,199 @@
+'''
+Docstring for Gene_Model_Summariser.log_pipeline
+Non-blocking logging for the pipeline. The "GroupB_logger" logger only ever puts records on an in-memory queue
+(logging.handlers.QueueHandler); a single QueueListener thread formats them and writes them to the run's log file,
+so validation and QC loops never wait on disk.
+
+Records at ERROR and above wait until they are written (they are followed by the run exiting, and the log must say why);
+everything else is written in the background and flushed at the end of the run (flush_logs).
+
+Worker processes (batch mode) can also forward every record to one shared log owned by the parent process:
+SharedLogWriter listens on a multiprocessing queue and forward_to_shared_log attaches a worker to it, so many
+jobs write one interleaved log without sharing a file handle. Each forwarded record carries its run directory.
+
+With json_log a JSON-lines copy of each log (<log>.jsonl) is written next to it: one object per record with
+time, level, message, process, thread and (for shared logs) run.
+'''
+
+import atexit
+import json
+import logging
+import os
+import queue
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any
+
+LOGGER_NAME = "GroupB_logger"
+TEXT_FORMAT = "%(levelname)s - %(asctime)s - %(message)s"
+SHARED_TEXT_FORMAT = "%(levelname)s - %(asctime)s - %(processName)s - %(run)s - %(message)s"
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "process": record.processName,
+            "thread": record.threadName,
+        }
+        run = getattr(record, "run", None) #set by _RunFilter on records forwarded to a shared log
+        if run is not None:
+            entry["run"] = run
+        return json.dumps(entry)
+
+
+def json_log_path(log_file: str | Path) -> Path:
+    log_file = Path(log_file)
+    return log_file.with_name(log_file.name + ".jsonl")
+
+
+def log_handlers(log_file: str | Path, json_log: bool = False, text_format: str = TEXT_FORMAT) -> list[logging.Handler]:
+    """The file handlers that write log_file (appending) and, with json_log, its JSON-lines copy."""
+    text = logging.FileHandler(log_file)
+    text.setFormatter(logging.Formatter(text_format))
+    handlers: list[logging.Handler] = [text]
+    if json_log:
+        structured = logging.FileHandler(json_log_path(log_file))
+        structured.setFormatter(JSONLinesFormatter())
+        handlers.append(structured)
+    return handlers
+
+
+class _RunQueueHandler(QueueHandler):
+    #enqueue and return; ERROR records (and flush()) wait for the writer thread to catch up
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.log_queue = log_queue
+        self.pid = os.getpid()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record #same process: the writer thread formats it, so nothing is copied or formatted here
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pid == os.getpid(): #a forked child has the queue but not the writer thread
+            self.log_queue.join()
+
+
+class LogPipeline:
+    """
+    A queue and the listener thread that drains it into handlers. handler is the QueueHandler to attach to loggers.
+    """
+
+    def __init__(self, handlers: list[logging.Handler]) -> None:
+        self.handlers = handlers
+        self.queue: queue.Queue = queue.Queue()
+        self.handler = _RunQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def flush(self) -> None:
+        self.handler.flush()
+
+    def close(self) -> None:
+        if self.handler.pid == os.getpid():
+            self.listener.stop() #writes whatever is still queued
+        for handler in self.handlers:
+            handler.close()
+
+
+class _RunFilter(logging.Filter):
+    #stamps forwarded records with the run directory currently logging in this process
+    run: str | None = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run = self.run
+        return True
+
+
+_run_pipeline: LogPipeline | None = None
+_forwarder: QueueHandler | None = None
+_run_stamp = _RunFilter()
+
+
+def start_run_log(log_file: str | Path, json_log: bool = False) -> logging.Logger:
+    """
+    Point GroupB_logger at log_file (and log_file.jsonl with json_log) for this run, replacing the previous run's log.
+    Returns the logger.
+    """
+    global _run_pipeline
+    stop_run_log()
+    _run_pipeline = LogPipeline(log_handlers(log_file, json_log))
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+    logger.handlers.clear() # remove existing handlers so each run logs to the right file
+    logger.addHandler(_run_pipeline.handler)
+    if _forwarder is not None:
+        _run_stamp.run = str(Path(log_file).parent)
+        logger.addHandler(_forwarder)
+    return logger
+
+
+def flush_logs() -> None:
+    """Wait until every record logged so far is in the run's log files."""
+    if _run_pipeline is not None:
+        _run_pipeline.flush()
+
+
+def stop_run_log() -> None:
+    global _run_pipeline
+    if _run_pipeline is not None:
+        pipeline, _run_pipeline = _run_pipeline, None
+        _run_stamp.run = None
+        logging.getLogger(LOGGER_NAME).removeHandler(pipeline.handler)
+        pipeline.close()
+
+
+atexit.register(stop_run_log)
+
+
+def forward_to_shared_log(log_queue: Any) -> None:
+    """
+    Also send every GroupB_logger record of this process to a SharedLogWriter's queue (ProcessPoolExecutor initializer).
+    """
+    global _forwarder
+    logger = logging.getLogger(LOGGER_NAME)
+    if _forwarder is not None:
+        logger.removeHandler(_forwarder)
+    _forwarder = QueueHandler(log_queue)
+    _forwarder.addFilter(_run_stamp)
+    logger.addHandler(_forwarder)
+
+
+def stop_forwarding() -> None:
+    global _forwarder
+    if _forwarder is not None:
+        logging.getLogger(LOGGER_NAME).removeHandler(_forwarder)
+        _forwarder = None
+
+
+class SharedLogWriter:
+    """
+    The single writer of a log shared by several processes. Pass .queue to forward_to_shared_log in each worker;
+    close() once the workers are done writes the remaining records.
+    """
+
+    def __init__(self, log_file: str | Path, json_log: bool = False) -> None:
+        import multiprocessing.queues
+
+        self.queue: multiprocessing.queues.Queue[logging.LogRecord] = multiprocessing.Queue()
+        self.handlers = log_handlers(log_file, json_log, text_format=SHARED_TEXT_FORMAT)
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def close(self) -> None:
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        self.queue.close()
+        self.queue.join_thread()
@@ -0,0 +1,307 @@
+'''
+Docstring for Gene_Model_Summariser.packed_genome
+2-bit packed reference genome, built once from a validated FASTA and cached on disk next to it (<fasta>.gms2bit).
+A, C, G and T are packed four bases per byte; N and other IUPAC codes are stored as run-length masks
+(start, length[, base]) and their packed bases are written as A. The cache file is memory-mapped, so opening it
+costs nothing up front and only the pages QC touches are read.
+
+fetch() decodes just the bytes covering a sub-range (what QC_flags.cds_sequence needs); gc_count() and n_count()
+answer from the packed bytes and the masks without ever building a string.
+Decoded sequence is upper case (QC compares bases case-insensitively).
+
+Cache layout: MAGIC, 8-byte header length, JSON header (source file size/mtime, sequences with byte offsets,
+lengths and masks), then the packed bases. The cache is rebuilt whenever the FASTA's size or mtime changes.
+'''
+
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Self
+
+MAGIC = b"GMS2BIT1"
+CACHE_SUFFIX = ".gms2bit"
+BASES = "ACGT"
+#each byte decodes to 4 bases, first base in the two highest bits
+DECODE = [BASES[b >> 6] + BASES[(b >> 4) & 3] + BASES[(b >> 2) & 3] + BASES[b & 3] for b in range(256)]
+#number of G/C bases in each packed byte
+GC_PER_BYTE = bytes(sum(1 for base in DECODE[b] if base in "GC") for b in range(256))
+CHUNK_BASES = 1 << 22 #bases packed per step while building
+
+
+class PackedChromosome:
+    """
+    One sequence of a PackedGenome. Slicing decodes only the requested range; `.seq` returns the view itself
+    so code written for SeqRecord (record.seq[start:end]) works on it unchanged.
+    """
+
+    def __init__(self, genome: "PackedGenome", name: str, entry: dict) -> None:
+        self.genome = genome
+        self.id = name
+        self.offset: int = entry["offset"]
+        self.length: int = entry["length"]
+        self.n_runs = entry["n_runs"] #[[start, length], ...] sorted, non-overlapping
+        self.iupac_runs = entry["iupac_runs"] #[[start, length, base], ...]
+        self.n_starts = [run[0] for run in self.n_runs]
+        self.iupac_starts = [run[0] for run in self.iupac_runs]
+
+    @property
+    def seq(self) -> "PackedChromosome":
+        return self
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, key: int | slice) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            text = self.fetch(start, stop)
+            return text if step == 1 else text[::step]
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("chromosome index out of range")
+        return self.fetch(key, key + 1)
+
+    def __str__(self) -> str:
+        return self.fetch(0, self.length)
+
+    def __repr__(self) -> str:
+        return f"PackedChromosome({self.id!r}, length={self.length})"
+
+    def _clip(self, start: int, end: int | None) -> tuple[int, int]:
+        end = self.length if end is None else min(end, self.length)
+        return max(0, start), end
+
+    def fetch(self, start: int = 0, end: int | None = None) -> str:
+        """Decode bases [start, end) (0-based, end exclusive)."""
+        start, end = self._clip(start, end)
+        if end <= start:
+            return ""
+        data = self.genome.data
+        first_byte = self.offset + start // 4
+        last_byte = self.offset + (end + 3) // 4
+        text = "".join(map(DECODE.__getitem__, data[first_byte:last_byte]))
+        skip = start % 4
+        text = text[skip:skip + end - start]
+        #overwrite masked positions (stored as A in the packed bytes)
+        if self.n_runs or self.iupac_runs:
+            chars = None
+            for run_start, run_length, base in self._runs_in(start, end):
+                if chars is None:
+                    chars = list(text)
+                lo, hi = max(run_start, start), min(run_start + run_length, end)
+                chars[lo - start:hi - start] = base * (hi - lo)
+            if chars is not None:
+                text = "".join(chars)
+        return text
+
+    def _runs_in(self, start: int, end: int) -> Iterator[tuple[int, int, str]]:
+        for runs, starts, default in ((self.n_runs, self.n_starts, "N"), (self.iupac_runs, self.iupac_starts, None)):
+            i = max(0, bisect_right(starts, start) - 1)
+            while i < len(runs) and runs[i][0] < end:
+                run = runs[i]
+                if run[0] + run[1] > start:
+                    yield run[0], run[1], default or run[2]
+                i += 1
+
+    def _masked_overlap(self, runs: list, starts: list[int], start: int, end: int) -> int:
+        total = 0
+        i = max(0, bisect_right(starts, start) - 1)
+        while i < len(runs) and runs[i][0] < end:
+            total += max(0, min(runs[i][0] + runs[i][1], end) - max(runs[i][0], start))
+            i += 1
+        return total
+
+    def n_count(self, start: int = 0, end: int | None = None) -> int:
+        """Number of N bases in [start, end), from the N mask alone."""
+        start, end = self._clip(start, end)
+        return self._masked_overlap(self.n_runs, self.n_starts, start, end) if end > start else 0
+
+    def gc_count(self, start: int = 0, end: int | None = None) -> int:
+        """Number of G/C bases in [start, end), counted on the packed bytes (masked bases are packed as A, never G/C)."""
+        start, end = self._clip(start, end)
+        if end <= start:
+            return 0
+        #whole bytes in the middle via the per-byte table, partial bytes at either end decoded
+        inner_start, inner_end = -(-start // 4) * 4, end // 4 * 4
+        if inner_end <= inner_start:
+            return sum(1 for base in self.fetch(start, end) if base in "GC")
+        data = self.genome.data
+        whole = data[self.offset + inner_start // 4:self.offset + inner_end // 4]
+        count = sum(whole.translate(GC_PER_BYTE)) if whole else 0
+        edges = self.fetch(start, inner_start) + self.fetch(inner_end, end)
+        return count + sum(1 for base in edges if base in "GC")
+
+
+class PackedGenome(Mapping):
+    """
+    Mapping of sequence ID -> PackedChromosome over a memory-mapped .gms2bit cache.
+    Use open_or_build() to get one for a FASTA file.
+    """
+
+    def __init__(self, cache_path: str | Path) -> None:
+        self.cache_path = Path(cache_path)
+        self.header = read_header(self.cache_path)
+        with open(self.cache_path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = _Window(self._mmap, self.header["data_offset"])
+        self._chroms = {entry["name"]: PackedChromosome(self, entry["name"], entry) for entry in self.header["sequences"]}
+
+    @classmethod
+    def open_or_build(cls, fasta_file: str | Path, cache_path: str | Path | None = None) -> "PackedGenome":
+        cache_path = Path(cache_path) if cache_path else default_cache_path(fasta_file)
+        if not is_cache_fresh(fasta_file, cache_path):
+            build_packed_genome(fasta_file, cache_path)
+        return cls(cache_path)
+
+    def __getitem__(self, name: str) -> PackedChromosome:
+        return self._chroms[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._chroms)
+
+    def __len__(self) -> int:
+        return len(self._chroms)
+
+    def close(self) -> None:
+        self._chroms = {}
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class _Window:
+    #bytes-like view of the mmap from the data offset on; slicing copies only the requested bytes
+    def __init__(self, buffer: mmap.mmap, offset: int) -> None:
+        self.buffer = buffer
+        self.offset = offset
+
+    def __getitem__(self, key: slice) -> bytes:
+        return self.buffer[self.offset + key.start:self.offset + key.stop]
+
+
+def default_cache_path(fasta_file: str | Path) -> Path:
+    return Path(str(fasta_file) + CACHE_SUFFIX)
+
+
+def source_signature(fasta_file: str | Path) -> dict:
+    stat = os.stat(fasta_file)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_header(cache_path: str | Path) -> dict:
+    with open(cache_path, "rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{cache_path} is not a packed genome cache")
+        (header_length,) = struct.unpack("<Q", handle.read(8))
+        header: dict = json.loads(handle.read(header_length))
+    header["data_offset"] = len(MAGIC) + 8 + header_length
+    return header
+
+
+def is_cache_fresh(fasta_file: str | Path, cache_path: str | Path) -> bool:
+    try:
+        return bool(read_header(cache_path)["source"] == source_signature(fasta_file))
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def _add_runs(runs: list, matches: Iterator[re.Match], position: int, with_base: bool) -> None:
+    #append runs found in one chunk, joining a run that continues from the previous chunk
+    for match in matches:
+        start, length = position + match.start(), match.end() - match.start()
+        base = match.group()[:1].decode("ascii")
+        if runs and runs[-1][0] + runs[-1][1] == start and (not with_base or runs[-1][2] == base):
+            runs[-1][1] += length
+        else:
+            runs.append([start, length, base] if with_base else [start, length])
+
+
+def build_packed_genome(fasta_file: str | Path, cache_path: str | Path) -> Path:
+    """
+    Pack a (validated) FASTA into cache_path. Streams the file chunk by chunk, so memory stays at a few MB.
+    The cache is written to a temporary file and moved into place, so readers never see a partial cache.
+    """
+    import numpy as np
+
+    #A/C/G/T (either case) -> 0..3, everything else -> 0 (masked)
+    table = bytearray(256)
+    for code, base in enumerate(BASES):
+        table[ord(base)] = code
+        table[ord(base.lower())] = code
+    code_table = bytes(table)
+    weights = np.array([64, 16, 4, 1], dtype=np.uint8)
+    n_pattern = re.compile(rb"N+")
+    iupac_pattern = re.compile(rb"([^ACGTN])\1*")
+
+    cache_path = Path(cache_path)
+    #unique temporary names, so concurrent builds of the same cache never write into each other's files
+    data_fd, data_tmp = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".data.tmp")
+    tmp: str | None = None
+    sequences: list[dict] = []
+    data_offset = 0
+
+    try:
+        with open(data_fd, "wb") as data_out, open(fasta_file, "rb") as fasta:
+            entry: dict | None = None
+            buffer = bytearray()
+            position = 0
+
+            def pack(entry: dict, final: bool) -> None:
+                nonlocal buffer, position, data_offset
+                usable = len(buffer) if final else len(buffer) // 4 * 4
+                if usable == 0:
+                    return
+                chunk = bytes(buffer[:usable]).upper()
+                del buffer[:usable]
+                _add_runs(entry["n_runs"], n_pattern.finditer(chunk), position, with_base=False)
+                _add_runs(entry["iupac_runs"], iupac_pattern.finditer(chunk), position, with_base=True)
+                codes = np.frombuffer(chunk.translate(code_table), dtype=np.uint8)
+                if len(codes) % 4:
+                    codes = np.concatenate([codes, np.zeros(4 - len(codes) % 4, dtype=np.uint8)])
+                packed = (codes.reshape(-1, 4) * weights).sum(axis=1, dtype=np.uint8).tobytes()
+                data_out.write(packed)
+                data_offset += len(packed)
+                position += usable
+
+            for line in fasta:
+                if line.startswith(b">"):
+                    if entry is not None:
+                        pack(entry, final=True)
+                        entry["length"] = position
+                    name = line[1:].split(maxsplit=1)[0].decode() if line[1:].strip() else ""
+                    entry = {"name": name, "offset": data_offset, "n_runs": [], "iupac_runs": []}
+                    sequences.append(entry)
+                    position = 0
+                elif entry is not None:
+                    buffer += line.strip()
+                    if len(buffer) >= CHUNK_BASES:
+                        pack(entry, final=False)
+            if entry is not None:
+                pack(entry, final=True)
+                entry["length"] = position
+
+        header = json.dumps({"source": source_signature(fasta_file), "sequences": sequences},
+                            separators=(",", ":")).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".tmp")
+        with open(fd, "wb") as out, open(data_tmp, "rb") as data_in:
+            out.write(MAGIC + struct.pack("<Q", len(header)) + header)
+            while block := data_in.read(1 << 20):
+                out.write(block)
+        os.chmod(tmp, 0o644) #mkstemp files are private to the owner; the cache is shared like the FASTA next to it
+        os.replace(tmp, cache_path)
+    finally:
+        for leftover in (data_tmp, tmp):
+            if leftover is not None:
+                Path(leftover).unlink(missing_ok=True) #the data spool always; the cache file only if it was not moved into place
+    return cache_path
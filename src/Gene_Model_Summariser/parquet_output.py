@@ -0,0 +1,120 @@
+'''
+Docstring for Gene_Model_Summariser.parquet_output
+Optional columnar copy of the transcript summary (GroupB-tool --parquet), written next to transcript_summary.tsv as
+transcript_summary.parquet, so analytics tools (pandas, polars, DuckDB, Arrow) load large results quickly and with
+their types intact instead of re-parsing the TSV. Needs pyarrow: pip install "GroupB-tool[parquet]".
+
+Schema (parquet_schema()):
+    gene_id, chrom, strand  dictionary<int32, string>
+    transcript_id           string
+    exon_count              int32
+    has_cds                 bool
+    start, end              int64
+    flags                   list<dictionary<int32, string>>  (an empty list for unflagged transcripts)
+
+Rows are buffered per column and written one row group at a time as results arrive, so memory is bounded by
+row_group_size however many transcripts there are.
+'''
+
+from collections.abc import Iterator
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+PARQUET_FILENAME = "transcript_summary.parquet"
+ROW_GROUP_SIZE = 65_536
+
+
+def parquet_available() -> bool:
+    return find_spec("pyarrow") is not None
+
+
+def parquet_schema() -> "pa.Schema":
+    import pyarrow as pa
+
+    labels = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([("gene_id", labels), ("transcript_id", pa.string()), ("exon_count", pa.int32()),
+                      ("has_cds", pa.bool_()), ("chrom", labels), ("start", pa.int64()), ("end", pa.int64()),
+                      ("strand", labels), ("flags", pa.list_(labels))])
+
+
+class ParquetSummaryWriter:
+    """
+    Writes transcript_summary.tsv rows (dicts with the TSV columns, flags comma-separated) to a Parquet file.
+    path: the file to create (replaced if it exists); it is complete once close() returns.
+    row_group_size: rows buffered before each row group is written.
+    """
+
+    def __init__(self, path: str | Path, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        import pyarrow.parquet as pq
+
+        self.path = Path(path)
+        self.schema = parquet_schema()
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self.row_group_size = row_group_size
+        self.columns: dict[str, list] = {name: [] for name in self.schema.names}
+        self.count = 0
+
+    def add(self, row: dict[str, Any]) -> None:
+        columns = self.columns
+        columns["gene_id"].append(row["gene_id"])
+        columns["transcript_id"].append(row["transcript_id"])
+        columns["exon_count"].append(row.get("exon_count"))
+        columns["has_cds"].append(str(row.get("has_cds")).lower() == "true") #bool from the pipeline, "True" from a TSV
+        columns["chrom"].append(row.get("chrom"))
+        columns["start"].append(row.get("start"))
+        columns["end"].append(row.get("end"))
+        columns["strand"].append(row.get("strand"))
+        columns["flags"].append([flag for flag in (row.get("flags") or "").split(",") if flag])
+        self.count += 1
+        if len(columns["gene_id"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        import pyarrow as pa
+
+        if not self.columns["gene_id"]:
+            return
+        self.writer.write_table(pa.table(self.columns, schema=self.schema))
+        self.columns = {name: [] for name in self.schema.names}
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.writer.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_parquet_summary(path: str | Path) -> "pd.DataFrame":
+    """
+    Load a transcript_summary.parquet as a DataFrame with the TSV's columns: typed numbers and has_cds,
+    categorical gene_id/chrom/strand, and flags comma-joined again (as in the TSV).
+    """
+    import pyarrow.parquet as pq
+
+    df = pq.read_table(path).to_pandas()
+    df["flags"] = [",".join(flags) for flags in df["flags"]]
+    return df
+
+
+def iter_parquet_rows(path: str | Path, batch_size: int = ROW_GROUP_SIZE) -> Iterator[dict[str, Any]]:
+    """
+    Stream a transcript_summary.parquet back as row dicts with the TSV's columns (flags comma-joined),
+    holding one batch of batch_size rows in memory at a time.
+    """
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            row["flags"] = ",".join(row["flags"] or [])
+            yield row
@@ -34,40 +34,86 @@ def write_qc_bed(transcripts: list[TranscriptWithFlags], output_path: Path) -> N
     for transcript in transcripts:
         all_flags.update(transcript.qc_flags)
     
-    #define a color palette to cycle through
-    color_palette = [
-        "255,0,0",      # red
-        "255,165,0",    # orange
-        "255,0,255",    # magenta
-        "0,0,255",      # blue
-        "0,255,0",      # green
-        "255,255,0",    # yellow
-        "0,255,255",    # cyan
-        "128,0,128",    # purple
-    ]
-    
-    #assign colors to flags alphabetically
-    #using modulo to cycle through colors if more flags than colors
-    sorted_all_flags = sorted(all_flags)
-    flag_colors: dict[str, str] = {}
-    for i, flag in enumerate(sorted_all_flags):
-        flag_colors[flag] = color_palette[i % len(color_palette)]
-    
+    flag_colors = assign_flag_colors(all_flags)
+
     #second pass -> write BED file
     with output_path.open("w") as file:
-        file.write("track name='QC Flagged Transcripts' description='Transcripts with QC flags' itemRgb='On'\n")
+        file.write(BED_HEADER)
         
         for transcript in transcripts:
             if not transcript.qc_flags:
                 continue
-            
-            sorted_flags = sorted(transcript.qc_flags)
-            flags_str: str = "|".join(sorted_flags)
-            name: str = f"{transcript.transcript_id}/{flags_str}"
-            color: str = flag_colors.get(sorted_flags[0], "128,128,128")
-            #set thick start and end to match BED format requirements
-            thick_start: int = transcript.start
-            thick_end: int = transcript.end
-            
-            #score is set to 0 as it's not used here
-            file.write(f"{transcript.chrom}\t{transcript.start}\t{transcript.end}\t{name}\t0\t{transcript.strand}\t{thick_start}\t{thick_end}\t{color}\n")
\ No newline at end of file
+            file.write(bed_line(transcript.chrom, transcript.start, transcript.end, transcript.transcript_id,
+                                sorted(transcript.qc_flags), transcript.strand, flag_colors))
+
+
+BED_HEADER = "track name='QC Flagged Transcripts' description='Transcripts with QC flags' itemRgb='On'\n"
+
+#define a color palette to cycle through
+COLOR_PALETTE = [
+    "255,0,0",      # red
+    "255,165,0",    # orange
+    "255,0,255",    # magenta
+    "0,0,255",      # blue
+    "0,255,0",      # green
+    "255,255,0",    # yellow
+    "0,255,255",    # cyan
+    "128,0,128",    # purple
+]
+
+def assign_flag_colors(all_flags: set[str]) -> dict[str, str]:
+    #assign colors to flags alphabetically
+    #using modulo to cycle through colors if more flags than colors
+    sorted_all_flags = sorted(all_flags)
+    flag_colors: dict[str, str] = {}
+    for i, flag in enumerate(sorted_all_flags):
+        flag_colors[flag] = COLOR_PALETTE[i % len(COLOR_PALETTE)]
+    return flag_colors
+
+def bed_line(chrom: str, start: int, end: int, transcript_id: str, sorted_flags: list[str], strand: str,
+             flag_colors: dict[str, str]) -> str:
+    flags_str: str = "|".join(sorted_flags)
+    name: str = f"{transcript_id}/{flags_str}"
+    color: str = flag_colors.get(sorted_flags[0], "128,128,128")
+    #set thick start and end to match BED format requirements
+    thick_start: int = start
+    thick_end: int = end
+    
+    #score is set to 0 as it's not used here
+    return f"{chrom}\t{start}\t{end}\t{name}\t0\t{strand}\t{thick_start}\t{thick_end}\t{color}\n"
+
+
+class QCBedWriter:
+    """
+    Streaming version of write_qc_bed for output that does not fit in memory.
+    Rows are spooled to a temporary file next to output_path as they arrive; close() assigns the colors
+    (which depend on every flag in the dataset) and writes the BED, so the file matches write_qc_bed's.
+    Nothing is written if no flagged transcript was added.
+    """
+
+    def __init__(self, output_path: Path) -> None:
+        self.output_path = Path(output_path)
+        self.spool_path = self.output_path.with_name(self.output_path.name + ".spool")
+        self.spool = self.spool_path.open("w")
+        self.all_flags: set[str] = set()
+        self.count = 0
+
+    def add(self, transcript: TranscriptWithFlags) -> None:
+        if not transcript.qc_flags:
+            return
+        sorted_flags = sorted(transcript.qc_flags)
+        self.all_flags.update(sorted_flags)
+        self.spool.write(f"{transcript.chrom}\t{transcript.start}\t{transcript.end}\t{transcript.transcript_id}\t"
+                         f"{'|'.join(sorted_flags)}\t{transcript.strand}\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self.spool.close()
+        if self.count:
+            flag_colors = assign_flag_colors(self.all_flags)
+            with self.spool_path.open("r") as spool, self.output_path.open("w") as file:
+                file.write(BED_HEADER)
+                for line in spool:
+                    chrom, start, end, transcript_id, flags, strand = line.rstrip("\n").split("\t")
+                    file.write(bed_line(chrom, int(start), int(end), transcript_id, flags.split("|"), strand, flag_colors))
+        self.spool_path.unlink()
@@ -0,0 +1,106 @@
+'''
+Docstring for Gene_Model_Summariser.qc_memo
+Persistent per-transcript QC results, so a re-run on a lightly edited annotation only re-checks the models that changed.
+Results are stored in a small SQLite file next to the FASTA (<fasta>.qcmemo.sqlite), keyed by a hash of everything
+QC_flags.flags_for_transcript looks at: the chromosome, strand, exon and CDS coordinates and phases, the reference
+bases under each CDS segment and the tool version. The key does not depend on file or feature names,
+so the memo is shared by every annotation of the same reference.
+
+New results are written in one transaction when the memo is closed. GroupB-tool --qc-memo-path keeps the memo elsewhere;
+if it cannot be opened (e.g. a reference in a read-only directory), open_memo falls back to the results folder beside
+the run and, failing that, runs QC without a memo, warning either way.
+'''
+
+import hashlib
+import json
+import logging
+import sqlite3
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Self
+
+from .run_json_builder import TOOL_VERSION
+
+MEMO_SUFFIX = ".qcmemo.sqlite"
+
+logger = logging.getLogger("GroupB_logger")
+
+
+def default_memo_path(fasta_file: str | Path) -> Path:
+    return Path(str(fasta_file) + MEMO_SUFFIX)
+
+
+def transcript_key(seqid: str, strand: str, exons: Sequence, cds: Sequence, chrom_sequence: Any) -> str:
+    """
+    Memo key of one transcript. exons/cds: objects with start, end (and frame for CDS), e.g. gff_parser.FeatureCoords.
+    chrom_sequence: the sliceable chromosome sequence QC reads the CDS bases from.
+    """
+    structure = json.dumps([TOOL_VERSION, seqid, strand, [[e.start, e.end] for e in exons],
+                            [[c.start, c.end, c.frame] for c in cds]])
+    digest = hashlib.sha256(structure.encode("utf-8"))
+    for c in cds:
+        if c.start is not None and c.end is not None:
+            digest.update(b"\n" + str(chrom_sequence[c.start - 1:c.end]).encode("ascii", "replace"))
+    return digest.hexdigest()
+
+
+class QCMemo:
+    """
+    Transcript key -> QC flags, persisted in SQLite. Counts hits and misses for the run's hit-rate metric.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path, timeout=60) #batch workers may share one memo
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS qc_memo (key TEXT PRIMARY KEY, flags TEXT NOT NULL)")
+        except sqlite3.Error:
+            self.conn.close()
+            raise
+        self.pending: list[tuple[str, str]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> list[str] | None:
+        row = self.conn.execute("SELECT flags FROM qc_memo WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0].split(",") if row[0] else []
+
+    def put(self, key: str, flags: list[str]) -> None:
+        self.pending.append((key, ",".join(flags)))
+
+    def close(self) -> None:
+        if self.pending:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO qc_memo (key, flags) VALUES (?, ?)", self.pending)
+            self.pending = []
+        self.conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        looked_up = self.hits + self.misses
+        return {"path": str(self.path), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / looked_up, 4) if looked_up else 0.0}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def open_memo(path: str | Path, fallback_dir: str | Path) -> QCMemo | None:
+    """
+    Open the memo at path or, if SQLite cannot open or write it there, at fallback_dir/<same name>.
+    Returns None (QC then runs without a memo) if neither can be used.
+    """
+    for candidate in dict.fromkeys([Path(path), Path(fallback_dir) / Path(path).name]):
+        try:
+            return QCMemo(candidate)
+        except sqlite3.Error as e:
+            logger.warning(f"QC memo: cannot use {candidate} ({e})")
+    logger.warning("QC memo: running QC without a memo")
+    return None
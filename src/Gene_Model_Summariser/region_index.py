@@ -0,0 +1,221 @@
+'''
+Docstring for Gene_Model_Summariser.region_index
+Genomic interval index over transcript_summary.tsv, so region questions ("which flagged transcripts fall in
+chr3:1.2-1.4 Mb?") are answered without scanning the TSV.
+
+The index (transcript_index.npz, next to the TSV) is a nested containment list (NCList) per chromosome: transcripts
+are split into sublists in which no transcript contains another, so both starts and ends increase along a sublist,
+and every transcript points at the sublist of the transcripts it contains. A query bisects the ends of the top-level
+sublist for the first overlap, walks forward while starts are within the region and descends into the sublists of
+the transcripts it meets; every transcript visited overlaps the region, so it costs O(log n) per sublist entered plus
+the rows returned, however long the transcripts spanning the region are. Only the matching rows are read from the TSV.
+The index records the TSV's size and modification time and is rebuilt automatically when they change.
+
+Coordinates are 1-based and inclusive, as in the TSV (GFF) and samtools-style regions ("chr3:1,200,000-1,400,000").
+
+Usage:
+    GroupB-tool query results/run_001 chr3:1200000-1400000 --flagged
+'''
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+
+INDEX_FILENAME = "transcript_index.npz"
+INDEX_FORMAT = 2 #2: nested containment lists (1 kept a running maximum end, which long transcripts made a near-full scan)
+TSV_FILENAME = "transcript_summary.tsv"
+REGION_PATTERN = re.compile(r"^(?P<chrom>[^:]+?)(?::(?P<start>[\d,]+)?(?:-(?P<end>[\d,]+))?)?$")
+
+
+def parse_region(region: str) -> tuple[str, int, int | None]:
+    """'chr3:1,200,000-1,400,000' -> ('chr3', 1200000, 1400000); 'chr3' covers the whole chromosome (end None)."""
+    match = REGION_PATTERN.match(region.strip())
+    if not match:
+        raise ValueError(f"invalid region {region!r} (expected chrom, chrom:start-end or chrom:start)")
+    start = int(match["start"].replace(",", "")) if match["start"] else 1
+    end = int(match["end"].replace(",", "")) if match["end"] else None
+    if end is not None and end < start:
+        raise ValueError(f"invalid region {region!r}: end is before start")
+    return match["chrom"], start, end
+
+
+def _tsv_signature(tsv_path: Path) -> dict[str, int]:
+    stat = os.stat(tsv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _nclist_layout(rows: list[tuple[int, int, int]]) -> tuple[list[int], dict[int, tuple[int, int]]]:
+    """
+    Nest rows (sorted by start, then end descending) into containment sublists.
+    Returns the rows in layout order (each sublist contiguous) and {row: (lo, hi)}, the layout range of the sublist
+    it contains; the top-level sublist is under -1.
+    """
+    children: dict[int, list[int]] = {}
+    stack: list[int] = [] #the chain of transcripts containing the current one
+    for row, (_, end, _) in enumerate(rows):
+        while stack and rows[stack[-1]][1] < end:
+            stack.pop()
+        children.setdefault(stack[-1] if stack else -1, []).append(row)
+        stack.append(row)
+    layout: list[int] = []
+    ranges: dict[int, tuple[int, int]] = {}
+    parents = [-1]
+    for parent in parents: #grows as sublists are laid out, so every sublist is visited once
+        members = children.get(parent, [])
+        ranges[parent] = (len(layout), len(layout) + len(members))
+        layout.extend(members)
+        parents.extend(row for row in members if row in children)
+    return layout, ranges
+
+
+def build_region_index(tsv_path: str | Path, index_path: str | Path | None = None) -> Path:
+    """Scan transcript_summary.tsv once and write its interval index (default: transcript_index.npz beside it)."""
+    import numpy as np
+
+    tsv_path = Path(tsv_path)
+    index_path = Path(index_path) if index_path else tsv_path.with_name(INDEX_FILENAME)
+    by_chrom: dict[str, list[tuple[int, int, int]]] = {}
+    with open(tsv_path, "rb") as handle:
+        header = handle.readline().decode("utf-8").rstrip("\r\n").split("\t")
+        chrom_col, start_col, end_col = header.index("chrom"), header.index("start"), header.index("end")
+        offset = handle.tell()
+        for line in iter(handle.readline, b""):
+            fields = line.decode("utf-8").rstrip("\r\n").split("\t")
+            if fields[start_col] and fields[end_col]:
+                by_chrom.setdefault(fields[chrom_col], []).append((int(fields[start_col]), int(fields[end_col]), offset))
+            offset += len(line)
+
+    chroms: list[str] = []
+    bounds: list[tuple[int, int]] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    offsets: list[int] = []
+    child_lo: list[int] = [] #layout range of the sublist each transcript contains (empty if none)
+    child_hi: list[int] = []
+    for chrom, rows in by_chrom.items():
+        rows.sort(key=lambda row: (row[0], -row[1], row[2])) #a containing transcript comes before those it contains
+        base = len(starts)
+        layout, ranges = _nclist_layout(rows)
+        bounds.append((base + ranges[-1][0], base + ranges[-1][1]))
+        chroms.append(chrom)
+        for row in layout:
+            start, end, row_offset = rows[row]
+            lo, hi = ranges.get(row, (0, 0))
+            starts.append(start)
+            ends.append(end)
+            offsets.append(row_offset)
+            child_lo.append(base + lo)
+            child_hi.append(base + hi)
+
+    meta = {"format": INDEX_FORMAT, "tsv": _tsv_signature(tsv_path), "chroms": chroms, "bounds": bounds}
+    tmp = index_path.with_name(index_path.name + ".tmp.npz")
+    np.savez(tmp, meta=np.array(json.dumps(meta)), start=np.array(starts, dtype=np.int64),
+             end=np.array(ends, dtype=np.int64), offset=np.array(offsets, dtype=np.int64),
+             child_lo=np.array(child_lo, dtype=np.int64), child_hi=np.array(child_hi, dtype=np.int64))
+    os.replace(tmp, index_path)
+    return index_path
+
+
+class RegionIndex:
+    """
+    Interval index of one transcript_summary.tsv. Built (or rebuilt, if the TSV changed) when opened.
+    path: a run directory or the TSV itself.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        import numpy as np
+
+        path = Path(path)
+        self.tsv_path = path / TSV_FILENAME if path.is_dir() else path
+        index_path = self.tsv_path.with_name(INDEX_FILENAME)
+        if not self.tsv_path.is_file():
+            raise FileNotFoundError(f"Missing transcript summary TSV: {self.tsv_path}")
+        meta = self._load_meta(index_path)
+        if meta is None or meta.get("format") != INDEX_FORMAT or meta["tsv"] != _tsv_signature(self.tsv_path):
+            build_region_index(self.tsv_path, index_path)
+            meta = self._load_meta(index_path)
+            if meta is None:
+                raise OSError(f"Could not read the region index just written: {index_path}")
+        with np.load(index_path) as data:
+            #plain lists: bisect on them is faster than numpy scalars for single lookups
+            self.starts = data["start"].tolist()
+            self.ends = data["end"].tolist()
+            self.offsets = data["offset"].tolist()
+            self.child_lo = data["child_lo"].tolist()
+            self.child_hi = data["child_hi"].tolist()
+        self.bounds = {chrom: tuple(bound) for chrom, bound in zip(meta["chroms"], meta["bounds"], strict=True)}
+        with open(self.tsv_path, "r", encoding="utf-8") as handle:
+            self.columns = handle.readline().rstrip("\r\n").split("\t")
+        self.rows_visited = 0 #index entries examined by queries so far (each one overlaps its query)
+
+    @staticmethod
+    def _load_meta(index_path: Path) -> dict | None:
+        import numpy as np
+        try:
+            with np.load(index_path) as data:
+                meta: dict = json.loads(str(data["meta"]))
+                return meta
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @property
+    def chromosomes(self) -> list[str]:
+        return list(self.bounds)
+
+    def query(self, chrom: str, start: int = 1, end: int | None = None) -> Iterator[dict[str, str]]:
+        """Yield the TSV rows (as dicts) of transcripts overlapping chrom:start-end, in start order."""
+        if chrom not in self.bounds:
+            return
+        found: list[int] = []
+        sublists = [self.bounds[chrom]]
+        while sublists:
+            lo, hi = sublists.pop()
+            i = bisect_left(self.ends, start, lo, hi) #ends increase along a sublist: everything before ends before start
+            while i < hi and (end is None or self.starts[i] <= end):
+                found.append(i)
+                if self.child_lo[i] < self.child_hi[i]:
+                    sublists.append((self.child_lo[i], self.child_hi[i]))
+                i += 1
+        self.rows_visited += len(found)
+        found.sort(key=lambda i: (self.starts[i], self.ends[i], self.offsets[i]))
+        with open(self.tsv_path, "r", encoding="utf-8", newline="") as handle:
+            for i in found:
+                handle.seek(self.offsets[i])
+                yield dict(zip(self.columns, handle.readline().rstrip("\r\n").split("\t"), strict=False))
+
+
+def query_app(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="GroupB-tool query", description="List transcripts of a finished run that overlap a region.",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("run", help="Run directory (or its transcript_summary.tsv)")
+    parser.add_argument("region", nargs="+", help="Region(s) as chrom, chrom:start or chrom:start-end (1-based, inclusive)")
+    parser.add_argument("--flagged", action="store_true", help="Only transcripts with QC flags")
+    parser.add_argument("--flag", action="append", default=[], metavar="NAME", help="Only transcripts with this QC flag (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Write JSON lines instead of TSV")
+    args = parser.parse_args(argv)
+
+    try:
+        index = RegionIndex(args.run)
+        regions = [parse_region(region) for region in args.region]
+    except (FileNotFoundError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    writer = None if args.json else csv.DictWriter(sys.stdout, fieldnames=index.columns, delimiter="\t", lineterminator="\n")
+    if writer:
+        writer.writeheader()
+    for chrom, start, end in regions:
+        for row in index.query(chrom, start, end):
+            flags = set(filter(None, row.get("flags", "").split(",")))
+            if (args.flagged and not flags) or (args.flag and not flags.intersection(args.flag)):
+                continue
+            if writer:
+                writer.writerow(row)
+            else:
+                print(json.dumps(row))
+    return 0
@@ -0,0 +1,151 @@
+'''
+Docstring for Gene_Model_Summariser.results_db
+Optional SQLite copy of the results (GroupB-tool --sqlite), written next to transcript_summary.tsv as transcript_summary.sqlite
+so dashboards can filter by gene, transcript, flag or region with indexed queries instead of re-parsing the TSV.
+
+Tables:
+    run              - key/value run metadata (tool, version, start time, inputs; values are JSON)
+    transcripts      - one row per transcript, the TSV columns without flags (has_cds as 0/1)
+    flags            - one row per distinct QC flag name
+    transcript_flags - (flag_id, transcript) pairs, so "all transcripts with flag X" is an index range scan
+    transcript_summary (view) - the TSV's rows, with flags comma-joined again
+
+Rows are inserted in batches (executemany) inside one transaction and the indexes are created after the last insert,
+which is much cheaper than maintaining them row by row. The database is built under a temporary name and moved into
+place on close, so a reader never sees a half-written file.
+
+    SELECT t.* FROM transcripts t JOIN transcript_flags tf ON tf.transcript = t.id
+        JOIN flags f ON f.id = tf.flag_id WHERE f.name = 'invalid_stop_codon' AND t.chrom = 'chr3';
+'''
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Self
+
+from .run_json_builder import TOOL_NAME, TOOL_VERSION, whats_the_time_mr_wolf
+
+RESULTS_DB_FILENAME = "transcript_summary.sqlite"
+
+SCHEMA = """
+CREATE TABLE run (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE transcripts (
+    id INTEGER PRIMARY KEY,
+    gene_id TEXT NOT NULL,
+    transcript_id TEXT NOT NULL,
+    exon_count INTEGER,
+    has_cds INTEGER,
+    chrom TEXT,
+    start INTEGER,
+    "end" INTEGER,
+    strand TEXT
+);
+CREATE TABLE flags (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE transcript_flags (
+    flag_id INTEGER NOT NULL REFERENCES flags(id),
+    transcript INTEGER NOT NULL REFERENCES transcripts(id),
+    PRIMARY KEY (flag_id, transcript)
+) WITHOUT ROWID;
+CREATE VIEW transcript_summary AS
+    SELECT t.gene_id, t.transcript_id, t.exon_count, t.has_cds, t.chrom, t.start, t."end", t.strand,
+           COALESCE((SELECT group_concat(f.name, ',') FROM transcript_flags tf JOIN flags f ON f.id = tf.flag_id
+                     WHERE tf.transcript = t.id), '') AS flags
+    FROM transcripts t;
+"""
+
+#created once the rows are in (see module docstring)
+INDEXES = """
+CREATE INDEX transcripts_gene ON transcripts (gene_id);
+CREATE INDEX transcripts_transcript ON transcripts (transcript_id);
+CREATE INDEX transcripts_region ON transcripts (chrom, start, "end");
+CREATE INDEX transcript_flags_transcript ON transcript_flags (transcript);
+"""
+
+
+def run_metadata(output_dir: str | Path) -> dict[str, Any]:
+    """Metadata for the run table: the tool and the inputs recorded in output_dir/run.json (if it exists)."""
+    metadata: dict[str, Any] = {"tool": TOOL_NAME, "version": TOOL_VERSION, "written": whats_the_time_mr_wolf()}
+    try:
+        run_info = json.loads((Path(output_dir) / "run.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return metadata
+    metadata["started"] = run_info.get("timestamp", {}).get("start")
+    metadata["inputs"] = run_info.get("inputs")
+    return metadata
+
+
+def write_run_metadata(path: str | Path, metadata: dict[str, Any]) -> None:
+    """Replace the run table of an existing database, e.g. one the stage cache copied from an earlier run."""
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM run")
+            conn.executemany("INSERT INTO run (key, value) VALUES (?, ?)",
+                             [(key, json.dumps(value)) for key, value in metadata.items()])
+    finally:
+        conn.close()
+
+
+class ResultsDBWriter:
+    """
+    Writes transcript_summary.tsv rows (dicts with the TSV columns, flags comma-separated) into an indexed SQLite file.
+    path: the database to create (replaced if it exists).
+    metadata: key/value pairs for the run table.
+    batch_size: rows buffered per executemany.
+    """
+
+    def __init__(self, path: str | Path, metadata: dict[str, Any] | None = None, batch_size: int = 10_000) -> None:
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.tmp_path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(self.tmp_path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=OFF") #a fresh scratch file: nothing to roll back to
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("BEGIN")
+        self.conn.executemany("INSERT INTO run (key, value) VALUES (?, ?)",
+                              [(key, json.dumps(value)) for key, value in (metadata or {}).items()])
+        self.batch_size = batch_size
+        self.flag_ids: dict[str, int] = {}
+        self.rows: list[tuple] = []
+        self.row_flags: list[tuple[int, int]] = []
+        self.count = 0
+
+    def add(self, row: dict[str, Any]) -> None:
+        self.count += 1
+        has_cds = row.get("has_cds")
+        self.rows.append((self.count, row["gene_id"], row["transcript_id"], row.get("exon_count"),
+                          None if has_cds is None else int(has_cds in (True, "True")), row.get("chrom"),
+                          row.get("start"), row.get("end"), row.get("strand")))
+        for flag in set(filter(None, (row.get("flags") or "").split(","))):
+            flag_id = self.flag_ids.get(flag)
+            if flag_id is None:
+                flag_id = self.flag_ids[flag] = len(self.flag_ids) + 1
+                self.conn.execute("INSERT INTO flags (id, name) VALUES (?, ?)", (flag_id, flag))
+            self.row_flags.append((flag_id, self.count))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.conn.executemany('INSERT INTO transcripts (id, gene_id, transcript_id, exon_count, has_cds, chrom, start, "end", strand) '
+                              "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self.rows)
+        self.conn.executemany("INSERT INTO transcript_flags (flag_id, transcript) VALUES (?, ?)", self.row_flags)
+        self.rows = []
+        self.row_flags = []
+
+    def close(self) -> None:
+        try:
+            self.flush()
+            self.conn.execute("COMMIT")
+            self.conn.executescript(INDEXES)
+            self.conn.execute("ANALYZE")
+        finally:
+            self.conn.close()
+        os.replace(self.tmp_path, self.path)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,213 @@
+'''
+Docstring for Gene_Model_Summariser.run_diff
+Run-to-run comparison of QC results (GroupB-tool diff), e.g. between two annotation releases: which transcripts were
+added or removed, which changed structure (gene, coordinates, strand, exon count, CDS) and which gained or lost flags.
+
+Each side is a run directory, a transcript_summary.tsv or a GFF (checked here through api.iter_transcripts, with
+--fasta for the sequence flags). Both sides are sorted by (transcript_id, chrom, start, end) with an external merge
+sort - sorted chunks of chunk_size rows are spilled to temporary files and merged with heapq.merge - and then joined in
+one sorted merge pass, so memory is bounded by chunk_size however large the runs are.
+
+Outputs (in --outdir):
+    diff.tsv          - one row per added, removed or changed transcript (unchanged transcripts are left out)
+    diff_summary.json - counts per kind of change, flags gained/lost per flag name and the flag-set transitions
+
+Usage:
+    GroupB-tool diff results/run_001 results/run_002 -o release_diff/
+'''
+
+import argparse
+import csv
+import heapq
+import json
+import sys
+import tempfile
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from itertools import groupby, zip_longest
+from pathlib import Path
+from typing import Any
+
+TSV_FILENAME = "transcript_summary.tsv"
+DELTA_FILENAME = "diff.tsv"
+SUMMARY_FILENAME = "diff_summary.json"
+GFF_SUFFIXES = {".gff", ".gff3", ".gtf"}
+CHUNK_SIZE = 200_000
+
+#columns of transcript_summary.tsv, in the order rows are spilled and compared
+COLUMNS = ["transcript_id", "gene_id", "chrom", "start", "end", "strand", "exon_count", "has_cds", "flags"]
+STRUCTURE_FIELDS = ["gene_id", "chrom", "start", "end", "strand", "exon_count", "has_cds"]
+DELTA_COLUMNS = ["transcript_id", "change", "gene_id", "chrom", "start", "end", "strand", "changed_fields",
+                 "flags_gained", "flags_lost", "old_flags", "new_flags"]
+
+Row = tuple[str, ...]
+
+
+def iter_source_rows(source: str | Path, fasta_file: str | Path | None = None) -> Iterator[Row]:
+    """Rows (as COLUMNS tuples of strings) of a run directory, a transcript_summary.tsv or a GFF checked here."""
+    path = Path(source)
+    if path.is_dir():
+        path = path / TSV_FILENAME
+    if path.suffix.lower() in GFF_SUFFIXES:
+        from .api import iter_transcripts
+        for result in iter_transcripts(path, fasta_file):
+            row = result.as_row()
+            yield tuple(str(row[column]) for column in COLUMNS)
+        return
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle, delimiter="\t")
+        missing = set(COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{path} is missing columns: {sorted(missing)}")
+        for row in reader:
+            yield tuple(row[column] or "" for column in COLUMNS)
+
+
+def sort_key(row: Row) -> tuple:
+    return (row[0], row[2], int(row[3] or 0), int(row[4] or 0))
+
+
+def _spill(rows: list[Row], tmp_dir: str) -> str:
+    with tempfile.NamedTemporaryFile("w", dir=tmp_dir, suffix=".tsv", delete=False, encoding="utf-8") as spool:
+        spool.writelines("\t".join(row) + "\n" for row in rows)
+    return spool.name
+
+
+def _read_spool(path: str) -> Iterator[Row]:
+    with open(path, encoding="utf-8") as spool:
+        for line in spool:
+            yield tuple(line.rstrip("\n").split("\t"))
+
+
+def external_sort(rows: Iterable[Row], tmp_dir: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Row]:
+    """rows sorted by sort_key, holding at most chunk_size of them in memory (the rest wait in sorted spill files)."""
+    chunk: list[Row] = []
+    spools: list[str] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            chunk.sort(key=sort_key)
+            spools.append(_spill(chunk, tmp_dir))
+            chunk = []
+    chunk.sort(key=sort_key)
+    if not spools:
+        yield from chunk
+        return
+    if chunk:
+        spools.append(_spill(chunk, tmp_dir))
+    del chunk
+    yield from heapq.merge(*(_read_spool(path) for path in spools), key=sort_key)
+
+
+def paired_rows(old_rows: Iterable[Row], new_rows: Iterable[Row]) -> Iterator[tuple[Row | None, Row | None]]:
+    """Sorted merge join of two sorted row streams on transcript_id (repeated IDs are paired in coordinate order)."""
+    old_groups = groupby(old_rows, key=lambda row: row[0])
+    new_groups = groupby(new_rows, key=lambda row: row[0])
+    old, new = next(old_groups, None), next(new_groups, None)
+    while old is not None or new is not None:
+        if old is not None and (new is None or old[0] < new[0]):
+            for row in old[1]:
+                yield row, None
+            old = next(old_groups, None)
+        elif new is not None and (old is None or new[0] < old[0]):
+            for row in new[1]:
+                yield None, row
+            new = next(new_groups, None)
+        elif old is not None and new is not None: #same transcript_id on both sides
+            yield from zip_longest(list(old[1]), list(new[1]))
+            old, new = next(old_groups, None), next(new_groups, None)
+
+
+def _flags(row: Row) -> set[str]:
+    return {flag for flag in row[-1].split(",") if flag}
+
+
+def diff_runs(old: str | Path, new: str | Path, output_dir: str | Path = ".", fasta_file: str | Path | None = None,
+              chunk_size: int = CHUNK_SIZE) -> dict[str, Any]:
+    """
+    Compare two runs (directories, transcript_summary.tsv files or GFFs) and write diff.tsv and diff_summary.json
+    into output_dir. fasta_file: reference for GFF inputs (otherwise only annotation-level flags are compared).
+    Returns the summary.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    index = {column: i for i, column in enumerate(COLUMNS)}
+    counts: Counter[str] = Counter()
+    gained: Counter[str] = Counter()
+    lost: Counter[str] = Counter()
+    transitions: Counter[tuple[str, str]] = Counter()
+
+    with tempfile.TemporaryDirectory(prefix="gms_diff_", dir=output_dir) as tmp_dir, \
+            open(output_dir / DELTA_FILENAME, "w", newline="", encoding="utf-8") as delta:
+        writer = csv.writer(delta, delimiter="\t", lineterminator="\n")
+        writer.writerow(DELTA_COLUMNS)
+        old_rows = external_sort(iter_source_rows(old, fasta_file), tmp_dir, chunk_size)
+        new_rows = external_sort(iter_source_rows(new, fasta_file), tmp_dir, chunk_size)
+        for old_row, new_row in paired_rows(old_rows, new_rows):
+            counts["old"] += old_row is not None
+            counts["new"] += new_row is not None
+            counts["old_flagged"] += bool(old_row and _flags(old_row))
+            counts["new_flagged"] += bool(new_row and _flags(new_row))
+            row = new_row or old_row
+            if row is None: #paired_rows never yields two Nones
+                continue
+            old_flags = _flags(old_row) if old_row else set()
+            new_flags = _flags(new_row) if new_row else set()
+            if old_row is None or new_row is None:
+                change, changed_fields = ("added" if old_row is None else "removed"), []
+            else:
+                changed_fields = [f"{field}:{old_row[index[field]]}>{new_row[index[field]]}" for field in STRUCTURE_FIELDS
+                                  if old_row[index[field]] != new_row[index[field]]]
+                if not changed_fields and old_flags == new_flags:
+                    counts["unchanged"] += 1
+                    continue
+                change = "changed"
+                counts["structure_changed"] += bool(changed_fields)
+                counts["flags_changed"] += old_flags != new_flags
+                gained.update(new_flags - old_flags)
+                lost.update(old_flags - new_flags)
+                if old_flags != new_flags:
+                    transitions[(",".join(sorted(old_flags)), ",".join(sorted(new_flags)))] += 1
+            counts[change] += 1
+            writer.writerow([row[0], change, *(row[index[c]] for c in ("gene_id", "chrom", "start", "end", "strand")),
+                             ";".join(changed_fields), ",".join(sorted(new_flags - old_flags)),
+                             ",".join(sorted(old_flags - new_flags)), ",".join(sorted(old_flags)), ",".join(sorted(new_flags))])
+
+    summary = {
+        "old": str(old),
+        "new": str(new),
+        "transcripts": {key: counts[key] for key in ("old", "new", "unchanged", "added", "removed", "changed",
+                                                     "structure_changed", "flags_changed")},
+        "flagged": {"old": counts["old_flagged"], "new": counts["new_flagged"]},
+        "flags": {flag: {"gained": gained[flag], "lost": lost[flag]} for flag in sorted(gained.keys() | lost.keys())},
+        "flag_transitions": [{"from": before, "to": after, "count": n} for (before, after), n in transitions.most_common()],
+    }
+    with open(output_dir / SUMMARY_FILENAME, "w", encoding="utf-8") as handle:
+        json.dump(summary, handle, indent=2)
+        handle.write("\n")
+    return summary
+
+
+def diff_app(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="GroupB-tool diff", description="Compare the QC results of two runs (or two GFFs).",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("old", help="Earlier run directory, transcript_summary.tsv or GFF")
+    parser.add_argument("new", help="Later run directory, transcript_summary.tsv or GFF")
+    parser.add_argument("-o", "--outdir", default=".", help="Directory for diff.tsv and diff_summary.json")
+    parser.add_argument("-f", "--fasta", help="Reference FASTA for GFF inputs (sequence flags are only compared with it)")
+    args = parser.parse_args(argv)
+
+    from .api import SummariserError
+    try:
+        summary = diff_runs(args.old, args.new, args.outdir, fasta_file=args.fasta)
+    except (OSError, ValueError, SummariserError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    counts = summary["transcripts"]
+    print(f"{counts['old']} -> {counts['new']} transcripts: {counts['added']} added, {counts['removed']} removed, "
+          f"{counts['changed']} changed ({counts['structure_changed']} structure, {counts['flags_changed']} flags), "
+          f"{counts['unchanged']} unchanged")
+    for flag, change in summary["flags"].items():
+        print(f"  {flag}: +{change['gained']} -{change['lost']}")
+    print(f"Written {Path(args.outdir) / DELTA_FILENAME} and {Path(args.outdir) / SUMMARY_FILENAME}")
+    return 0
@@ -2,10 +2,11 @@
 # writing the run.json file
 
 import json
-from pathlib import Path
-from datetime import datetime
 import logging
-from typing import Any, Optional
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
 TOOL_NAME = "Gene model summariser (transcript/gene QC summary) - Group B"
 TOOL_VERSION = "1.1.0"
 
@@ -35,7 +36,7 @@ def write_json_file(output_path: str | Path, data: dict[str, Any]) -> None:
         file.write("\n")
 
 #run the json file including writing out the tool name/version, start time/input files and outputs 
-def build_run_json(start_time: str, gff_file: Path,fasta_file: Optional[Path], output_dir: Path,
+def build_run_json(start_time: str, gff_file: Path,fasta_file: Path | None, output_dir: Path,
     results_filename: str = "results.tsv", html_filename: str = "results.html") -> dict[str, Any]:
     
     output_dir = Path(output_dir) #ensure output_dir is a Path object
@@ -74,7 +75,7 @@ def update_end_time_and_output_sizes(output_dict: dict[str, Any]) -> dict[str, A
 
 #create an initial run.json at the start of the pipeline. will be imported into main()
 #this writes tool metadata, a start timestamp, input file metadata,and placeholder output metadata
-def make_run_json_file(gff_file: Path, fasta_file: Optional[Path], output_dir: Path, results_filename: str = "results.tsv", 
+def make_run_json_file(gff_file: Path, fasta_file: Path | None, output_dir: Path, results_filename: str = "results.tsv", 
                        html_filename: str = "results.html",run_filename: str = "run.json") -> Path:
     
     output_dir = Path(output_dir) #ensure output_dir is a Path
@@ -92,7 +93,10 @@ def make_run_json_file(gff_file: Path, fasta_file: Optional[Path], output_dir: P
     return run_path 
 
 #once eveerything has run in main(), capture the output files, time they were made and how big they are 
-def finalise_run_json_file(output_dir: Path, run_filename: str | Path = "run.json") -> Path:
+#stages: the stage cache records (stage_cache.StageCache.stages), so later runs can reuse this run's outputs
+#qc: metrics of the QC stage (e.g. the QC memo hit rate)
+def finalise_run_json_file(output_dir: Path, run_filename: str | Path = "run.json", stages: dict | None = None,
+                           qc: dict | None = None) -> Path:
     output_dir = Path(output_dir) #ensure output_dir is a Path
     run_path = output_dir / run_filename #full path to the run.json file
 
@@ -103,6 +107,10 @@ def finalise_run_json_file(output_dir: Path, run_filename: str | Path = "run.jso
 
     #update end time and compute output file sizes
     run_dict = update_end_time_and_output_sizes(run_dict)
+    if stages is not None:
+        run_dict["stages"] = stages
+    if qc:
+        run_dict["qc"] = qc
     write_json_file(run_path, run_dict)
     return run_path
 
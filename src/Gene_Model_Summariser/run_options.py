@@ -0,0 +1,51 @@
+'''
+Docstring for Gene_Model_Summariser.run_options
+The options of one summariser run (RunOptions), as set by the GroupB-tool flags.
+One RunOptions is built by the CLI or batch mode and passed through to GroupB_Project5.main as it is; to_dict()/from_dict()
+carry it as JSON, in the daemon protocol and in the checkpoint manifest a streaming run is resumed from.
+'''
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """
+    dpi: Resolution of the report figures.
+    chart_mode: "png" for matplotlib figures, "inline" for a single-file report with browser-drawn charts.
+    explorer: write the sharded per-transcript explorer data (explorer/) used by the report's transcript table.
+    packed_genome: use the 2-bit packed FASTA cache (<fasta>.gms2bit, see packed_genome.py) instead of parsing the FASTA.
+    stage_cache: reuse the outputs of stages whose inputs are unchanged since an earlier run next to output_dir (see stage_cache.py); off by default.
+    qc_memo: reuse per-transcript QC results of unchanged models from <fasta>.qcmemo.sqlite (see qc_memo.py); the hit rate goes to run.json.
+    qc_memo_path: keep the QC memo in this file instead of next to the FASTA.
+    streaming: process one chromosome at a time in (seqid, start) order, writing rows as they are produced, so memory is
+    bounded by the largest chromosome (see streaming.py); rows come out in that order.
+    sqlite: also write the results to an indexed transcript_summary.sqlite (see results_db.py).
+    parquet: also write the results to a typed, columnar transcript_summary.parquet (see parquet_output.py; needs pyarrow).
+    json_log: also write the log as JSON lines (gene_model_summariser.log.jsonl, see log_pipeline.py).
+    figure_workers: processes rendering the report PNGs (1 renders them in this process, None uses one per CPU).
+    """
+    dpi: int = 200
+    chart_mode: str = "png"
+    explorer: bool = True
+    packed_genome: bool = False
+    stage_cache: bool = False
+    qc_memo: bool = False
+    qc_memo_path: str | None = None
+    streaming: bool = False
+    sqlite: bool = False
+    parquet: bool = False
+    json_log: bool = False
+    figure_workers: int | None = 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RunOptions":
+        """Inverse of to_dict; options left out keep their defaults. Raises ValueError on an unknown option."""
+        unknown = set(data) - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"unknown run option(s): {', '.join(sorted(unknown))}")
+        return cls(**data)
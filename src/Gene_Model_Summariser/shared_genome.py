@@ -0,0 +1,162 @@
+'''
+Docstring for Gene_Model_Summariser.shared_genome
+Reference genome held once in multiprocessing.shared_memory, for QC run across several processes.
+All chromosome sequences are concatenated into one shared block with a name -> (offset, length) table.
+SharedGenome behaves like the {seqid: SeqRecord} dict from FastaChecker.fasta_parse (get/items/[]),
+and its ChromosomeView values slice straight out of the shared block, so QC_flags can use it unchanged.
+
+Pickling a SharedGenome only sends the block name and the table; the receiving process attaches to the same
+memory, so memory use stays at about one genome however many workers use it.
+The process that created the genome owns the block and must call unlink() (or use it as a context manager).
+'''
+
+from collections.abc import Iterator, Mapping
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Self
+
+
+class ChromosomeView:
+    """
+    Read-only view of one chromosome in a SharedGenome. Slicing returns a str copied from shared memory
+    (only the slice, never the whole chromosome); `.seq` returns the view itself so code written for
+    SeqRecord (record.seq[start:end]) works on either.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, length: int, name: str) -> None:
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+        self.id = name
+
+    @property
+    def seq(self) -> "ChromosomeView":
+        return self
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, key: int | slice) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if stop <= start:
+                return ""
+            text = bytes(self.buffer[self.offset + start:self.offset + stop]).decode("ascii")
+            return text if step == 1 else text[::step]
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("chromosome index out of range")
+        return chr(self.buffer[self.offset + key])
+
+    def __str__(self) -> str:
+        return self[:]
+
+    def __repr__(self) -> str:
+        return f"ChromosomeView({self.id!r}, length={self.length})"
+
+
+class SharedGenome(Mapping):
+    """
+    Mapping of sequence ID -> ChromosomeView backed by a single shared memory block.
+    Build with from_fasta (streams the file, never holding it as Python strings) or from_records.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, table: dict[str, tuple[int, int]], owner: bool) -> None:
+        self.shm = shm
+        self.table = table
+        self.owner = owner
+        self._views = {name: ChromosomeView(self.buffer, offset, length, name) for name, (offset, length) in table.items()}
+
+    @classmethod
+    def from_fasta(cls, fasta_file: str | Path) -> "SharedGenome":
+        #first pass: sequence lengths, so the block can be allocated once
+        lengths: dict[str, int] = {}
+        name = None
+        with open(fasta_file, "r") as handle:
+            for line in handle:
+                if line.startswith(">"):
+                    name = line[1:].split(maxsplit=1)[0] if line[1:].strip() else ""
+                    lengths[name] = 0
+                elif name is not None:
+                    lengths[name] += len(line.strip())
+        genome = cls._allocate(lengths)
+
+        #second pass: copy each line straight into its place in the block
+        position = 0
+        with open(fasta_file, "r") as handle:
+            for line in handle:
+                if line.startswith(">"):
+                    name = line[1:].split(maxsplit=1)[0] if line[1:].strip() else ""
+                    position = genome.table[name][0]
+                else:
+                    data = line.strip().encode("ascii")
+                    genome.buffer[position:position + len(data)] = data
+                    position += len(data)
+        return genome
+
+    @classmethod
+    def from_records(cls, records: Mapping) -> "SharedGenome":
+        """records: {seqid: SeqRecord or str}, e.g. the dict returned by FastaChecker.fasta_parse."""
+        sequences = {name: str(getattr(record, "seq", record)) for name, record in records.items()}
+        genome = cls._allocate({name: len(seq) for name, seq in sequences.items()})
+        for name, seq in sequences.items():
+            offset, length = genome.table[name]
+            genome.buffer[offset:offset + length] = seq.encode("ascii")
+        return genome
+
+    @classmethod
+    def _allocate(cls, lengths: dict[str, int]) -> "SharedGenome":
+        table = {}
+        offset = 0
+        for name, length in lengths.items():
+            table[name] = (offset, length)
+            offset += length
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1)) #size 0 is not allowed
+        return cls(shm, table, owner=True)
+
+    @classmethod
+    def attach(cls, shm_name: str, table: dict[str, tuple[int, int]]) -> "SharedGenome":
+        """Open an existing block by name (what unpickling does in a worker process)."""
+        #track=False: the resource tracker would otherwise unlink the block when the worker exits; the owner unlinks it
+        shm = shared_memory.SharedMemory(name=shm_name, track=False)
+        return cls(shm, table, owner=False)
+
+    def __reduce__(self) -> tuple:
+        return (SharedGenome.attach, (self.shm.name, self.table))
+
+    def __getitem__(self, name: str) -> ChromosomeView:
+        return self._views[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def buffer(self) -> memoryview:
+        buf = self.shm.buf
+        if buf is None: #the mapping was closed
+            raise ValueError("SharedGenome is closed")
+        return buf
+
+    @property
+    def nbytes(self) -> int:
+        return sum(length for _, length in self.table.values())
+
+    def close(self) -> None:
+        self._views = {}
+        self.shm.close()
+
+    def unlink(self) -> None:
+        #close this process's mapping and, if this process created the block, free it
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.unlink()
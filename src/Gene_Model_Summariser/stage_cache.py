@@ -0,0 +1,131 @@
+'''
+Docstring for Gene_Model_Summariser.stage_cache
+Incremental re-runs (GroupB-tool --stage-cache): each pipeline stage records a key (content hash of its inputs, options and the tool version)
+and the sha256 of every output it wrote, under "stages" in run.json.
+A later run looks for a finished run next to it (the other results/run_XXX directories) with the same key for a
+stage; if that run's outputs still match their recorded hashes they are copied instead of being recomputed.
+
+Stages (see GroupB_Project5.main):
+    gff_validation   - the raw line and check_db validation of this GFF content (no outputs; skipped on a hit)
+    fasta_validation - the FASTA validation of this FASTA content (no outputs; skipped on a hit)
+    qc               - QC and the per-transcript outputs (TSV, BED, GFF, explorer/), keyed on both inputs
+    figures          - the report PNGs; copied in and then checked by save_report_figures' own figure hashes
+The report itself is always re-rendered (it carries this run's provenance), which is cheap once its inputs are reused.
+'''
+
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any
+
+from .run_json_builder import TOOL_VERSION
+
+logger = logging.getLogger("GroupB_logger")
+
+
+def file_digest(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, **inputs: Any) -> str:
+    """Key of one stage: its name, the tool version and its (JSON-serialisable) input fingerprints and options."""
+    payload = json.dumps({"stage": stage, "tool_version": TOOL_VERSION, "inputs": inputs}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def output_files(output_dir: Path, names: list[str]) -> list[Path]:
+    #expand output names (files or directories) into the files they contain, relative to output_dir
+    files = []
+    for name in names:
+        path = output_dir / name
+        if path.is_dir():
+            files.extend(sorted(p.relative_to(output_dir) for p in path.rglob("*") if p.is_file()))
+        elif path.is_file():
+            files.append(Path(name))
+    return files
+
+
+class StageCache:
+    """
+    Stage records for one run directory, plus lookup of matching stages in the finished runs beside it.
+    enabled=False (the default; GroupB-tool --stage-cache turns it on) neither records nor reuses anything, so a run
+    without the cache never hashes its outputs.
+    """
+
+    def __init__(self, output_dir: str | Path, enabled: bool = False) -> None:
+        self.output_dir = Path(output_dir)
+        self.enabled = enabled
+        self.stages: dict[str, dict] = {}
+        self._previous: list[tuple[Path, dict]] | None = None
+
+    def fingerprint(self, path: str | Path | None) -> str | None:
+        """Content hash of an input file. An unreadable input turns reuse off (validation then reports the problem)."""
+        if path is None:
+            return None
+        try:
+            return file_digest(path)
+        except OSError:
+            self.enabled = False
+            return None
+
+    def previous_runs(self) -> list[tuple[Path, dict]]:
+        """(run_dir, stages) of the finished runs next to this one, most recent first."""
+        if self._previous is None:
+            runs = []
+            parent = self.output_dir.resolve().parent
+            for run_json in parent.glob("*/run.json"):
+                run_dir = run_json.parent
+                if run_dir == self.output_dir.resolve():
+                    continue
+                try:
+                    run_info = json.loads(run_json.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    continue
+                if run_info.get("timestamp", {}).get("end") and run_info.get("stages"):
+                    runs.append((run_info["timestamp"]["end"], run_dir, run_info["stages"]))
+            runs.sort(key=lambda run: run[0], reverse=True)
+            self._previous = [(run_dir, stages) for _, run_dir, stages in runs]
+        return self._previous
+
+    def lookup(self, stage: str, key: str) -> Path | None:
+        """The most recent previous run whose `stage` had this key and whose outputs are unchanged on disk."""
+        if not self.enabled:
+            return None
+        for run_dir, stages in self.previous_runs():
+            record = stages.get(stage)
+            if not record or record.get("key") != key:
+                continue
+            outputs = record.get("outputs", {})
+            if all((run_dir / name).is_file() and file_digest(run_dir / name) == digest for name, digest in outputs.items()):
+                return run_dir
+            logger.info(f"Stage cache: {stage} outputs in {run_dir} were modified; not reusing them")
+        return None
+
+    def reuse(self, stage: str, key: str) -> Path | None:
+        """Copy `stage`'s outputs from a matching previous run into this run and record it. Returns that run or None."""
+        source = self.lookup(stage, key)
+        if source is None:
+            return None
+        outputs = next(stages[stage] for run_dir, stages in self.previous_runs() if run_dir == source)["outputs"]
+        for name in outputs:
+            target = self.output_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source / name, target) #a copy, never a link: later stages rewrite some files in place
+        self.stages[stage] = {"key": key, "outputs": outputs, "reused_from": str(source)}
+        logger.info(f"Stage cache: reused {stage} from {source}")
+        return source
+
+    def record(self, stage: str, key: str, outputs: list[str] | None = None) -> None:
+        """Record that `stage` ran in this run, hashing the outputs it wrote (file or directory names). No-op when disabled."""
+        if not self.enabled:
+            return
+        files = output_files(self.output_dir, outputs or [])
+        previous = self.stages.get(stage, {})
+        self.stages[stage] = {"key": key, "outputs": {str(f): file_digest(self.output_dir / f) for f in files},
+                              "reused_from": previous.get("reused_from") if previous.get("key") == key else None}
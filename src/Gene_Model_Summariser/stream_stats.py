@@ -0,0 +1,334 @@
+'''
+Docstring for Gene_Model_Summariser.stream_stats
+One-pass, constant-memory statistics for the HTML report.
+Transcripts are fed in one at a time (TranscriptStatsAggregator.add) and the aggregator keeps
+- plain counters (transcripts, CDS, flagged, per-flag counts)
+- exact histograms for small integer domains (exons per transcript, transcripts per gene)
+- a mergeable relative-error quantile sketch for wide-ranging values (transcript span)
+Aggregators built by separate workers can be combined with merge(), and serialised with to_dict().
+'''
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+#values above this go from the exact histogram into the overflow sketch
+DEFAULT_MAX_EXACT = 1000
+#relative accuracy of quantile estimates from the sketch (1%)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch style) for non-negative values.
+    Any quantile estimate is within `relative_accuracy` of a true value of that rank, memory grows only
+    with log(max/min), and two sketches with the same accuracy merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: dict[int, int] = {} #bucket index -> count
+        self.zero_count = 0 #values <= 0 (kept apart as log() is undefined there)
+        self.count = 0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= 0:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def value_at_rank(self, rank: int) -> float:
+        #value of the rank-th smallest item (0-based), approximated by its bucket's midpoint
+        if rank < self.zero_count:
+            return min(self.min or 0.0, 0.0)
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                if self.min is None or self.max is None: #not reached: a non-empty bucket means values were observed
+                    return estimate
+                return min(max(estimate, self.min), self.max) #never outside the observed range
+        return float(self.max) if self.max is not None else 0.0
+
+    def quantile(self, q: float) -> float | None:
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        return self.value_at_rank(round(q * (self.count - 1)))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"relative_accuracy": self.relative_accuracy, "zero_count": self.zero_count, "count": self.count,
+                "min": self.min, "max": self.max, "buckets": {str(k): v for k, v in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.buckets = {int(k): v for k, v in data["buckets"].items()}
+        return sketch
+
+
+class IntHistogram:
+    """
+    Exact histogram for small non-negative integers (0..max_exact); larger values spill into a QuantileSketch.
+    Quantiles use the same linear interpolation as pandas/numpy, so they are exact while no value overflows.
+    """
+
+    def __init__(self, max_exact: int = DEFAULT_MAX_EXACT) -> None:
+        self.max_exact = max_exact
+        self.counts: dict[int, int] = {} #value -> count
+        self.overflow = QuantileSketch()
+        self.count = 0
+        self.total = 0
+        self.max: int | None = None
+
+    def add(self, value: int, count: int = 1) -> None:
+        value = int(value)
+        if 0 <= value <= self.max_exact:
+            self.counts[value] = self.counts.get(value, 0) + count
+        else:
+            self.overflow.add(value, count)
+        self.count += count
+        self.total += value * count
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "IntHistogram") -> None:
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.overflow.merge(other.overflow)
+        self.count += other.count
+        self.total += other.total
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def value_at_rank(self, rank: int) -> float:
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if rank < seen:
+                return float(value)
+        return self.overflow.value_at_rank(rank - seen) #overflow values are all larger than the exact ones
+
+    def quantile(self, q: float) -> float | None:
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        position = q * (self.count - 1)
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        low_value = self.value_at_rank(lower)
+        if upper == lower:
+            return low_value
+        return low_value + (self.value_at_rank(upper) - low_value) * (position - lower)
+
+    def distribution(self) -> dict[int, int]:
+        #exact part of the histogram, ordered by value (used for bar charts)
+        return {value: self.counts[value] for value in sorted(self.counts)}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"max_exact": self.max_exact, "counts": {str(k): v for k, v in self.counts.items()},
+                "overflow": self.overflow.to_dict(), "count": self.count, "total": self.total, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IntHistogram":
+        histogram = cls(data["max_exact"])
+        histogram.counts = {int(k): v for k, v in data["counts"].items()}
+        histogram.overflow = QuantileSketch.from_dict(data["overflow"])
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class TranscriptStatsAggregator:
+    """
+    Streaming replacement for compute_report_stats(df): add() one transcript_summary row at a time.
+
+    Transcripts-per-gene is counted per run of consecutive rows with the same gene_id, so memory stays constant. The
+    pipeline writes every gene's transcripts together (all modes), so each run is one gene. A partial aggregator keeps
+    its first and last runs open, and merge() of the aggregator over the rows that follow joins a gene split at the
+    boundary, so partitions may cut through a gene.
+    grouped=False is the fallback for rows whose genes are not contiguous: transcripts are counted in a
+    gene_id -> transcripts dict instead, which costs memory for every gene (one small entry each).
+    """
+
+    def __init__(self, grouped: bool = True) -> None:
+        self.total_transcripts = 0
+        self.has_cds_count = 0
+        self.flagged_count = 0
+        self.flag_counts: dict[str, int] = {} #flag -> number of transcripts carrying it
+        self.exon_counts = IntHistogram() #exons per transcript
+        self.grouped = grouped
+        self.per_gene = IntHistogram() #transcripts per gene, for the genes between the first and the last run
+        self.first_gene: list | None = None #[gene_id, transcripts] of the first run, open until merged or reported
+        self.last_gene: list | None = None #[gene_id, transcripts] of the run receiving rows, when it is not the first
+        self.gene_transcripts: dict[str, int] = {} #grouped=False only: gene_id -> number of transcripts
+        self.transcript_span = QuantileSketch() #end - start + 1 (bp)
+        self._gene_histogram: IntHistogram | None = None #built on first use, dropped when rows are added
+
+    def add(self, row: dict) -> None:
+        # row: one transcript_summary.tsv row (gene_id, transcript_id, exon_count, has_cds, flags, start, end)
+        self.total_transcripts += 1
+        self._gene_histogram = None
+
+        gene_id = row["gene_id"]
+        if not self.grouped:
+            self.gene_transcripts[gene_id] = self.gene_transcripts.get(gene_id, 0) + 1
+        elif self.first_gene is None:
+            self.first_gene = [gene_id, 1]
+        elif self.last_gene is None and self.first_gene[0] == gene_id:
+            self.first_gene[1] += 1
+        elif self.last_gene is not None and self.last_gene[0] == gene_id:
+            self.last_gene[1] += 1
+        else:
+            if self.last_gene is not None:
+                self.per_gene.add(self.last_gene[1]) #the previous gene is complete
+            self.last_gene = [gene_id, 1]
+
+        if row.get("exon_count") not in (None, ""):
+            self.exon_counts.add(int(row["exon_count"]))
+
+        if str(row.get("has_cds")).lower() == "true": #same coercion as compute_summary_metrics
+            self.has_cds_count += 1
+
+        flag_set = {f.strip() for f in str(row.get("flags") or "").split(",") if f.strip() != ""}
+        if flag_set:
+            self.flagged_count += 1
+        for flag in flag_set:
+            self.flag_counts[flag] = self.flag_counts.get(flag, 0) + 1
+
+        start, end = row.get("start"), row.get("end")
+        if start not in (None, "") and end not in (None, ""):
+            self.transcript_span.add(int(end) - int(start) + 1)
+
+    def add_all(self, rows: Iterable[dict]) -> "TranscriptStatsAggregator":
+        for row in rows:
+            self.add(row)
+        return self
+
+    def open_genes(self) -> list[list]:
+        #the open [gene_id, transcripts] runs, in row order
+        return [list(run) for run in (self.first_gene, self.last_gene) if run is not None]
+
+    def merge(self, other: "TranscriptStatsAggregator") -> None:
+        """Add the aggregate of other, whose rows come after this one's (a grouped gene split between them is joined)."""
+        if other.grouped != self.grouped:
+            raise ValueError("Cannot merge grouped and ungrouped aggregators")
+        self.total_transcripts += other.total_transcripts
+        self.has_cds_count += other.has_cds_count
+        self.flagged_count += other.flagged_count
+        for flag, count in other.flag_counts.items():
+            self.flag_counts[flag] = self.flag_counts.get(flag, 0) + count
+        self.exon_counts.merge(other.exon_counts)
+        for gene_id, count in other.gene_transcripts.items():
+            self.gene_transcripts[gene_id] = self.gene_transcripts.get(gene_id, 0) + count
+        self.per_gene.merge(other.per_gene)
+        runs, following = self.open_genes(), other.open_genes()
+        if runs and following and runs[-1][0] == following[0][0]:
+            runs[-1][1] += following.pop(0)[1]
+        runs += following
+        for _, count in runs[1:-1]:
+            self.per_gene.add(count) #no longer at either end, so complete
+        self.first_gene = runs[0] if runs else None
+        self.last_gene = runs[-1] if len(runs) > 1 else None
+        self.transcript_span.merge(other.transcript_span)
+        self._gene_histogram = None
+
+    def gene_histogram(self) -> IntHistogram:
+        #transcripts-per-gene over every gene seen so far (open runs included), built once until more rows arrive
+        if self._gene_histogram is None:
+            histogram = IntHistogram()
+            histogram.merge(self.per_gene)
+            for _, count in self.open_genes():
+                histogram.add(count)
+            for count in self.gene_transcripts.values():
+                histogram.add(count)
+            self._gene_histogram = histogram
+        return self._gene_histogram
+
+    def summary_metrics(self) -> dict:
+        #same keys and rounding as html_generation.compute_summary_metrics, plus percentile metrics
+        total = self.total_transcripts
+        per_gene = self.gene_histogram()
+        gene_mean = per_gene.mean()
+        gene_median = per_gene.quantile(0.5)
+        span_median = self.transcript_span.quantile(0.5)
+        span_p95 = self.transcript_span.quantile(0.95)
+        exon_p90 = self.exon_counts.quantile(0.9)
+        return {
+            "total_genes": per_gene.count,
+            "total_transcripts": total,
+            "transcript_mean": round(gene_mean, 2) if gene_mean is not None else 0.0,
+            "transcript_median": round(gene_median, 2) if gene_median is not None else 0.0,
+            "transcript_max": per_gene.max if per_gene.count else 0,
+            "has_cds_count": self.has_cds_count,
+            "has_cds_percent": round((self.has_cds_count / total) * 100, 2) if total > 0 else 0.0,
+            "flagged_transcripts_count": self.flagged_count,
+            "flagged_transcripts_percent": round((self.flagged_count / total) * 100, 2) if total > 0 else 0.0,
+            "exon_count_p90": round(exon_p90, 2) if exon_p90 is not None else None,
+            "transcript_span_median": round(span_median) if span_median is not None else None,
+            "transcript_span_p95": round(span_p95) if span_p95 is not None else None,
+        }
+
+    def plot_inputs(self) -> dict:
+        #same structure as compute_report_stats(df)["plot_inputs"]
+        return {
+            "exon_count_histogram_data": self.exon_counts.distribution(),
+            "transcripts_per_gene_bar_data": self.gene_histogram().distribution(),
+            "flagged_vs_unflagged_bar_data": {"flagged": self.flagged_count,
+                                              "unflagged": self.total_transcripts - self.flagged_count},
+            "qc_flag_counts_per_transcript_data": dict(self.flag_counts),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"total_transcripts": self.total_transcripts, "has_cds_count": self.has_cds_count,
+                "flagged_count": self.flagged_count, "flag_counts": dict(self.flag_counts),
+                "exon_counts": self.exon_counts.to_dict(), "grouped": self.grouped, "per_gene": self.per_gene.to_dict(),
+                "first_gene": self.first_gene, "last_gene": self.last_gene, "gene_transcripts": dict(self.gene_transcripts),
+                "transcript_span": self.transcript_span.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TranscriptStatsAggregator":
+        aggregator = cls(data["grouped"])
+        aggregator.total_transcripts = data["total_transcripts"]
+        aggregator.has_cds_count = data["has_cds_count"]
+        aggregator.flagged_count = data["flagged_count"]
+        aggregator.flag_counts = dict(data["flag_counts"])
+        aggregator.exon_counts = IntHistogram.from_dict(data["exon_counts"])
+        aggregator.per_gene = IntHistogram.from_dict(data["per_gene"])
+        aggregator.first_gene = list(data["first_gene"]) if data["first_gene"] is not None else None
+        aggregator.last_gene = list(data["last_gene"]) if data["last_gene"] is not None else None
+        aggregator.gene_transcripts = dict(data["gene_transcripts"])
+        aggregator.transcript_span = QuantileSketch.from_dict(data["transcript_span"])
+        return aggregator
@@ -0,0 +1,145 @@
+'''
+Docstring for Gene_Model_Summariser.streaming
+Chromosome-at-a-time processing (GroupB-tool --streaming), for genomes whose annotation or sequence does not fit in memory.
+Transcripts are visited in (seqid, start) order straight from the database, QC'd one at a time and written out
+through the api sinks (TSV, BED, GFF, explorer shards and report stats) as they are produced, so no genome-wide
+transcript model or result table is ever built. The reference is opened with an on-disk index and only the
+chromosome being processed is held in memory (a PackedGenome or SharedGenome is used as it is).
+Peak memory is therefore set by the largest chromosome rather than the genome.
+
+Outputs hold the same rows as the default mode, ordered by chromosome and start instead of by the gene table.
+
+With a Checkpoint (see checkpoint.py) each chromosome's results are committed to the run's checkpoint/ directory as
+that chromosome finishes and then passed on to the sinks, so an interrupted run can be resumed from its last complete
+chromosome: the committed chromosomes are replayed into fresh outputs and checking carries on from there.
+'''
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .api import (
+    BEDSink,
+    ExplorerSink,
+    GFFSink,
+    ParquetSink,
+    Sink,
+    SQLiteSink,
+    StatsSink,
+    TranscriptResult,
+    TSVSink,
+    consume,
+)
+
+if TYPE_CHECKING:
+    import gffutils
+
+    from .checkpoint import Checkpoint
+    from .gff_parser import GFF_Parser
+    from .QC_check import QC_flags
+
+#order of the streaming walk over the gene table
+LOCALITY_ORDER = ("seqid", "start")
+
+
+class ChromosomeReference(Mapping):
+    """
+    {seqid: SeqRecord} over a FASTA opened with Bio.SeqIO.index: records are read from disk on request and only
+    the most recently requested chromosome is kept, so walking the genome in seqid order reads each one once.
+    """
+
+    def __init__(self, fasta_file: str | Path) -> None:
+        from Bio import SeqIO
+        self.index = SeqIO.index(str(fasta_file), "fasta")
+        self.current: tuple[str | None, Any] = (None, None)
+
+    def __getitem__(self, name: str) -> Any:
+        if self.current[0] != name:
+            self.current = (None, None) #drop the previous chromosome before reading the next
+            self.current = (name, self.index[name])
+        return self.current[1]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        self.current = (None, None)
+        self.index.close()
+
+
+def iter_results_by_locus(db: "gffutils.FeatureDB", qc: "QC_flags") -> Iterator[TranscriptResult]:
+    """Yield a TranscriptResult per transcript in (seqid, start) order, checking each as it is reached."""
+    for _, results in iter_chromosome_chunks(db, qc):
+        yield from results
+
+
+def iter_chromosome_chunks(db: "gffutils.FeatureDB", qc: "QC_flags",
+                           skip: Callable[[str], bool] | None = None) -> Iterator[tuple[str, Iterator[TranscriptResult]]]:
+    """
+    Yield (seqid, results) per chromosome in seqid order; results are checked lazily as they are iterated.
+    skip: chromosomes for which it returns True are passed over without being checked (e.g. already checkpointed).
+    """
+    from .gff_parser import GFF_Parser
+
+    parser = GFF_Parser(db)
+    for chrom, pairs in groupby(parser.iter_transcripts(order_by=LOCALITY_ORDER), key=lambda pair: pair[0].chrom):
+        if skip is not None and skip(chrom):
+            continue
+        yield chrom, _check_transcripts(parser, qc, pairs)
+
+
+def _check_transcripts(parser: "GFF_Parser", qc: "QC_flags",
+                       pairs: Iterable[tuple["gffutils.Feature", "gffutils.Feature"]]) -> Iterator[TranscriptResult]:
+    for gene, transcript in pairs:
+        exons, cds = parser.transcript_structure(transcript.id)
+        flags = qc.flags_for_structure(gene, transcript.id, exons, cds)
+        yield TranscriptResult(gene_id=gene.id, transcript_id=transcript.id, exon_count=len(exons), has_cds=bool(cds),
+                               chrom=transcript.chrom, start=transcript.start, end=transcript.end,
+                               strand=transcript.strand, flags=tuple(flags))
+
+
+def iter_checkpointed_results(db: "gffutils.FeatureDB", qc: "QC_flags", checkpoint: "Checkpoint") -> Iterator[TranscriptResult]:
+    """
+    The results already in checkpoint (a resumed run), then the remaining chromosomes in (seqid, start) order, each
+    committed to checkpoint before its results are yielded (one chromosome's results are held in memory at a time).
+    """
+    yield from checkpoint.iter_results()
+    for chrom, chunk in iter_chromosome_chunks(db, qc, skip=checkpoint.is_done):
+        results = list(chunk)
+        checkpoint.commit(chrom, results)
+        yield from results
+
+
+def stream_outputs(db: "gffutils.FeatureDB", qc: "QC_flags", output_dir: str | Path, gff_file: str,
+                   explorer: bool = True, sqlite: bool = False, parquet: bool = False,
+                   checkpoint: "Checkpoint | None" = None) -> dict:
+    """
+    Streaming replacement for tsv_output + transcript_QC + output_results: writes transcript_summary.tsv,
+    qc_flagged.bed, qc_flags.gff3, explorer/ and (with sqlite/parquet) transcript_summary.sqlite/.parquet into output_dir. Returns the report stats (see html_generation.run_report).
+    checkpoint: replay the chromosomes it already holds into the sinks, then commit each further chromosome to it before
+    passing that chromosome's results on; it is removed once the outputs are complete.
+    """
+    from .html_generation import report_stats_from_aggregator
+    from .parquet_output import PARQUET_FILENAME
+    from .results_db import RESULTS_DB_FILENAME, run_metadata
+
+    output_dir = Path(output_dir)
+    stats = StatsSink()
+    sinks: list[Sink] = [TSVSink(output_dir / "transcript_summary.tsv"), BEDSink(output_dir / "qc_flagged.bed"),
+             GFFSink(output_dir / "qc_flags.gff3", db, gff_file), stats]
+    if explorer:
+        sinks.append(ExplorerSink(output_dir))
+    if sqlite:
+        sinks.append(SQLiteSink(output_dir / RESULTS_DB_FILENAME, run_metadata(output_dir)))
+    if parquet:
+        sinks.append(ParquetSink(output_dir / PARQUET_FILENAME))
+    if checkpoint is None:
+        consume(iter_results_by_locus(db, qc), sinks)
+    else:
+        consume(iter_checkpointed_results(db, qc, checkpoint), sinks)
+        checkpoint.remove()
+    return report_stats_from_aggregator(stats.aggregator)
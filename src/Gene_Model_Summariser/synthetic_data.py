@@ -0,0 +1,205 @@
+'''
+Docstring for Gene_Model_Summariser.synthetic_data
+Deterministic generator for synthetic reference genomes (FASTA) and matching GFF3 gene models.
+Used by the benchmark suite (benchmark.py) and the tests to produce inputs of any size that pass
+raw line, database and FASTA validation. The same seed and settings always give byte-identical files.
+'''
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+STOP_CODONS = ("TAA", "TAG", "TGA")
+SENSE_CODONS = tuple(
+    a + b + c for a in "ACGT" for b in "ACGT" for c in "ACGT" if a + b + c not in STOP_CODONS
+)
+COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+#layout constants (bp) - exons and introns are drawn from these ranges
+#exon lengths are drawn in codons so every CDS segment starts in phase 0
+EXON_CODON_RANGE = (30, 100)
+INTRON_LENGTH_RANGE = (80, 600)
+UTR_LENGTH_RANGE = (20, 120)
+INTERGENIC_LENGTH_RANGE = (200, 2000)
+
+
+@dataclass
+class SyntheticConfig:
+    """
+    Settings for one synthetic dataset.
+
+    Args:
+        genes: Total number of gene features to generate
+        isoforms: mRNA isoforms per gene (isoforms share the CDS and differ in their UTRs)
+        exons: Exons per isoform
+        chrom_size: Maximum length of each chromosome; genes spill onto a new chromosome when full
+        seed: Seed for the random number generator
+        defect_rate: Fraction of genes given a broken start codon so QC flags are exercised
+        n_run_rate: Fraction of intergenic gaps that contain a run of N bases
+    """
+    genes: int = 100
+    isoforms: int = 2
+    exons: int = 4
+    chrom_size: int = 1_000_000
+    seed: int = 0
+    defect_rate: float = 0.0
+    n_run_rate: float = 0.1
+
+
+def reverse_complement(sequence: str) -> str:
+    return sequence.translate(COMPLEMENT)[::-1]
+
+
+def random_bases(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices("ACGT", k=length))
+
+
+def make_orf(rng: random.Random, length: int, broken_start: bool = False) -> str:
+    """Build an open reading frame of `length` bases (multiple of 3): ATG, sense codons, stop."""
+    n_codons = length // 3
+    start = "CTG" if broken_start else "ATG"
+    middle = rng.choices(SENSE_CODONS, k=max(n_codons - 2, 0))
+    return start + "".join(middle) + rng.choice(STOP_CODONS)
+
+
+def gene_span(config: SyntheticConfig) -> int:
+    #worst case footprint of one gene, used to decide when a chromosome is full
+    longest_exon = EXON_CODON_RANGE[1] * 3
+    return (config.exons * longest_exon) + ((config.exons - 1) * INTRON_LENGTH_RANGE[1]) + 2 * UTR_LENGTH_RANGE[1]
+
+
+def write_synthetic_dataset(out_dir: str | Path, config: SyntheticConfig, prefix: str = "synthetic") -> tuple[Path, Path]:
+    """
+    Write `<prefix>.gff3` and `<prefix>.fasta` into out_dir and return their paths (gff, fasta).
+    Genes alternate strand, are laid out left to right along each chromosome and every isoform
+    carries a valid CDS (ATG start, in-frame stop, correct phases) unless selected as a defect.
+    """
+    if config.genes < 1 or config.isoforms < 1 or config.exons < 1:
+        raise ValueError("genes, isoforms and exons must all be at least 1")
+    if config.chrom_size < gene_span(config) + INTERGENIC_LENGTH_RANGE[1]:
+        raise ValueError(f"chrom_size {config.chrom_size} is too small to hold a single gene")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    gff_path = out_dir / f"{prefix}.gff3"
+    fasta_path = out_dir / f"{prefix}.fasta"
+
+    rng = random.Random(config.seed)
+    chromosomes: list[tuple[str, str]] = []
+
+    with gff_path.open("w") as gff:
+        gff.write("##gff-version 3\n")
+        gene_number = 0
+        chrom_number = 0
+        while gene_number < config.genes:
+            chrom_number += 1
+            chrom = f"chr{chrom_number}"
+            pieces: list[str] = [] #chromosome sequence, built left to right
+            position = 0 #number of bases written so far (0-based end)
+
+            while gene_number < config.genes and position + gene_span(config) + INTERGENIC_LENGTH_RANGE[1] <= config.chrom_size:
+                #intergenic gap, optionally containing a run of Ns
+                gap = rng.randint(*INTERGENIC_LENGTH_RANGE)
+                gap_seq = random_bases(rng, gap)
+                if rng.random() < config.n_run_rate:
+                    run = rng.randint(5, min(50, gap // 2))
+                    offset = rng.randint(0, gap - run)
+                    gap_seq = gap_seq[:offset] + "N" * run + gap_seq[offset + run:]
+                pieces.append(gap_seq)
+                position += gap
+
+                gene_number += 1
+                gene_seq, gene_lines = build_gene(rng, config, chrom, position, gene_number)
+                pieces.append(gene_seq)
+                position += len(gene_seq)
+                gff.writelines(gene_lines)
+
+            #trailing gap so the last gene is not flush with the chromosome end
+            tail = rng.randint(*INTERGENIC_LENGTH_RANGE)
+            pieces.append(random_bases(rng, tail))
+            chromosomes.append((chrom, "".join(pieces)))
+
+    with fasta_path.open("w") as fasta:
+        for chrom, sequence in chromosomes:
+            fasta.write(f">{chrom}\n")
+            for i in range(0, len(sequence), 60):
+                fasta.write(sequence[i:i + 60] + "\n")
+
+    return gff_path, fasta_path
+
+
+def build_gene(rng: random.Random, config: SyntheticConfig, chrom: str, offset: int, gene_number: int) -> tuple[str, list[str]]:
+    """
+    Build the genomic sequence and GFF3 lines for one gene starting after `offset` bases.
+    Returns (sequence, gff_lines); coordinates in the lines are 1-based and inclusive.
+    """
+    strand = "+" if gene_number % 2 else "-"
+    gene_id = f"gene{gene_number:06d}"
+    broken_start = rng.random() < config.defect_rate
+
+    #exon/intron structure in transcription order, relative to the gene start
+    exon_lengths = [rng.randint(*EXON_CODON_RANGE) * 3 for _ in range(config.exons)]
+    intron_lengths = [rng.randint(*INTRON_LENGTH_RANGE) for _ in range(config.exons - 1)]
+    utr5 = [rng.randint(*UTR_LENGTH_RANGE) for _ in range(config.isoforms)] #each isoform gets its own 5' UTR
+    utr3 = rng.randint(*UTR_LENGTH_RANGE)
+    max_utr5 = max(utr5)
+
+    #every exon is fully coding; the UTRs are added as flanks on the first and last exon
+    coding_total = sum(exon_lengths)
+    orf = make_orf(rng, coding_total, broken_start=broken_start)
+
+    #transcription-order sequence: 5' UTR flank, exons separated by introns, 3' UTR flank
+    segments: list[tuple[int, int]] = [] #coding segments (tx-relative start, end), 0-based half open
+    tx_pieces = [random_bases(rng, max_utr5)]
+    cursor = max_utr5
+    orf_used = 0
+    for i, exon_length in enumerate(exon_lengths):
+        tx_pieces.append(orf[orf_used:orf_used + exon_length])
+        segments.append((cursor, cursor + exon_length))
+        orf_used += exon_length
+        cursor += exon_length
+        if i < len(intron_lengths):
+            #canonical GT...AG introns
+            intron = "GT" + random_bases(rng, intron_lengths[i] - 4) + "AG"
+            tx_pieces.append(intron)
+            cursor += intron_lengths[i]
+    tx_pieces.append(random_bases(rng, utr3))
+    cursor += utr3
+    tx_seq = "".join(tx_pieces)
+
+    #exons in transcription order (tx-relative) - the first and last carry the UTRs
+    exon_bounds: list[tuple[int, int]] = []
+    cursor = max_utr5
+    for i, exon_length in enumerate(exon_lengths):
+        exon_bounds.append((cursor, cursor + exon_length))
+        cursor += exon_length + (intron_lengths[i] if i < len(intron_lengths) else 0)
+    exon_bounds[-1] = (exon_bounds[-1][0], exon_bounds[-1][1] + utr3)
+    gene_length = len(tx_seq)
+
+    #convert tx-relative half-open intervals into 1-based genomic coordinates
+    def to_genome(start: int, end: int) -> tuple[int, int]:
+        if strand == "+":
+            return offset + start + 1, offset + end
+        return offset + gene_length - end + 1, offset + gene_length - start
+
+    genomic_seq = tx_seq if strand == "+" else reverse_complement(tx_seq)
+
+    lines: list[str] = []
+    gene_start, gene_end = to_genome(0, gene_length)
+    lines.append(f"{chrom}\tsynthetic\tgene\t{gene_start}\t{gene_end}\t.\t{strand}\t.\tID={gene_id};Name={gene_id}\n")
+    for iso in range(config.isoforms):
+        tx_id = f"{gene_id}.t{iso + 1}"
+        iso_exons = list(exon_bounds)
+        iso_exons[0] = (max_utr5 - utr5[iso], iso_exons[0][1])
+        tx_start, tx_end = to_genome(iso_exons[0][0], iso_exons[-1][1])
+        lines.append(f"{chrom}\tsynthetic\tmRNA\t{tx_start}\t{tx_end}\t.\t{strand}\t.\tID={tx_id};Parent={gene_id}\n")
+        for n, (start, end) in enumerate(iso_exons, start=1):
+            g_start, g_end = to_genome(start, end)
+            lines.append(f"{chrom}\tsynthetic\texon\t{g_start}\t{g_end}\t.\t{strand}\t.\tID={tx_id}.exon{n};Parent={tx_id}\n")
+        coding_done = 0
+        for n, (start, end) in enumerate(segments, start=1):
+            g_start, g_end = to_genome(start, end)
+            phase = (3 - coding_done % 3) % 3
+            coding_done += end - start
+            lines.append(f"{chrom}\tsynthetic\tCDS\t{g_start}\t{g_end}\t.\t{strand}\t{phase}\tID={tx_id}.cds{n};Parent={tx_id}\n")
+    return genomic_seq, lines
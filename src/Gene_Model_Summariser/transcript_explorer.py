@@ -0,0 +1,164 @@
+'''
+Docstring for Gene_Model_Summariser.transcript_explorer
+Writes the data behind the per-transcript explorer table in report.html.
+Rows are streamed in (ExplorerWriter.add) and written as gzip-compressed JSON shards of at most `shard_size`
+transcripts from a single chromosome. A small index (explorer/index.js) records, for every shard, its chromosome,
+coordinate range, row count and per-flag counts, so the report can work out which shards a filter or page needs
+and load only those, on demand.
+
+Shards and the index are JavaScript files (window.gmsExplorerShard(...)/window.gmsExplorerIndex = ...) rather than
+plain JSON because browsers block fetch() of local files when report.html is opened from disk.
+A single-file (inline) report embeds the index and the still-compressed shard payloads instead (load_embedded).
+'''
+
+import base64
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+EXPLORER_DIRNAME = "explorer"
+INDEX_FILENAME = "index.js"
+DEFAULT_SHARD_SIZE = 5000
+#columns of each row in a shard, in order
+COLUMNS = ["gene_id", "transcript_id", "exon_count", "has_cds", "chrom", "start", "end", "strand", "flags"]
+
+
+def split_flags(flags: str | None) -> list[str]:
+    return [f.strip() for f in str(flags or "").split(",") if f.strip() != ""]
+
+
+class ExplorerWriter:
+    """
+    Streams transcript_summary rows into compressed explorer shards.
+    Memory is bounded by shard_size rows per chromosome buffer (and max_buffered rows overall).
+    Call close() once all rows are added; it flushes the remaining rows and writes the index.
+    """
+
+    def __init__(self, output_dir: str | Path, shard_size: int = DEFAULT_SHARD_SIZE, max_buffered: int | None = None) -> None:
+        self.explorer_dir = Path(output_dir) / EXPLORER_DIRNAME
+        if self.explorer_dir.exists():
+            shutil.rmtree(self.explorer_dir) #shards from an earlier run in this directory would be stale
+        self.explorer_dir.mkdir(parents=True)
+        self.shard_size = shard_size
+        self.max_buffered = max_buffered or shard_size * 4
+        self.buffers: dict[str, list[list]] = {} #chrom -> rows waiting to be written
+        self.buffered = 0
+        self.shards: list[dict] = [] #index entries, in the order shards were written
+        self.total_rows = 0
+
+    def add(self, row: dict) -> None:
+        chrom = str(row.get("chrom"))
+        compact = [
+            row.get("gene_id"),
+            row.get("transcript_id"),
+            int(row["exon_count"]) if row.get("exon_count") not in (None, "") else None,
+            1 if str(row.get("has_cds")).lower() == "true" else 0,
+            chrom,
+            int(row["start"]) if row.get("start") not in (None, "") else None,
+            int(row["end"]) if row.get("end") not in (None, "") else None,
+            row.get("strand"),
+            row.get("flags") or "",
+        ]
+        buffer = self.buffers.setdefault(chrom, [])
+        buffer.append(compact)
+        self.buffered += 1
+        self.total_rows += 1
+        if len(buffer) >= self.shard_size:
+            self.flush(chrom)
+        elif self.buffered >= self.max_buffered:
+            #many small chromosomes/scaffolds: write out everything buffered so far
+            for buffered_chrom in list(self.buffers):
+                self.flush(buffered_chrom)
+
+    def flush(self, chrom: str) -> None:
+        rows = self.buffers.pop(chrom, [])
+        if not rows:
+            return
+        self.buffered -= len(rows)
+
+        shard_id = len(self.shards)
+        filename = f"shard_{shard_id:05d}.js"
+        payload = json.dumps(rows, separators=(",", ":")).encode("utf-8")
+        compressed = base64.b64encode(gzip.compress(payload, mtime=0)).decode("ascii") #mtime=0 keeps output byte-identical
+        (self.explorer_dir / filename).write_text(f"window.gmsExplorerShard({shard_id},\"{compressed}\");\n", encoding="utf-8")
+
+        flag_counts: dict[str, int] = {}
+        flagged = 0
+        for row in rows:
+            flags = split_flags(row[8])
+            if flags:
+                flagged += 1
+            for flag in set(flags):
+                flag_counts[flag] = flag_counts.get(flag, 0) + 1
+        starts = [r[5] for r in rows if r[5] is not None]
+        ends = [r[6] for r in rows if r[6] is not None]
+        self.shards.append({
+            "id": shard_id,
+            "file": filename,
+            "chrom": chrom,
+            "count": len(rows),
+            "flagged": flagged,
+            "flags": flag_counts,
+            "start": min(starts) if starts else None,
+            "end": max(ends) if ends else None,
+        })
+
+    def close(self) -> dict:
+        for chrom in list(self.buffers):
+            self.flush(chrom)
+        index = build_index(self.shards, self.total_rows)
+        (self.explorer_dir / INDEX_FILENAME).write_text(
+            "window.gmsExplorerIndex=" + json.dumps(index, separators=(",", ":"), sort_keys=True) + ";\n", encoding="utf-8")
+        return index
+
+
+def build_index(shards: list[dict], total_rows: int) -> dict:
+    #lookup tables from chromosome / flag to the shards that contain them
+    by_chrom: dict[str, list[int]] = {}
+    by_flag: dict[str, list[int]] = {}
+    for shard in shards:
+        by_chrom.setdefault(shard["chrom"], []).append(shard["id"])
+        for flag in shard["flags"]:
+            by_flag.setdefault(flag, []).append(shard["id"])
+    return {
+        "columns": COLUMNS,
+        "total": total_rows,
+        "shards": shards,
+        "chroms": by_chrom,
+        "flags": by_flag,
+    }
+
+
+def read_shard_payload(path: str | Path) -> str:
+    """The base64 gzip payload of one shard file, as passed to window.gmsExplorerShard."""
+    text = Path(path).read_text(encoding="utf-8")
+    return text.split(",\"", 1)[1].rsplit("\");", 1)[0]
+
+
+def read_shard(path: str | Path) -> list[list]:
+    """Decode one shard file back into its rows (used by tests and tooling, the browser does the same in JS)."""
+    rows: list[list] = json.loads(gzip.decompress(base64.b64decode(read_shard_payload(path))))
+    return rows
+
+
+def load_index(output_dir: str | Path) -> dict | None:
+    """Read explorer/index.js from a run directory, or None if the run has no explorer data."""
+    path = Path(output_dir) / EXPLORER_DIRNAME / INDEX_FILENAME
+    if not path.exists():
+        return None
+    text = path.read_text(encoding="utf-8")
+    index: dict = json.loads(text[len("window.gmsExplorerIndex="):].rstrip().rstrip(";"))
+    return index
+
+
+def load_embedded(output_dir: str | Path) -> dict | None:
+    """
+    The index and every shard payload ({shard id: base64 gzip}) of a run's explorer/, for embedding in a single-file
+    report; None if the run has no explorer data.
+    """
+    index = load_index(output_dir)
+    if index is None:
+        return None
+    explorer_dir = Path(output_dir) / EXPLORER_DIRNAME
+    return {"index": index, "shards": {shard["id"]: read_shard_payload(explorer_dir / shard["file"]) for shard in index["shards"]}}
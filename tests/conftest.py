@@ -0,0 +1,25 @@
+import pytest
+
+from Gene_Model_Summariser.synthetic_data import (
+    SyntheticConfig,
+    write_synthetic_dataset,
+)
+
+#synthetic_inputs settings unless a test, class or module overrides them with @pytest.mark.synthetic(...)
+DEFAULT_SYNTHETIC = {"genes": 60, "chrom_size": 60_000, "defect_rate": 0.3}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "synthetic(**settings): SyntheticConfig settings for the synthetic_inputs fixture")
+
+
+@pytest.fixture
+def synthetic_inputs(tmp_path, request):
+    """
+    Synthetic GFF3 + FASTA pair written to tmp_path/data, returned as (gff, fasta).
+    Spread over several chromosomes with defective models by default; the closest
+    @pytest.mark.synthetic(genes=..., seed=..., ...) overrides any SyntheticConfig setting.
+    """
+    marker = request.node.get_closest_marker("synthetic")
+    settings = {**DEFAULT_SYNTHETIC, **(marker.kwargs if marker else {})}
+    return write_synthetic_dataset(tmp_path / "data", SyntheticConfig(**settings))
@@ -0,0 +1,84 @@
+import csv
+import json
+
+import pandas as pd
+import pytest
+
+from Gene_Model_Summariser.aggregate_report import (
+    REPORT_FILENAME,
+    SUMMARY_FILENAME,
+    TABLE_FILENAME,
+    aggregate_app,
+    aggregate_runs,
+)
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.html_generation import compute_summary_metrics
+from Gene_Model_Summariser.run_options import RunOptions
+from Gene_Model_Summariser.synthetic_data import (
+    SyntheticConfig,
+    write_synthetic_dataset,
+)
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    """
+    results/ holding two finished runs of different synthetic annotations.
+    """
+    results = tmp_path / "results"
+    for i, defect_rate in enumerate((0.2, 0.6), start=1):
+        gff_file, fasta_file = write_synthetic_dataset(tmp_path / f"data{i}", SyntheticConfig(genes=60, seed=i, defect_rate=defect_rate))
+        main(str(gff_file), str(fasta_file), str(results / f"run_00{i}"), RunOptions(chart_mode="inline", stage_cache=False, explorer=False))
+    return results
+
+
+def read_table(path):
+    with open(path, newline="") as handle:
+        return list(csv.DictReader(handle, delimiter="\t"))
+
+
+class TestAggregateReport:
+
+    def test_runs_write_sidecars_and_aggregate_without_tsvs(self, results_dir, capsys):
+        """
+        Each run's summary.json holds compute_summary_metrics' values and flag counts; aggregate only needs the sidecars.
+        """
+        for run_dir in sorted(results_dir.iterdir()):
+            summary = json.loads((run_dir / SUMMARY_FILENAME).read_text())
+            df = pd.read_csv(run_dir / "transcript_summary.tsv", sep="\t")
+            expected = compute_summary_metrics(df)
+            assert {key: summary["summary_metrics"][key] for key in expected} == expected
+            assert sum(summary["flag_counts"].values()) >= summary["summary_metrics"]["flagged_transcripts_count"] > 0
+            (run_dir / "transcript_summary.tsv").unlink()
+
+        assert aggregate_app([str(results_dir)]) == 0
+        assert "Aggregate report written to" in capsys.readouterr().out
+        rows = read_table(results_dir / TABLE_FILENAME)
+        assert [row["run"] for row in rows] == ["run_001", "run_002"]
+        assert float(rows[0]["flagged_transcripts_percent"]) < float(rows[1]["flagged_transcripts_percent"])
+        html = (results_dir / REPORT_FILENAME).read_text()
+        assert 'href="run_001/report.html"' in html and 'href="run_002/report.html"' in html
+
+    def test_many_sidecars(self, tmp_path, capsys):
+        """
+        Thousands of sidecars are aggregated; flag columns are the union over runs and broken sidecars are skipped.
+        """
+        for i in range(2000):
+            run_dir = tmp_path / "results" / f"run_{i:04d}"
+            (run_dir / "figures").mkdir(parents=True)
+            flags = {"no_CDS": i % 7} if i % 2 else {"invalid_stop_codon": 1}
+            sidecar = {"schema_version": 1, "tool": {"version": "1.1.0"}, "timestamp": {"start": f"2026-01-01T00:00:{i % 60:02d}"},
+                       "inputs": {"gff": {"path": f"/data/v{i}.gff3"}, "fasta": {"path": None}},
+                       "summary_metrics": {"total_genes": i, "total_transcripts": 2 * i, "flagged_transcripts_percent": 1.5},
+                       "flag_counts": flags}
+            (run_dir / SUMMARY_FILENAME).write_text(json.dumps(sidecar))
+        (tmp_path / "results" / "broken").mkdir()
+        (tmp_path / "results" / "broken" / SUMMARY_FILENAME).write_text("{")
+
+        report = aggregate_runs(tmp_path / "results", tmp_path / "out")
+        rows = read_table(tmp_path / "out" / TABLE_FILENAME)
+        assert len(rows) == 2000
+        assert {"no_CDS", "invalid_stop_codon"} <= set(rows[0])
+        assert rows[0]["gff"].startswith("v") and rows[0]["has_cds_percent"] == ""
+        assert "skipping" in capsys.readouterr().err
+        assert report.read_text().count("<tr>") == 2001
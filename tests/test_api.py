@@ -0,0 +1,74 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from Gene_Model_Summariser.api import (
+    BEDSink,
+    FastaValidationError,
+    GFFSink,
+    GFFValidationError,
+    StatsSink,
+    TranscriptResult,
+    TSVSink,
+    consume,
+    iter_transcripts,
+    open_annotation,
+)
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.run_options import RunOptions
+
+#synthetic GFF3 + FASTA with defective models so some transcripts are flagged (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(genes=15, seed=8)
+
+
+class TestAPI:
+
+    def test_sinks_match_cli_outputs(self, tmp_path, synthetic_inputs):
+        """
+        Streaming results through the file sinks reproduces the CLI's TSV, BED and QC GFF byte for byte.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        main(str(gff_file), str(fasta_file), str(tmp_path / "cli"), RunOptions(chart_mode="inline"))
+
+        api_dir = tmp_path / "api"
+        api_dir.mkdir()
+        stats = StatsSink()
+        count = consume(iter_transcripts(gff_file, fasta_file),
+                        [TSVSink(api_dir / "transcript_summary.tsv"), BEDSink(api_dir / "qc_flagged.bed"),
+                         GFFSink(api_dir / "qc_flags.gff3", open_annotation(gff_file), gff_file), stats])
+
+        assert count == 30
+        for name in ("transcript_summary.tsv", "qc_flagged.bed", "qc_flags.gff3"):
+            assert (api_dir / name).read_text() == (tmp_path / "cli" / name).read_text()
+        assert stats.summary_metrics()["total_transcripts"] == 30
+
+    def test_results_are_typed_records(self, synthetic_inputs):
+        """
+        Results are yielded lazily as TranscriptResult records with flags as a tuple.
+        """
+        results = iter_transcripts(*synthetic_inputs)
+        first = next(results)
+        assert isinstance(first, TranscriptResult)
+        assert first.gene_id == "gene000001" and first.transcript_id == "gene000001.t1"
+        assert isinstance(first.flags, tuple)
+        assert any(result.flagged for result in results)
+
+    def test_invalid_gff_raises(self, tmp_path):
+        """
+        Validation failures raise GFFValidationError (not SystemExit) carrying the logged reasons.
+        """
+        gff = tmp_path / "models.gff3"
+        shutil.copy(Path(__file__).parent / "Fixtures" / "models.gff3", gff)
+        with pytest.raises(GFFValidationError) as error:
+            iter_transcripts(gff)
+        assert error.value.errors
+
+    def test_invalid_fasta_raises(self, tmp_path, synthetic_inputs):
+        """
+        An invalid FASTA raises FastaValidationError before any result is produced.
+        """
+        bad_fasta = tmp_path / "bad.fa"
+        bad_fasta.write_text(">chr1\nACGTXX\n")
+        with pytest.raises(FastaValidationError):
+            iter_transcripts(synthetic_inputs[0], bad_fasta)
@@ -0,0 +1,113 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from Gene_Model_Summariser import batch, fasta_validator
+from Gene_Model_Summariser.batch import read_manifest, run_batch
+from Gene_Model_Summariser.run_options import RunOptions
+from Gene_Model_Summariser.synthetic_data import (
+    SyntheticConfig,
+    write_synthetic_dataset,
+)
+
+
+def _dying_worker(job, options, reference=None):
+    #stands in for run_job in a worker process that is killed mid-job
+    os._exit(1)
+
+
+@pytest.fixture
+def batch_inputs(tmp_path):
+    """
+    Two annotation versions of the same synthetic genome, a copy of that genome under another name,
+    and the (invalid) fixture GFF; the manifest uses paths relative to its own directory.
+    """
+    data = tmp_path / "data"
+    gff_a, fasta = write_synthetic_dataset(data, SyntheticConfig(genes=8, chrom_size=40_000, seed=2), prefix="v1")
+    gff_b, _ = write_synthetic_dataset(data, SyntheticConfig(genes=8, chrom_size=40_000, seed=2), prefix="v2")
+    fasta_copy = data / "genome_copy.fa"
+    shutil.copy(fasta, fasta_copy)
+    bad_gff = data / "models.gff3"
+    shutil.copy(Path(__file__).parent / "Fixtures" / "models.gff3", bad_gff)
+
+    manifest = tmp_path / "manifest.tsv"
+    manifest.write_text(
+        "gff\tfasta\toutdir\n"
+        "# two versions against the same genome\n"
+        f"data/{gff_a.name}\tdata/{fasta.name}\tout\n"
+        f"data/{gff_b.name}\tdata/{fasta_copy.name}\tout\n"
+        "\n"
+        f"data/{bad_gff.name}\n"
+    )
+    return manifest
+
+
+class TestBatch:
+
+    def test_read_manifest(self, tmp_path, batch_inputs):
+        """
+        Header, comments and blank lines are skipped; optional columns default to None; paths are resolved.
+        """
+        jobs = read_manifest(batch_inputs)
+        assert len(jobs) == 3
+        assert jobs[0].gff == str(tmp_path / "data" / "v1.gff3")
+        assert jobs[0].outdir == str(tmp_path / "out")
+        assert jobs[2].fasta is None and jobs[2].outdir is None
+
+    def test_identical_fasta_validated_once(self, tmp_path, batch_inputs, monkeypatch):
+        """
+        Identical FASTA content is validated once for the whole batch; every job gets its own run directory
+        and a failing job does not stop the others.
+        """
+        calls = []
+        original = fasta_validator.FastaChecker.validate_fasta
+        monkeypatch.setattr(fasta_validator.FastaChecker, "validate_fasta",
+                            lambda self: calls.append(self.fasta_file) or original(self))
+
+        results = run_batch(read_manifest(batch_inputs), RunOptions(chart_mode="inline", stage_cache=False), workers=1) #both jobs would otherwise share one QC run
+
+        assert len(calls) == 1
+        assert [r["status"] for r in results] == ["ok", "ok", "failed"]
+        assert results[0]["run_dir"] == str(tmp_path / "out" / "results" / "run_001")
+        assert results[1]["run_dir"] == str(tmp_path / "out" / "results" / "run_002")
+        for result in results[:2]:
+            assert (Path(result["run_dir"]) / "transcript_summary.tsv").exists()
+        log = (Path(results[1]["run_dir"]) / "gene_model_summariser.log").read_text()
+        assert "pre-validated reference" in log
+
+    def test_worker_pool_matches_serial(self, tmp_path, batch_inputs):
+        """
+        Jobs run on a process pool produce the same outputs as serial runs.
+        """
+        jobs = read_manifest(batch_inputs)[:2]
+        serial = run_batch(jobs, RunOptions(chart_mode="inline"), workers=1)
+        pooled = run_batch(read_manifest(batch_inputs)[:2], RunOptions(chart_mode="inline"), workers=2)
+        assert [r["status"] for r in pooled] == ["ok", "ok"]
+        for a, b in zip(serial, pooled, strict=True):
+            assert (Path(a["run_dir"]) / "transcript_summary.tsv").read_text() == \
+                (Path(b["run_dir"]) / "transcript_summary.tsv").read_text()
+
+    def test_invalid_fasta_reasons_in_result(self, tmp_path, batch_inputs):
+        """
+        A job whose FASTA fails validation is reported with the validator's messages, not just "invalid FASTA file".
+        """
+        jobs = read_manifest(batch_inputs)[:1]
+        bad_fasta = tmp_path / "data" / "duplicate.fa"
+        bad_fasta.write_text(">chr1\nACGT\n>chr1\nACGT\n")
+        jobs[0].fasta = str(bad_fasta)
+        results = run_batch(jobs, RunOptions(chart_mode="inline", stage_cache=False), workers=1)
+        assert results[0]["status"] == "failed"
+        assert "Duplicate sequence ID: 'chr1'" in results[0]["error"]
+
+    def test_dead_worker_fails_its_jobs(self, batch_inputs, monkeypatch):
+        """
+        A worker process that dies (BrokenProcessPool) is reported as a failed job instead of ending the batch.
+        """
+        monkeypatch.setattr(batch, "run_job", _dying_worker)
+        jobs = read_manifest(batch_inputs)[:2]
+        results = run_batch(jobs, RunOptions(chart_mode="inline"), workers=2)
+        assert [r["run_dir"] for r in results] == [job.run_dir for job in jobs]
+        assert [r["status"] for r in results] == ["failed", "failed"]
+        assert all(r["error"].startswith("BrokenProcessPool") for r in results)
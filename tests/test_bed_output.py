@@ -1,5 +1,5 @@
 from pathlib import Path
-from Gene_Model_Summariser.qc_flags_bed import TranscriptWithFlags, write_qc_bed
+from Gene_Model_Summariser.qc_flags_bed import QCBedWriter, TranscriptWithFlags, write_qc_bed
 
 def test_bed_output_only_flagged(tmp_path: Path) -> None:
     """
@@ -58,4 +58,27 @@ def test_bed_format_correct(tmp_path: Path) -> None:
     assert fields[5] == '+', "Strand field incorrect"
     assert fields[6] == '1000', "ThickStart should match start position"
     assert fields[7] == '5000', "ThickEnd should match end position"
-    assert ',' in fields[8], "RGB color field should contain comma-separated values"
\ No newline at end of file
+    assert ',' in fields[8], "RGB color field should contain comma-separated values"
+
+
+def test_streaming_writer_matches_write_qc_bed(tmp_path: Path) -> None:
+    """
+    Test that QCBedWriter, which spools rows to disk, writes the same file (colors included) as write_qc_bed.
+
+    Args:
+        tmp_path: Pytest fixture providing temporary directory for test files
+    """
+    transcripts: list[TranscriptWithFlags] = [
+        TranscriptWithFlags("chr1", 1000, 5000, "t1", {"no_CDS"}, "+"),
+        TranscriptWithFlags("chr1", 6000, 8000, "t2", set(), "+"),
+        TranscriptWithFlags("chr2", 100, 900, "t3", {"invalid_stop_codon", "N_in_CDS"}, "-"),
+    ]
+    write_qc_bed(transcripts, tmp_path / "expected.bed")
+
+    writer = QCBedWriter(tmp_path / "streamed.bed")
+    for transcript in transcripts:
+        writer.add(transcript)
+    writer.close()
+
+    assert (tmp_path / "streamed.bed").read_text() == (tmp_path / "expected.bed").read_text()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["expected.bed", "streamed.bed"] #spool file removed
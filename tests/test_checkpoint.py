@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from Gene_Model_Summariser.checkpoint import (
+    CHECKPOINT_DIRNAME,
+    MANIFEST_FILENAME,
+    Checkpoint,
+    resume_run,
+)
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.run_options import RunOptions
+
+OUTPUTS = ["transcript_summary.tsv", "qc_flagged.bed", "qc_flags.gff3"]
+
+
+#a synthetic annotation over several chromosomes, with defects so every output has rows (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(chrom_size=20000, seed=8)
+
+
+def interrupted_run(monkeypatch, gff_file, fasta_file, run_dir, fail_at=2):
+    """A streaming run killed while committing its fail_at-th chromosome."""
+    commit = Checkpoint.commit
+    calls = []
+
+    def failing_commit(self, chunk, results):
+        calls.append(chunk)
+        if len(calls) == fail_at:
+            raise MemoryError("killed")
+        return commit(self, chunk, results)
+
+    monkeypatch.setattr(Checkpoint, "commit", failing_commit)
+    with pytest.raises(MemoryError):
+        main(str(gff_file), str(fasta_file), str(run_dir), RunOptions(chart_mode="inline", stage_cache=False, streaming=True))
+    monkeypatch.setattr(Checkpoint, "commit", commit)
+
+
+class TestCheckpoint:
+
+    def test_resume_matches_uninterrupted_run(self, tmp_path, synthetic_inputs, monkeypatch):
+        """
+        A run killed mid-QC keeps its committed chromosome (already in its outputs); resuming replays it, only checks
+        the rest and writes identical outputs.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        main(str(gff_file), str(fasta_file), str(tmp_path / "full"), RunOptions(chart_mode="inline", stage_cache=False, streaming=True))
+        assert not (tmp_path / "full" / CHECKPOINT_DIRNAME).exists()
+
+        run_dir = tmp_path / "interrupted"
+        interrupted_run(monkeypatch, gff_file, fasta_file, run_dir)
+        manifest = json.loads((run_dir / CHECKPOINT_DIRNAME / MANIFEST_FILENAME).read_text())
+        assert len(manifest["chunks"]) == 1
+        rows = (run_dir / "transcript_summary.tsv").read_text().splitlines()[1:]
+        assert len(rows) == manifest["chunks"][0]["transcripts"] #the committed chromosome already reached the outputs
+        assert manifest["main_args"]["gff_file"] == str(gff_file.resolve())
+
+        committed = []
+        commit = Checkpoint.commit
+        monkeypatch.setattr(Checkpoint, "commit", lambda self, chunk, results: committed.append(chunk) or commit(self, chunk, results))
+        assert resume_run(run_dir) == 0
+        assert manifest["chunks"][0]["name"] not in committed and committed
+        for name in OUTPUTS:
+            assert (run_dir / name).read_bytes() == (tmp_path / "full" / name).read_bytes(), name
+        full_shards = sorted(p.relative_to(tmp_path / "full") for p in (tmp_path / "full" / "explorer").rglob("*"))
+        assert full_shards == sorted(p.relative_to(run_dir) for p in (run_dir / "explorer").rglob("*"))
+        assert not (run_dir / CHECKPOINT_DIRNAME).exists()
+        assert (run_dir / "report.html").exists()
+
+    def test_resume_refuses_changed_input(self, tmp_path, synthetic_inputs, monkeypatch, capsys):
+        """
+        Resuming is refused if the GFF changed since the run started, and without a checkpoint there is nothing to resume.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        run_dir = tmp_path / "interrupted"
+        interrupted_run(monkeypatch, gff_file, fasta_file, run_dir)
+        with open(gff_file, "a") as handle:
+            handle.write("# edited\n")
+        with pytest.raises(SystemExit):
+            resume_run(run_dir)
+        assert "the gff input changed" in (run_dir / "gene_model_summariser.log").read_text()
+
+        assert resume_run(tmp_path / "elsewhere") == 1
+        assert "nothing to resume" in capsys.readouterr().err
@@ -0,0 +1,123 @@
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from Gene_Model_Summariser.cli import (
+    RUN_COUNTER_FILENAME,
+    allocate_run_dir,
+    get_next_run_dir,
+)
+from Gene_Model_Summariser.GroupB_Project5 import (
+    load_inputs_concurrently,
+    setup_logger,
+    validate_only,
+)
+
+HEAVY_MODULES = ("pandas", "matplotlib", "jinja2")
+
+
+#valid synthetic GFF3 + FASTA pair (10 genes) (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(genes=10, chrom_size=50_000, seed=1, defect_rate=0.0)
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+
+class TestCLI:
+
+    def test_help_does_not_import_heavy_modules(self):
+        """
+        --help must return before any of the pipeline dependencies are imported.
+        """
+        out = run_python(
+            "import sys\n"
+            "sys.argv = ['GroupB-tool', '--help']\n"
+            "from Gene_Model_Summariser.cli import app\n"
+            "try:\n    app()\nexcept SystemExit:\n    pass\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        assert out.strip().splitlines()[-1] == "[]"
+
+    def test_validate_only_skips_reporting_stack(self, tmp_path, synthetic_inputs):
+        """
+        --validate-only runs the checks, writes the log and never loads pandas/matplotlib/jinja2.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        out = run_python(
+            "import sys\n"
+            "from Gene_Model_Summariser.GroupB_Project5 import validate_only\n"
+            f"validate_only({str(gff_file)!r}, {str(fasta_file)!r}, {str(tmp_path / 'out')!r})\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        assert out.strip() == "[]"
+        log = (tmp_path / "out" / "gene_model_summariser.log").read_text()
+        assert "Validation passed" in log
+        assert not (tmp_path / "out" / "transcript_summary.tsv").exists()
+
+    def test_validate_only_fails_on_bad_gff(self, tmp_path):
+        """
+        The fixture GFF has an invalid CDS phase, so database validation fails with SystemExit.
+        """
+        gff = tmp_path / "models.gff3"
+        shutil.copy(Path(__file__).parent / "Fixtures" / "models.gff3", gff)
+        with pytest.raises(SystemExit):
+            validate_only(str(gff), None, str(tmp_path / "out"))
+
+
+class TestConcurrentInputs:
+
+    def test_both_branches_load(self, tmp_path, synthetic_inputs):
+        """
+        The GFF and FASTA branches run side by side and both results come back, with the database usable on this thread.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        logger = setup_logger(tmp_path / "run.log")
+        db, reference = load_inputs_concurrently(str(gff_file), str(fasta_file), logger)
+        assert db.count_features_of_type("gene") == 10
+        assert sorted(reference) == sorted(record.split()[0][1:] for record in fasta_file.read_text().splitlines()
+                                           if record.startswith(">"))
+
+    def test_errors_from_both_branches_are_logged(self, tmp_path):
+        """
+        A bad GFF does not hide a bad FASTA: both failures are logged before the run aborts.
+        """
+        gff = tmp_path / "models.gff3"
+        shutil.copy(Path(__file__).parent / "Fixtures" / "models.gff3", gff)
+        fasta = tmp_path / "bad.fa"
+        fasta.write_text("ACGTACGT\n") #no header line
+        logger = setup_logger(tmp_path / "run.log")
+        with pytest.raises(SystemExit):
+            load_inputs_concurrently(str(gff), str(fasta), logger)
+        log = (tmp_path / "run.log").read_text()
+        assert "GFF database validation" in log
+        assert "Invalid FASTA file provided" in log
+
+
+class TestRunDirAllocation:
+
+    def test_counter_seeded_from_existing_runs(self, tmp_path):
+        """
+        The first allocation continues after the highest existing run; later ones follow the counter and step over taken numbers.
+        """
+        for name in ("run_007", "run_010_old", "notes"):
+            (tmp_path / "results" / name).mkdir(parents=True)
+        assert get_next_run_dir(str(tmp_path)) == str(tmp_path / "results" / "run_011")
+        assert allocate_run_dir(str(tmp_path)) == str(tmp_path / "results" / "run_011")
+        assert (tmp_path / "results" / RUN_COUNTER_FILENAME).read_text() == "12\n"
+        (tmp_path / "results" / "run_012").mkdir() #made by hand, or by an older version
+        assert allocate_run_dir(str(tmp_path)) == str(tmp_path / "results" / "run_013")
+        assert (tmp_path / "results" / "run_013").is_dir()
+
+    def test_concurrent_jobs_get_distinct_dirs(self, tmp_path):
+        """
+        Jobs started at the same time against one results folder never share a run directory.
+        """
+        with ProcessPoolExecutor(max_workers=8) as pool:
+            run_dirs = list(pool.map(allocate_run_dir, [str(tmp_path)] * 40))
+        assert len(set(run_dirs)) == 40
+        assert sorted(Path(run_dir).name for run_dir in run_dirs) == [f"run_{i:03d}" for i in range(1, 41)]
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+
+import pytest
+
+from Gene_Model_Summariser.daemon import (
+    DaemonError,
+    LRUCache,
+    SummariserDaemon,
+    request,
+    serve,
+)
+
+#valid synthetic GFF3 + FASTA pair (10 genes) (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(genes=10, chrom_size=50_000, seed=6, defect_rate=0.0)
+
+
+@pytest.fixture
+def socket_path():
+    """
+    Short socket path (Unix socket paths are limited to ~100 characters, pytest's tmp_path can be longer).
+    """
+    directory = tempfile.mkdtemp(prefix="gms")
+    yield os.path.join(directory, "d.sock")
+    for name in os.listdir(directory):
+        os.unlink(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+class TestDaemon:
+
+    def test_lru_cache_evicts_oldest(self):
+        """
+        The least recently used entry is evicted (and handed to on_evict) once maxsize is exceeded.
+        """
+        evicted = []
+        cache = LRUCache(2, on_evict=evicted.append)
+        cache.get_or_load("a", lambda: "A")
+        cache.get_or_load("b", lambda: "B")
+        assert cache.get_or_load("a", lambda: "unused") == ("A", True)
+        cache.get_or_load("c", lambda: "C")
+        assert evicted == ["B"]
+        assert list(cache.items) == ["a", "c"]
+
+    def test_cached_inputs_reused_until_edited(self, tmp_path, synthetic_inputs):
+        """
+        A second job on the same inputs reuses the database and genome; editing the GFF forces a reload.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        daemon = SummariserDaemon()
+        events = []
+        job = {"gff": str(gff_file), "fasta": str(fasta_file), "options": {"chart_mode": "inline"}}
+
+        first = daemon.run({**job, "outdir": str(tmp_path / "run1")}, events.append)
+        second = daemon.run({**job, "outdir": str(tmp_path / "run2")}, events.append)
+        assert first["status"] == second["status"] == "ok"
+        assert first["cache"] == {"db": "miss", "genome": "miss"}
+        assert second["cache"] == {"db": "hit", "genome": "hit"}
+        assert [e["stage"] for e in events[:5]] == ["validate", "qc", "outputs", "report", "done"]
+        assert (tmp_path / "run1" / "transcript_summary.tsv").read_text() == (tmp_path / "run2" / "transcript_summary.tsv").read_text()
+
+        stat = os.stat(gff_file)
+        os.utime(gff_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        third = daemon.run({**job, "outdir": str(tmp_path / "run3")}, events.append)
+        assert third["cache"] == {"db": "miss", "genome": "hit"}
+
+    def test_socket_round_trip(self, tmp_path, synthetic_inputs, socket_path):
+        """
+        Jobs submitted over the socket stream progress events and end with the output paths; a job with an unknown option
+        is refused as a bad request; shutdown stops the server.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        with pytest.raises(DaemonError):
+            request(socket_path, {"command": "ping"})
+
+        server = threading.Thread(target=serve, args=(socket_path,))
+        server.start()
+        try:
+            for _ in range(100):
+                if os.path.exists(socket_path):
+                    break
+                threading.Event().wait(0.05)
+            assert request(socket_path, {"command": "ping"})["event"] == "pong"
+            stages = []
+            final = request(socket_path, {"command": "run", "gff": str(gff_file), "fasta": str(fasta_file),
+                                          "outdir": str(tmp_path / "out"), "options": {"chart_mode": "inline"}},
+                            on_event=lambda event: stages.append(event["stage"]))
+            assert final["status"] == "ok"
+            assert stages[-1] == "done"
+            assert str(tmp_path / "out" / "report.html") in final["outputs"]
+            assert request(socket_path, {"command": "stats"})["jobs_run"] == 1
+            bad = request(socket_path, {"command": "run", "gff": str(gff_file), "outdir": str(tmp_path / "bad"),
+                                        "options": {"charts": "inline"}})
+            assert bad == {"event": "error", "error": "bad request: unknown run option(s): charts"}
+        finally:
+            request(socket_path, {"command": "shutdown"})
+            server.join(timeout=10)
+        assert not os.path.exists(socket_path)
@@ -0,0 +1,186 @@
+import base64
+import gzip
+import json
+import re
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from Gene_Model_Summariser import html_generation
+from Gene_Model_Summariser.html_generation import (
+    compute_exon_count,
+    compute_report_stats,
+    compute_transcripts_per_gene_distribution,
+    report_stats_from_aggregator,
+    run_report,
+    save_report_figures,
+    stream_report_stats,
+)
+from Gene_Model_Summariser.stream_stats import TranscriptStatsAggregator
+from Gene_Model_Summariser.transcript_explorer import ExplorerWriter
+
+
+@pytest.fixture
+def transcript_rows():
+    """
+    Transcript summary rows covering: multiple isoforms per gene, odd/even median, missing flags and no CDS.
+    """
+    return [
+        {"gene_id": "g1", "transcript_id": "t1", "exon_count": 3, "has_cds": True, "flags": "", "start": 1, "end": 900},
+        {"gene_id": "g1", "transcript_id": "t2", "exon_count": 2, "has_cds": False, "flags": "no_CDS", "start": 5, "end": 400},
+        {"gene_id": "g1", "transcript_id": "t3", "exon_count": 7, "has_cds": True, "flags": "exon_count>5,overlapping_exons", "start": 1, "end": 5000},
+        {"gene_id": "g2", "transcript_id": "t4", "exon_count": 3, "has_cds": True, "flags": "", "start": 10, "end": 700},
+        {"gene_id": "g3", "transcript_id": "t5", "exon_count": 1, "has_cds": True, "flags": "invalid_start_codon", "start": 3, "end": 300},
+        {"gene_id": "g3", "transcript_id": "t6", "exon_count": 1, "has_cds": True, "flags": "", "start": 3, "end": 310},
+        {"gene_id": "g4", "transcript_id": "t7", "exon_count": 4, "has_cds": False, "flags": "no_CDS", "start": 50, "end": 1200},
+    ]
+
+
+@pytest.fixture
+def tsv_path(tmp_path, transcript_rows):
+    """
+    transcript_summary.tsv written the same way output_results writes it.
+    """
+    path = tmp_path / "transcript_summary.tsv"
+    pd.DataFrame(transcript_rows).to_csv(path, sep="\t", index=False)
+    return path
+
+
+class TestReportStats:
+
+    def test_in_memory_matches_dataframe(self, tsv_path, transcript_rows):
+        """
+        Stats streamed in memory must equal the pandas stats computed from the TSV on disk.
+        """
+        streamed = report_stats_from_aggregator(TranscriptStatsAggregator().add_all(transcript_rows))
+        expected = compute_report_stats(pd.read_csv(tsv_path, sep="\t"))
+
+        for key, value in expected["summary_metrics"].items():
+            assert streamed["summary_metrics"][key] == value
+        assert streamed["plot_inputs"] == expected["plot_inputs"]
+
+    def test_stream_from_disk_matches_in_memory(self, tsv_path, transcript_rows):
+        """
+        The standalone fallback (streaming the TSV with csv) gives the same stats as the in-memory path.
+        """
+        in_memory = report_stats_from_aggregator(TranscriptStatsAggregator().add_all(transcript_rows))
+        assert stream_report_stats(tsv_path) == in_memory
+
+    def test_vectorised_distributions(self, tsv_path):
+        """
+        The pandas distribution helpers return plain {int: int} dictionaries.
+        """
+        df = pd.read_csv(tsv_path, sep="\t")
+        assert compute_exon_count(df) == {3: 2, 2: 1, 7: 1, 1: 2, 4: 1}
+        assert compute_transcripts_per_gene_distribution(df) == {3: 1, 1: 2, 2: 1}
+
+
+class TestReportFigures:
+
+    def test_figures_cached_by_content_hash(self, tmp_path, tsv_path):
+        """
+        A second render with the same data and dpi reuses the PNGs; changing the dpi re-renders them.
+        """
+        plot_inputs = stream_report_stats(tsv_path)["plot_inputs"]
+        figures = save_report_figures(plot_inputs, tmp_path, dpi=50, workers=1)
+        pngs = [tmp_path / "figures" / name for name in figures.values()]
+        assert all(p.exists() for p in pngs)
+        first_mtimes = [p.stat().st_mtime_ns for p in pngs]
+
+        save_report_figures(plot_inputs, tmp_path, dpi=50, workers=1)
+        assert [p.stat().st_mtime_ns for p in pngs] == first_mtimes
+
+        save_report_figures(plot_inputs, tmp_path, dpi=60, workers=1)
+        assert all(p.stat().st_mtime_ns != m for p, m in zip(pngs, first_mtimes, strict=True))
+
+    def test_parallel_render(self, tmp_path, tsv_path):
+        """
+        Rendering in worker processes produces every figure.
+        """
+        plot_inputs = stream_report_stats(tsv_path)["plot_inputs"]
+        figures = save_report_figures(plot_inputs, tmp_path, dpi=40, workers=2)
+        assert all((tmp_path / "figures" / name).stat().st_size > 0 for name in figures.values())
+
+    def test_renders_in_process_by_default(self, tmp_path, tsv_path, monkeypatch):
+        """
+        Without a worker count no process pool is started, however many CPUs there are.
+        """
+        monkeypatch.setattr(html_generation.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(html_generation, "ProcessPoolExecutor", None)
+        plot_inputs = stream_report_stats(tsv_path)["plot_inputs"]
+        figures = save_report_figures(plot_inputs, tmp_path, dpi=40)
+        assert all((tmp_path / "figures" / name).exists() for name in figures.values())
+
+
+def test_inline_chart_report_without_matplotlib(tmp_path, tsv_path):
+    """
+    chart_mode="inline" writes a single-file report with embedded chart JSON and never imports matplotlib.
+    """
+    (tmp_path / "run.json").write_text(json.dumps({"tool": {}, "timestamp": {}, "inputs": {"gff": {}, "fasta": {}}}))
+    code = (
+        "import sys\n"
+        "from Gene_Model_Summariser.html_generation import run_report\n"
+        f"run_report({str(tmp_path)!r}, chart_mode='inline')\n"
+        "print('matplotlib' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert out.strip() == "False"
+    html = (tmp_path / "report.html").read_text()
+    assert 'id="chart-data"' in html
+    assert "<img" not in html
+    assert not (tmp_path / "figures").exists()
+
+
+def test_report_links_explorer_shards(tmp_path, tsv_path, transcript_rows):
+    """
+    The transcript explorer table is added to report.html only when explorer/ data exists, and no rows are inlined.
+    """
+    (tmp_path / "run.json").write_text(json.dumps({"tool": {}, "timestamp": {}, "inputs": {"gff": {}, "fasta": {}}}))
+    html = run_report(tmp_path, dpi=40).read_text()
+    assert "No explorer data for this run" in html
+
+    writer = ExplorerWriter(tmp_path)
+    for row in transcript_rows:
+        writer.add({**row, "chrom": "chr1", "strand": "+"})
+    writer.close()
+    html = run_report(tmp_path, dpi=40).read_text()
+    assert '<script src="explorer/index.js"></script>' in html
+    assert '"t7"' not in html
+
+
+def test_inline_report_embeds_explorer(tmp_path, tsv_path, transcript_rows):
+    """
+    chart_mode="inline" embeds the explorer index and shards, so the report loads no other file.
+    """
+    (tmp_path / "run.json").write_text(json.dumps({"tool": {}, "timestamp": {}, "inputs": {"gff": {}, "fasta": {}}}))
+    writer = ExplorerWriter(tmp_path, shard_size=2)
+    for row in transcript_rows:
+        writer.add({**row, "chrom": "chr1", "strand": "+"})
+    writer.close()
+    html = run_report(tmp_path, chart_mode="inline").read_text()
+    assert not re.search(r"""\bsrc\s*=""", html)
+    assert "explorer/" not in html and "figures/" not in html
+
+    embedded = json.loads(re.search(r'<script type="application/json" id="explorer-data">(.*?)</script>', html, re.DOTALL).group(1))
+    assert embedded["index"]["total"] == len(transcript_rows)
+    rows = [row for payload in embedded["shards"].values() for row in json.loads(gzip.decompress(base64.b64decode(payload)))]
+    assert sorted(row[1] for row in rows) == sorted(row["transcript_id"] for row in transcript_rows)
+
+
+def test_inline_report_links_large_explorer(tmp_path, tsv_path, transcript_rows, monkeypatch, caplog):
+    """
+    Explorer data over EMBED_MAX_ROWS transcripts is loaded from explorer/ even in inline mode, and the log says so.
+    """
+    monkeypatch.setattr(html_generation, "EMBED_MAX_ROWS", len(transcript_rows) - 1)
+    (tmp_path / "run.json").write_text(json.dumps({"tool": {}, "timestamp": {}, "inputs": {"gff": {}, "fasta": {}}}))
+    writer = ExplorerWriter(tmp_path, shard_size=2)
+    for row in transcript_rows:
+        writer.add({**row, "chrom": "chr1", "strand": "+"})
+    writer.close()
+    with caplog.at_level("INFO", logger="GroupB_logger"):
+        html = run_report(tmp_path, chart_mode="inline").read_text()
+    assert '<script src="explorer/index.js"></script>' in html
+    assert 'id="explorer-data"' not in html
+    assert "instead of embedding it" in caplog.text
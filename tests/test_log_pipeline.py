@@ -0,0 +1,67 @@
+import json
+import logging
+import time
+from pathlib import Path
+
+from Gene_Model_Summariser import log_pipeline
+from Gene_Model_Summariser.batch import BatchJob, run_batch
+from Gene_Model_Summariser.log_pipeline import (
+    flush_logs,
+    json_log_path,
+    start_run_log,
+    stop_run_log,
+)
+from Gene_Model_Summariser.run_options import RunOptions
+from Gene_Model_Summariser.synthetic_data import (
+    SyntheticConfig,
+    write_synthetic_dataset,
+)
+
+
+class TestLogPipeline:
+
+    def test_records_are_written_off_the_calling_thread(self, tmp_path, monkeypatch):
+        """
+        With a slow disk, info() returns at once and the records are written later; error() waits until it is written.
+        """
+        log_file = tmp_path / "run.log"
+        logger = start_run_log(log_file, json_log=True)
+        text_handler = log_pipeline._run_pipeline.handlers[0]
+        emit = text_handler.emit
+        monkeypatch.setattr(text_handler, "emit", lambda record: time.sleep(0.05) or emit(record))
+
+        start = time.perf_counter()
+        for i in range(10):
+            logger.info(f"checked chunk {i}")
+        assert time.perf_counter() - start < 0.05
+        logger.error("bad line")
+        assert time.perf_counter() - start >= 0.5
+        assert log_file.read_text().splitlines()[-1].startswith("ERROR - ")
+
+        logger.info("done")
+        flush_logs()
+        records = [json.loads(line) for line in json_log_path(log_file).read_text().splitlines()]
+        assert [r["message"] for r in records] == [f"checked chunk {i}" for i in range(10)] + ["bad line", "done"]
+        assert records[-2]["level"] == "ERROR" and records[0]["thread"] == "MainThread"
+        stop_run_log()
+        assert logging.getLogger("GroupB_logger").handlers == []
+
+    def test_batch_workers_share_one_log(self, tmp_path):
+        """
+        Worker processes forward their records to the parent, which alone writes the shared log; run logs are kept too.
+        """
+        jobs = []
+        for i in range(2):
+            gff_file, fasta_file = write_synthetic_dataset(tmp_path / "data", SyntheticConfig(genes=6, chrom_size=30_000, seed=i),
+                                                           prefix=f"v{i}")
+            jobs.append(BatchJob(gff=str(gff_file), fasta=str(fasta_file), outdir=str(tmp_path / "out")))
+        shared = tmp_path / "batch.log"
+        results = run_batch(jobs, RunOptions(chart_mode="inline", stage_cache=False, json_log=True), workers=2, log_file=shared)
+        assert [r["status"] for r in results] == ["ok", "ok"]
+
+        records = [json.loads(line) for line in json_log_path(shared).read_text().splitlines()]
+        runs = {r["run"] for r in records if "run" in r}
+        assert runs == {r["run_dir"] for r in results}
+        assert len(shared.read_text().splitlines()) == len(records)
+        for result in results:
+            assert "HTML report written to" in (Path(result["run_dir"]) / "gene_model_summariser.log").read_text()
@@ -0,0 +1,107 @@
+import os
+import random
+
+import gffutils
+import pytest
+from Bio import SeqIO
+
+from Gene_Model_Summariser.packed_genome import (
+    PackedGenome,
+    build_packed_genome,
+    default_cache_path,
+    is_cache_fresh,
+)
+from Gene_Model_Summariser.QC_check import QC_flags
+
+
+@pytest.fixture
+def masked_fasta(tmp_path):
+    """
+    Random mixed-case sequences with N runs and other IUPAC runs, including one shorter than a packed byte.
+    """
+    rng = random.Random(7)
+    sequences = {}
+    for i in range(3):
+        bases = [rng.choice("ACGTacgt") for _ in range(rng.randint(500, 3000))]
+        for _ in range(10):
+            start = rng.randrange(len(bases))
+            end = min(len(bases), start + rng.randint(1, 40))
+            bases[start:end] = rng.choice("NNRYn") * (end - start)
+        sequences[f"chr{i}"] = "".join(bases)
+    sequences["tiny"] = "GCA"
+    path = tmp_path / "genome.fa"
+    with open(path, "w") as handle:
+        for name, seq in sequences.items():
+            handle.write(f">{name} description\n")
+            for i in range(0, len(seq), 60):
+                handle.write(seq[i:i + 60] + "\n")
+    return path, {name: seq.upper() for name, seq in sequences.items()}
+
+
+class TestPackedGenome:
+
+    def test_fetch_and_counts_match_sequence(self, masked_fasta):
+        """
+        Decoded sub-ranges, GC counts and N counts equal the plain (upper-case) sequence.
+        """
+        path, sequences = masked_fasta
+        rng = random.Random(1)
+        with PackedGenome.open_or_build(path) as genome:
+            assert list(genome) == list(sequences)
+            for name, seq in sequences.items():
+                chrom = genome[name]
+                assert str(chrom.seq) == seq
+                assert chrom.gc_count() == seq.count("G") + seq.count("C")
+                assert chrom.n_count() == seq.count("N")
+                for _ in range(200):
+                    start = rng.randrange(len(seq) + 1)
+                    end = rng.randrange(start, len(seq) + 1)
+                    assert chrom[start:end] == seq[start:end]
+                    part = seq[start:end]
+                    assert chrom.gc_count(start, end) == part.count("G") + part.count("C")
+                    assert chrom.n_count(start, end) == part.count("N")
+
+    def test_cache_rebuilt_when_fasta_changes(self, masked_fasta):
+        """
+        The cache is reused while the FASTA is unchanged and rebuilt once it is modified.
+        """
+        path, _ = masked_fasta
+        PackedGenome.open_or_build(path).close()
+        cache = default_cache_path(path)
+        assert is_cache_fresh(path, cache)
+        with open(path, "a") as handle:
+            handle.write(">extra\nACGT\n")
+        os.utime(path, ns=(0, 0))
+        assert not is_cache_fresh(path, cache)
+        with PackedGenome.open_or_build(path) as genome:
+            assert str(genome["extra"]) == "ACGT"
+
+    def test_build_uses_its_own_temp_files(self, masked_fasta, tmp_path):
+        """
+        A build does not touch temporary files another build of the same cache may be writing, and leaves none of its own.
+        """
+        path, sequences = masked_fasta
+        cache = tmp_path / "shared.gms2bit"
+        others = [tmp_path / "shared.gms2bit.tmp", tmp_path / "shared.gms2bit.data.tmp"]
+        for other in others:
+            other.write_text("another build")
+        build_packed_genome(path, cache)
+        assert all(other.read_text() == "another build" for other in others)
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["genome.fa", cache.name] + [o.name for o in others])
+        with PackedGenome(cache) as genome:
+            assert {name: str(genome[name].seq) for name in genome} == sequences
+
+    @pytest.mark.synthetic(genes=12, chrom_size=30_000, seed=5, n_run_rate=0.5)
+    def test_qc_flags_identical(self, synthetic_inputs):
+        """
+        QC_flags gives the same flags from the packed genome as from the SeqRecord dict.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        db = gffutils.create_db(str(gff_file), ":memory:", keep_order=True)
+        records = SeqIO.to_dict(SeqIO.parse(str(fasta_file), "fasta"))
+        expected = QC_flags(db, records).transcript_QC()
+        with PackedGenome.open_or_build(fasta_file) as genome:
+            assert QC_flags(db, genome).transcript_QC() == expected
+            packed_metrics = QC_flags(db, genome).process_all_sequences()
+        for chrom, metrics in QC_flags(db, records).process_all_sequences().items():
+            assert packed_metrics[chrom] == pytest.approx(metrics)
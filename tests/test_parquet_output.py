@@ -0,0 +1,83 @@
+import json
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.html_generation import (
+    compute_summary_metrics,
+    load_outputs,
+    run_report,
+    stream_report_stats,
+)
+from Gene_Model_Summariser.parquet_output import (
+    PARQUET_FILENAME,
+    ParquetSummaryWriter,
+    read_parquet_summary,
+)
+from Gene_Model_Summariser.run_options import RunOptions
+
+#synthetic GFF3 + FASTA pair spread over several chromosomes, with defects (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(seed=9)
+
+
+class TestParquetOutput:
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_parquet_matches_tsv(self, tmp_path, synthetic_inputs, streaming):
+        """
+        --parquet writes the TSV's rows with a typed schema: dictionary-encoded labels, integers, a real bool and a flag list.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        out = tmp_path / "run"
+        main(str(gff_file), str(fasta_file), str(out), RunOptions(chart_mode="inline", stage_cache=False, streaming=streaming, parquet=True))
+        table = pq.read_table(out / PARQUET_FILENAME)
+        assert pa.types.is_dictionary(table.schema.field("gene_id").type)
+        assert pa.types.is_dictionary(table.schema.field("chrom").type)
+        assert pa.types.is_dictionary(table.schema.field("flags").type.value_type)
+        assert table.schema.field("has_cds").type == pa.bool_()
+        assert table.schema.field("exon_count").type == pa.int32()
+
+        tsv = pd.read_csv(out / "transcript_summary.tsv", sep="\t", keep_default_na=False)
+        parquet = read_parquet_summary(out / PARQUET_FILENAME)
+        assert len(parquet) == len(tsv) and (parquet["flags"] != "").any()
+        for frame in (tsv, parquet):
+            frame["gene_id"] = frame["gene_id"].astype(str)
+            frame["chrom"] = frame["chrom"].astype(str)
+            frame["strand"] = frame["strand"].astype(str)
+            frame.sort_values("transcript_id", inplace=True, ignore_index=True)
+        pd.testing.assert_frame_equal(parquet, tsv, check_dtype=False)
+
+    def test_row_groups_and_load_outputs(self, tmp_path):
+        """
+        Rows are written one row group at a time, and load_outputs reads the Parquet file with the same metrics as the TSV.
+        """
+        rows = [{"gene_id": f"g{i // 3}", "transcript_id": f"t{i}", "exon_count": i % 5 + 1, "has_cds": i % 4 != 0,
+                 "chrom": f"chr{i % 2}", "start": i * 100 + 1, "end": i * 100 + 90, "strand": "+-"[i % 2],
+                 "flags": "no_CDS" if i % 4 == 0 else ""} for i in range(25)]
+        with ParquetSummaryWriter(tmp_path / PARQUET_FILENAME, row_group_size=10) as writer:
+            for row in rows:
+                writer.add(row)
+        assert pq.ParquetFile(tmp_path / PARQUET_FILENAME).metadata.num_row_groups == 3
+
+        (tmp_path / "run.json").write_text(json.dumps({"tool": {"name": "t", "version": "v"}}))
+        df, run_info = load_outputs(tmp_path)
+        assert df["has_cds"].dtype == bool
+        assert run_info["tool"]["version"] == "v"
+        assert compute_summary_metrics(df) == compute_summary_metrics(pd.DataFrame(rows))
+
+    def test_report_regenerated_from_parquet(self, tmp_path, synthetic_inputs):
+        """
+        Regenerating a report reads transcript_summary.parquet when the run has one, with the TSV's stats.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        out = tmp_path / "run"
+        main(str(gff_file), str(fasta_file), str(out), RunOptions(chart_mode="inline", stage_cache=False, parquet=True))
+        expected = stream_report_stats(out / "transcript_summary.tsv")
+        (out / "transcript_summary.tsv").rename(tmp_path / "transcript_summary.tsv")
+        run_report(out, chart_mode="inline")
+        summary = json.loads((out / "summary.json").read_text())
+        assert summary["summary_metrics"] == expected["summary_metrics"]
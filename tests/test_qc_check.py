@@ -1,8 +1,13 @@
-import pytest
-import gffutils
 from pathlib import Path
+
+import gffutils
+import pytest
+
 from Gene_Model_Summariser.QC_check import QC_flags
 
+#flags set by QC_flags.check_cds_quality
+QC_CDS_FLAGS = {"invalid_CDS_phase", "N_in_CDS", "ambiguous_bases_in_CDS", "CDS_not_multiple_of_3", "invalid_start_codon", "invalid_stop_codon", "CDS_too_short"}
+
 @pytest.fixture
 def gff_db_fixture(tmp_path):
     """
@@ -19,7 +24,7 @@ def fasta_file_fixture():
     """
     Return path to fixture FASTA file.
     """
-    from Bio.SeqIO import to_dict, parse
+    from Bio.SeqIO import parse, to_dict
     fasta_path = Path(__file__).parent / "Fixtures" / "ref.fasta"
     return to_dict(parse(str(fasta_path), 'fasta'))
 
@@ -54,3 +59,32 @@ class TestQCCheck:
         
         # Test tx2 has no_CDS flag
         assert "no_CDS" in flags.get("tx2", [])
+
+    def test_shared_cds_checked_once(self, tmp_path):
+        """
+        Isoforms with the same CDS structure are checked once and get the same flags as checking each on its own.
+        """
+        import logging
+
+        from Gene_Model_Summariser.fasta_validator import FastaChecker
+        from Gene_Model_Summariser.gff_parser import GFF_Parser
+        from Gene_Model_Summariser.synthetic_data import (
+            SyntheticConfig,
+            write_synthetic_dataset,
+        )
+
+        gff_file, fasta_file = write_synthetic_dataset(tmp_path, SyntheticConfig(genes=20, isoforms=3, chrom_size=80_000, seed=2, defect_rate=0.3))
+        db = gffutils.create_db(str(gff_file), dbfn=str(tmp_path / "synthetic.db"), force=True, keep_order=True)
+        fasta = FastaChecker(str(fasta_file), logging.getLogger("GroupB_logger")).fasta_parse()
+        qc_checker = QC_flags(db, fasta)
+        flags = qc_checker.transcript_QC()
+
+        assert qc_checker.cds_dedup['shared_cds'] > 0
+        assert sum(qc_checker.cds_dedup.values()) == sum(1 for features in GFF_Parser(db).transcript_model().values() if features['CDS(s)'])
+        for transcript_id, features in GFF_Parser(db).transcript_model().items():
+            if not features['CDS(s)']:
+                continue
+            gene = db[features['gene']]
+            own = {transcript_id: []}
+            qc_checker.check_cds_quality(transcript_id, features, str(fasta[gene.seqid].seq), gene.strand, own)
+            assert [f for f in flags[transcript_id] if f in QC_CDS_FLAGS] == own[transcript_id]
@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+
+from Gene_Model_Summariser.fasta_validator import FastaChecker
+from Gene_Model_Summariser.gff_parser import FeatureCoords
+from Gene_Model_Summariser.GroupB_Project5 import load_gff_database, main
+from Gene_Model_Summariser.QC_check import QC_flags
+from Gene_Model_Summariser.qc_memo import (
+    QCMemo,
+    default_memo_path,
+    open_memo,
+    transcript_key,
+)
+from Gene_Model_Summariser.run_options import RunOptions
+
+#synthetic GFF3 + FASTA pair with defects, so the memo stores a mix of flags (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(genes=30, chrom_size=120_000, seed=7)
+
+
+class TestQCMemo:
+
+    def test_key_tracks_structure_and_bases(self):
+        """
+        The key changes with the CDS phase or the bases under the CDS, but not with bases outside it.
+        """
+        exons = [FeatureCoords(1, 20, ".")]
+        cds = [FeatureCoords(4, 12, "0")]
+        key = transcript_key("chr1", "+", exons, cds, "AAAATGAAATAAGGGG")
+        assert key == transcript_key("chr1", "+", exons, cds, "CCCATGAAATAAGGGG")
+        assert key != transcript_key("chr1", "+", exons, [FeatureCoords(4, 12, "1")], "AAAATGAAATAAGGGG")
+        assert key != transcript_key("chr1", "+", exons, cds, "AAAATGACATAAGGGG")
+        assert key != transcript_key("chr1", "-", exons, cds, "AAAATGAAATAAGGGG")
+
+    def test_memo_matches_plain_qc(self, tmp_path, synthetic_inputs):
+        """
+        The first memoised run matches plain QC with no hits; the second is served entirely from the memo.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        db = load_gff_database(str(gff_file))
+        fasta = FastaChecker(str(fasta_file), logging.getLogger("GroupB_logger")).fasta_parse()
+        expected = QC_flags(db, fasta).transcript_QC()
+        assert any(expected.values())
+
+        with QCMemo(tmp_path / "memo.sqlite") as memo:
+            assert QC_flags(db, fasta, memo=memo).transcript_QC() == expected
+            assert memo.hits == 0 and memo.misses == len(expected)
+        with QCMemo(tmp_path / "memo.sqlite") as memo:
+            assert QC_flags(db, fasta, memo=memo).transcript_QC() == expected
+            assert memo.stats()["hit_rate"] == 1.0
+
+    def test_hit_rate_reported_in_run_json(self, tmp_path, synthetic_inputs):
+        """
+        main(qc_memo=True) keeps the memo next to the FASTA and records its hit rate in run.json.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        for run in ("run_001", "run_002"):
+            main(str(gff_file), str(fasta_file), str(tmp_path / run), RunOptions(chart_mode="inline", qc_memo=True, stage_cache=False))
+        first = json.loads((tmp_path / "run_001" / "run.json").read_text())["qc"]["memo"]
+        second = json.loads((tmp_path / "run_002" / "run.json").read_text())["qc"]["memo"]
+        assert first["path"] == str(default_memo_path(fasta_file))
+        assert first["hit_rate"] == 0.0 and second["hit_rate"] == 1.0
+        assert (tmp_path / "run_001" / "transcript_summary.tsv").read_text() == (tmp_path / "run_002" / "transcript_summary.tsv").read_text()
+
+    def test_duplicated_exon_matches_plain_qc(self, tmp_path, synthetic_inputs):
+        """
+        Two exon features with the same coordinates are both kept by the memo path, as by plain QC (overlapping_exons).
+        """
+        gff_file, fasta_file = synthetic_inputs
+        lines = gff_file.read_text().splitlines(keepends=True)
+        exon = next(line for line in lines if "\texon\t" in line)
+        transcript_id = exon.rstrip("\n").split("Parent=")[1]
+        lines.insert(lines.index(exon) + 1, exon.replace("exon1;", "exon1_copy;"))
+        gff_file.write_text("".join(lines))
+        db = load_gff_database(str(gff_file))
+        fasta = FastaChecker(str(fasta_file), logging.getLogger("GroupB_logger")).fasta_parse()
+        expected = QC_flags(db, fasta).transcript_QC()
+        assert "overlapping_exons" in expected[transcript_id]
+
+        with QCMemo(tmp_path / "memo.sqlite") as memo:
+            assert QC_flags(db, fasta, memo=memo).transcript_QC() == expected
+
+    def test_unusable_memo_path_falls_back(self, tmp_path, synthetic_inputs):
+        """
+        A memo SQLite cannot open is replaced by one in the results folder beside the run, or by no memo, with a warning.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        unusable = tmp_path / "missing_dir" / "memo.sqlite"
+        run_dir = tmp_path / "results" / "run_001"
+        main(str(gff_file), str(fasta_file), str(run_dir), RunOptions(chart_mode="inline", qc_memo=True, qc_memo_path=str(unusable)))
+        memo = json.loads((run_dir / "run.json").read_text())["qc"]["memo"]
+        assert memo["path"] == str(tmp_path / "results" / "memo.sqlite")
+        assert f"QC memo: cannot use {unusable}" in (run_dir / "gene_model_summariser.log").read_text()
+
+        assert open_memo(unusable, tmp_path / "also_missing") is None
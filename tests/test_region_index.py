@@ -0,0 +1,103 @@
+import csv
+import json
+
+import pytest
+
+from Gene_Model_Summariser.api import query_region
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.region_index import (
+    INDEX_FILENAME,
+    RegionIndex,
+    parse_region,
+    query_app,
+)
+from Gene_Model_Summariser.run_options import RunOptions
+
+pytestmark = pytest.mark.synthetic(seed=5)
+
+
+@pytest.fixture
+def run_dir(tmp_path, synthetic_inputs):
+    """
+    Finished run over a synthetic GFF3 + FASTA pair spread over several chromosomes, with defects.
+    """
+    gff_file, fasta_file = synthetic_inputs
+    out = tmp_path / "run_001"
+    main(str(gff_file), str(fasta_file), str(out), RunOptions(chart_mode="inline", stage_cache=False))
+    return out
+
+
+def read_rows(path):
+    with open(path, newline="") as handle:
+        return list(csv.DictReader(handle, delimiter="\t"))
+
+
+def scan(rows, chrom, start, end):
+    #reference answer: a full scan of the TSV
+    return sorted(row["transcript_id"] for row in rows
+                  if row["chrom"] == chrom and int(row["start"]) <= end and int(row["end"]) >= start)
+
+
+class TestRegionIndex:
+
+    def test_queries_match_full_scan(self, run_dir):
+        """
+        The run writes transcript_index.npz, and region queries return exactly the overlapping rows a full scan finds.
+        """
+        assert (run_dir / INDEX_FILENAME).exists()
+        rows = read_rows(run_dir / "transcript_summary.tsv")
+        index = RegionIndex(run_dir)
+        assert sorted(index.chromosomes) == sorted({row["chrom"] for row in rows})
+        for chrom in index.chromosomes:
+            for start, end in [(1, 1), (1, 10_000), (15_000, 15_500), (20_000, 45_000), (59_000, 10_000_000)]:
+                found = [row["transcript_id"] for row in index.query(chrom, start, end)]
+                assert sorted(found) == scan(rows, chrom, start, end)
+            assert len(list(index.query(chrom))) == sum(row["chrom"] == chrom for row in rows)
+        assert list(index.query("missing", 1, 100)) == []
+
+    def test_api_and_stale_index(self, run_dir):
+        """
+        query_region returns TranscriptResults (optionally flagged only), and an index older than its TSV is rebuilt.
+        """
+        rows = read_rows(run_dir / "transcript_summary.tsv")
+        chrom = rows[0]["chrom"]
+        results = query_region(run_dir, chrom)
+        assert {r.transcript_id for r in results} == {row["transcript_id"] for row in rows if row["chrom"] == chrom}
+        assert any(r.flagged for r in results)
+        assert all(r.flagged for r in query_region(run_dir / "transcript_summary.tsv", chrom, flagged_only=True))
+
+        tsv = run_dir / "transcript_summary.tsv"
+        lines = tsv.read_text().splitlines(keepends=True)
+        tsv.write_text(lines[0] + "".join(line for line in lines[1:] if line.split("\t")[4] != chrom))
+        assert query_region(run_dir, chrom) == []
+
+    def test_query_command(self, run_dir, capsys):
+        """
+        GroupB-tool query filters by flag and writes TSV or JSON lines; bad regions are reported.
+        """
+        rows = read_rows(run_dir / "transcript_summary.tsv")
+        flag = next(row["flags"].split(",")[0] for row in rows if row["flags"])
+        assert query_app([str(run_dir), *sorted({row["chrom"] for row in rows}), "--flag", flag, "--json"]) == 0
+        found = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert sorted(r["transcript_id"] for r in found) == sorted(row["transcript_id"] for row in rows if flag in row["flags"].split(","))
+
+        assert query_app([str(run_dir), "chr1:5-1"]) == 1
+        assert "end is before start" in capsys.readouterr().err
+        assert parse_region("chr3:1,200,000-1,400,000") == ("chr3", 1_200_000, 1_400_000)
+        assert parse_region("chr3") == ("chr3", 1, None)
+
+    def test_long_transcript_does_not_widen_queries(self, tmp_path):
+        """
+        A transcript spanning the whole chromosome does not turn later queries into scans: only overlapping rows are visited.
+        """
+        tsv = tmp_path / "transcript_summary.tsv"
+        rows = [("g0", "t_long", 1, 100_000_000)] + [(f"g{i}", f"t{i}", i * 1000, i * 1000 + 500) for i in range(1, 20_001)]
+        with open(tsv, "w") as handle:
+            handle.write("gene_id\ttranscript_id\texon_count\thas_cds\tchrom\tstart\tend\tstrand\tflags\n")
+            handle.writelines(f"{gene_id}\t{transcript_id}\t1\tTrue\tchr1\t{start}\t{end}\t+\t\n" for gene_id, transcript_id, start, end in rows)
+        index = RegionIndex(tsv)
+        found = [row["transcript_id"] for row in index.query("chr1", 15_000_000, 15_003_000)]
+        assert found == ["t_long", "t15000", "t15001", "t15002", "t15003"]
+        assert index.rows_visited == len(found)
+        assert [row["transcript_id"] for row in index.query("chr1", 30_000_000, 30_001_000)] == ["t_long"]
+        assert index.rows_visited == len(found) + 1
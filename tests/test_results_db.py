@@ -0,0 +1,83 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.results_db import RESULTS_DB_FILENAME
+from Gene_Model_Summariser.run_options import RunOptions
+
+#synthetic GFF3 + FASTA pair spread over several chromosomes, with defects (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(seed=3)
+
+
+def tsv_rows(path):
+    with open(path, newline="") as handle:
+        return sorted((row["transcript_id"], row["gene_id"], int(row["exon_count"]), int(row["has_cds"] == "True"), row["chrom"],
+                       int(row["start"]), int(row["end"]), row["strand"], ",".join(sorted(filter(None, row["flags"].split(",")))))
+                      for row in csv.DictReader(handle, delimiter="\t"))
+
+
+def db_rows(conn):
+    return sorted((transcript_id, gene_id, exon_count, has_cds, chrom, start, end, strand, ",".join(sorted(filter(None, flags.split(",")))))
+                  for gene_id, transcript_id, exon_count, has_cds, chrom, start, end, strand, flags
+                  in conn.execute("SELECT * FROM transcript_summary"))
+
+
+class TestResultsDatabase:
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_database_matches_tsv(self, tmp_path, synthetic_inputs, streaming):
+        """
+        --sqlite writes the same rows as transcript_summary.tsv, with flags normalised and the run metadata from run.json.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        out = tmp_path / "run"
+        main(str(gff_file), str(fasta_file), str(out), RunOptions(chart_mode="inline", stage_cache=False, streaming=streaming, sqlite=True))
+        conn = sqlite3.connect(out / RESULTS_DB_FILENAME)
+        assert db_rows(conn) == tsv_rows(out / "transcript_summary.tsv")
+        assert any(row[-1] for row in db_rows(conn))
+        flag_names = [name for (name,) in conn.execute("SELECT name FROM flags")]
+        assert len(flag_names) == len(set(flag_names)) > 0
+        run = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM run")}
+        assert run["inputs"]["gff"]["path"] == str(gff_file)
+        assert not (out / (RESULTS_DB_FILENAME + ".tmp")).exists()
+        conn.close()
+
+    def test_lookups_use_indexes(self, tmp_path, synthetic_inputs):
+        """
+        Lookups by gene, transcript, flag and region are answered from indexes, not table scans.
+        """
+        gff_file, _ = synthetic_inputs
+        out = tmp_path / "run"
+        main(str(gff_file), None, str(out), RunOptions(chart_mode="inline", stage_cache=False, explorer=False, sqlite=True))
+        conn = sqlite3.connect(out / RESULTS_DB_FILENAME)
+        queries = [
+            "SELECT * FROM transcripts WHERE gene_id = 'g1'",
+            "SELECT * FROM transcripts WHERE transcript_id = 't1'",
+            'SELECT * FROM transcripts WHERE chrom = \'chr1\' AND start <= 5000 AND "end" >= 1000',
+            "SELECT t.* FROM flags f JOIN transcript_flags tf ON tf.flag_id = f.id JOIN transcripts t ON t.id = tf.transcript WHERE f.name = 'x'",
+        ]
+        for query in queries:
+            plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + query))
+            assert "SCAN" not in plan, (query, plan)
+        conn.close()
+
+    def test_reused_database_describes_this_run(self, tmp_path, synthetic_inputs):
+        """
+        When the stage cache copies the QC outputs of an earlier run, the database's run table is rewritten for this run.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        runs = [tmp_path / "results" / "run_001", tmp_path / "results" / "run_002"]
+        for out in runs:
+            main(str(gff_file), str(fasta_file), str(out), RunOptions(chart_mode="inline", stage_cache=True, sqlite=True))
+        run_json = json.loads((runs[1] / "run.json").read_text())
+        assert run_json["stages"]["qc"]["reused_from"] == str(runs[0])
+        conn = sqlite3.connect(runs[1] / RESULTS_DB_FILENAME)
+        run = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM run")}
+        conn.close()
+        assert run["started"] == run_json["timestamp"]["start"]
+        assert run["inputs"] == run_json["inputs"]
+        earlier = json.loads((runs[0] / "run.json").read_text())
+        assert run_json["stages"]["qc"]["outputs"][RESULTS_DB_FILENAME] != earlier["stages"]["qc"]["outputs"][RESULTS_DB_FILENAME]
@@ -0,0 +1,75 @@
+import csv
+import json
+
+import pandas as pd
+import pytest
+
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.run_diff import (
+    DELTA_FILENAME,
+    SUMMARY_FILENAME,
+    diff_app,
+    diff_runs,
+)
+from Gene_Model_Summariser.run_options import RunOptions
+
+
+def summary_row(transcript_id, gene_id="g1", chrom="chr1", start=100, end=900, exon_count=3, has_cds=True, flags=""):
+    return {"gene_id": gene_id, "transcript_id": transcript_id, "exon_count": exon_count, "has_cds": has_cds,
+            "chrom": chrom, "start": start, "end": end, "strand": "+", "flags": flags}
+
+
+@pytest.fixture
+def release_tsvs(tmp_path):
+    """
+    Two transcript_summary.tsv files: one transcript each added and removed, one moved, one gaining and one losing flags.
+    """
+    old = [summary_row("t1"), summary_row("t2", flags="no_CDS"), summary_row("t3", start=5000, end=6000),
+           summary_row("t4"), summary_row("t5", flags="exon_count>5,overlapping_exons")] + \
+          [summary_row(f"u{i}", gene_id=f"g{i}", start=i * 1000 + 1, end=i * 1000 + 500) for i in range(10)]
+    new = [summary_row("t1"), summary_row("t2"), summary_row("t3", start=5200, end=6000, exon_count=4),
+           summary_row("t5", flags="exon_count>5,invalid_stop_codon"), summary_row("t6", gene_id="g9", flags="no_CDS")] + \
+          [summary_row(f"u{i}", gene_id=f"g{i}", start=i * 1000 + 1, end=i * 1000 + 500) for i in reversed(range(10))]
+    paths = []
+    for name, rows in (("old", old), ("new", new)):
+        (tmp_path / name).mkdir()
+        pd.DataFrame(rows).to_csv(tmp_path / name / "transcript_summary.tsv", sep="\t", index=False)
+        paths.append(tmp_path / name)
+    return paths
+
+
+class TestRunDiff:
+
+    def test_delta_and_summary(self, tmp_path, release_tsvs):
+        """
+        Added, removed, moved and re-flagged transcripts are reported (with spilled sort chunks); unchanged ones are not.
+        """
+        old, new = release_tsvs
+        summary = diff_runs(old, new, tmp_path / "diff", chunk_size=3)
+        with open(tmp_path / "diff" / DELTA_FILENAME, newline="") as handle:
+            delta = {row["transcript_id"]: row for row in csv.DictReader(handle, delimiter="\t")}
+
+        assert set(delta) == {"t2", "t3", "t4", "t5", "t6"}
+        assert delta["t4"]["change"] == "removed" and delta["t6"]["change"] == "added"
+        assert delta["t3"]["changed_fields"] == "start:5000>5200;exon_count:3>4"
+        assert (delta["t2"]["flags_gained"], delta["t2"]["flags_lost"]) == ("", "no_CDS")
+        assert (delta["t5"]["flags_gained"], delta["t5"]["flags_lost"]) == ("invalid_stop_codon", "overlapping_exons")
+        assert summary["transcripts"] == {"old": 15, "new": 15, "unchanged": 11, "added": 1, "removed": 1, "changed": 3,
+                                          "structure_changed": 1, "flags_changed": 2}
+        assert summary["flags"]["no_CDS"] == {"gained": 0, "lost": 1}
+        assert {"from": "no_CDS", "to": "", "count": 1} in summary["flag_transitions"]
+        assert json.loads((tmp_path / "diff" / SUMMARY_FILENAME).read_text()) == summary
+        assert {p.name for p in (tmp_path / "diff").iterdir()} == {DELTA_FILENAME, SUMMARY_FILENAME} #spill files removed
+
+    @pytest.mark.synthetic(genes=30, chrom_size=1_000_000, seed=4)
+    def test_run_against_gff(self, tmp_path, synthetic_inputs, capsys):
+        """
+        A run directory compared with its own GFF (checked directly against the same FASTA) has no differences.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        main(str(gff_file), str(fasta_file), str(tmp_path / "run"), RunOptions(chart_mode="inline", stage_cache=False, explorer=False))
+        assert diff_app([str(tmp_path / "run"), str(gff_file), "-f", str(fasta_file), "-o", str(tmp_path / "diff")]) == 0
+        summary = json.loads((tmp_path / "diff" / SUMMARY_FILENAME).read_text())
+        assert summary["transcripts"]["unchanged"] == summary["transcripts"]["old"] == summary["transcripts"]["new"] > 0
+        assert summary["flagged"]["old"] == summary["flagged"]["new"] > 0
+        assert "0 added, 0 removed, 0 changed" in capsys.readouterr().out
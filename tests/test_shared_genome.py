@@ -0,0 +1,57 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import gffutils
+import pytest
+from Bio import SeqIO
+
+from Gene_Model_Summariser.QC_check import QC_flags
+from Gene_Model_Summariser.shared_genome import SharedGenome
+
+#synthetic GFF3 + FASTA with some defective models so QC raises sequence flags (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(genes=12, chrom_size=30_000, seed=4)
+
+
+def slice_in_worker(genome: SharedGenome, name: str, start: int, end: int) -> str:
+    return genome[name][start:end]
+
+
+class TestSharedGenome:
+
+    def test_matches_biopython(self, synthetic_inputs):
+        """
+        Sequences, slices and lengths read from shared memory equal the SeqIO records.
+        """
+        records = SeqIO.to_dict(SeqIO.parse(str(synthetic_inputs[1]), "fasta"))
+        with SharedGenome.from_fasta(synthetic_inputs[1]) as genome:
+            assert list(genome) == list(records)
+            for name, record in records.items():
+                view = genome[name]
+                assert len(view) == len(record.seq)
+                assert str(view.seq) == str(record.seq)
+                assert view[100:250] == str(record.seq[100:250])
+                assert view[-3:] == str(record.seq[-3:])
+                assert view[7] == record.seq[7]
+            assert genome.get("missing") is None
+
+    def test_workers_attach_without_copying(self, synthetic_inputs):
+        """
+        A pickled SharedGenome is just the block name and offset table; workers read the same memory.
+        """
+        with SharedGenome.from_fasta(synthetic_inputs[1]) as genome:
+            assert len(pickle.dumps(genome)) < 1000
+            name = next(iter(genome))
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                assert pool.submit(slice_in_worker, genome, name, 10, 60).result() == genome[name][10:60]
+
+    def test_qc_flags_identical(self, synthetic_inputs):
+        """
+        QC_flags gives the same flags from a SharedGenome as from the SeqRecord dict.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        db = gffutils.create_db(str(gff_file), ":memory:", keep_order=True)
+        records = SeqIO.to_dict(SeqIO.parse(str(fasta_file), "fasta"))
+        expected = QC_flags(db, records).transcript_QC()
+        with SharedGenome.from_records(records) as genome:
+            assert QC_flags(db, genome).transcript_QC() == expected
+        assert any(expected.values())
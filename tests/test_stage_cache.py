@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from Gene_Model_Summariser import stage_cache
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.run_options import RunOptions
+from Gene_Model_Summariser.stage_cache import StageCache, stage_key
+
+#valid synthetic GFF3 + FASTA pair (20 genes, some defects so every output is written) (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(genes=20, chrom_size=80_000, seed=4)
+
+
+def stages(run_dir):
+    return json.loads((run_dir / "run.json").read_text())["stages"]
+
+
+class TestStageCache:
+
+    def test_rerun_reuses_qc_outputs(self, tmp_path, synthetic_inputs):
+        """
+        A second run on identical inputs copies the QC outputs from the first instead of recomputing them.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        run1, run2 = tmp_path / "results" / "run_001", tmp_path / "results" / "run_002"
+        main(str(gff_file), str(fasta_file), str(run1), RunOptions(chart_mode="inline", stage_cache=True))
+        main(str(gff_file), str(fasta_file), str(run2), RunOptions(chart_mode="inline", stage_cache=True))
+
+        assert stages(run1)["qc"]["reused_from"] is None
+        assert stages(run2)["qc"]["reused_from"] == str(run1)
+        assert stages(run2)["qc"]["outputs"] == stages(run1)["qc"]["outputs"]
+        for name in ("transcript_summary.tsv", "qc_flagged.bed", "qc_flags.gff3", "explorer/index.js"):
+            assert (run2 / name).read_bytes() == (run1 / name).read_bytes()
+        assert (run2 / "report.html").exists()
+
+    def test_changed_input_or_edited_output_recomputes(self, tmp_path, synthetic_inputs):
+        """
+        A changed FASTA recomputes QC (but skips GFF validation); an edited previous output is never reused.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        results = tmp_path / "results"
+        main(str(gff_file), str(fasta_file), str(results / "run_001"), RunOptions(chart_mode="inline", stage_cache=True))
+
+        fasta_file.write_text(fasta_file.read_text() + ">extra\nACGT\n")
+        main(str(gff_file), str(fasta_file), str(results / "run_002"), RunOptions(chart_mode="inline", stage_cache=True))
+        assert stages(results / "run_002")["qc"]["reused_from"] is None
+        assert "GFF already validated" in (results / "run_002" / "gene_model_summariser.log").read_text()
+
+        (results / "run_002" / "transcript_summary.tsv").write_text("edited\n")
+        main(str(gff_file), str(fasta_file), str(results / "run_003"), RunOptions(chart_mode="inline", stage_cache=True))
+        assert stages(results / "run_003")["qc"]["reused_from"] is None
+        assert (results / "run_003" / "transcript_summary.tsv").read_text() != "edited\n"
+
+    def test_off_by_default(self, tmp_path, synthetic_inputs, monkeypatch):
+        """
+        Without stage_cache=True a rerun on identical inputs recomputes QC, and no input or output is hashed.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        hashed = []
+        digest = stage_cache.file_digest
+        monkeypatch.setattr(stage_cache, "file_digest", lambda path, *args: hashed.append(path) or digest(path, *args))
+        main(str(gff_file), str(fasta_file), str(tmp_path / "results" / "run_001"), RunOptions(chart_mode="inline"))
+        main(str(gff_file), str(fasta_file), str(tmp_path / "results" / "run_002"), RunOptions(chart_mode="inline"))
+        assert stages(tmp_path / "results" / "run_002") == {}
+        assert "Stage cache" not in (tmp_path / "results" / "run_002" / "gene_model_summariser.log").read_text()
+        assert hashed == []
+
+    def test_disabled_cache_never_reuses(self, tmp_path):
+        """
+        StageCache(enabled=False) ignores matching earlier runs and records nothing.
+        """
+        previous = tmp_path / "run_001"
+        previous.mkdir()
+        key = stage_key("qc", gff="abc", fasta=None, explorer=True)
+        (previous / "run.json").write_text(json.dumps({"timestamp": {"end": "2026-01-01T00:00:00"},
+                                                       "stages": {"qc": {"key": key, "outputs": {}}}}))
+        assert StageCache(tmp_path / "run_002", enabled=True).lookup("qc", key) == previous
+        cache = StageCache(tmp_path / "run_002", enabled=False)
+        assert cache.lookup("qc", key) is None
+        cache.record("qc", key)
+        assert cache.stages == {}
@@ -0,0 +1,169 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+from Gene_Model_Summariser.html_generation import (
+    compute_summary_metrics,
+    compute_transcripts_per_gene_distribution,
+)
+from Gene_Model_Summariser.stream_stats import (
+    IntHistogram,
+    QuantileSketch,
+    TranscriptStatsAggregator,
+)
+
+
+def make_rows(n_genes, seed=0):
+    """
+    Rows grouped by gene, as GFF_Parser.tsv_output produces them.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for g in range(n_genes):
+        for t in range(rng.randint(1, 4)):
+            start = rng.randint(1, 10_000)
+            rows.append({"gene_id": f"g{g}", "transcript_id": f"g{g}.t{t}", "exon_count": rng.randint(1, 12),
+                         "has_cds": rng.random() < 0.8, "flags": rng.choice(["", "", "no_CDS", "exon_count>5,N_in_CDS"]),
+                         "start": start, "end": start + rng.randint(100, 50_000)})
+    return rows
+
+
+class TestQuantileSketch:
+
+    def test_relative_accuracy(self):
+        """
+        Quantiles from the sketch stay within the configured relative error of the exact values.
+        """
+        rng = random.Random(1)
+        values = sorted(rng.lognormvariate(8, 1.5) for _ in range(20_000))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+        for q in (0.1, 0.5, 0.9, 0.99):
+            exact = values[round(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= 0.01 * exact + 1e-9
+        assert len(sketch.buckets) < 1000
+
+    def test_merge_equals_single_sketch(self):
+        """
+        Merging two partial sketches gives the same buckets as one sketch over all values.
+        """
+        values = [float(v) for v in range(1, 5000)]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for v in values:
+            whole.add(v)
+            (left if v % 2 else right).add(v)
+        left.merge(right)
+        assert left.buckets == whole.buckets
+        assert left.quantile(0.5) == whole.quantile(0.5)
+
+
+class TestIntHistogram:
+
+    def test_exact_median_matches_interpolation(self):
+        """
+        Even-sized input uses the pandas/numpy linear interpolation between the middle values.
+        """
+        histogram = IntHistogram()
+        for v in (1, 2, 3, 4):
+            histogram.add(v)
+        assert histogram.quantile(0.5) == 2.5
+        assert histogram.mean() == 2.5
+        assert histogram.max == 4
+
+    def test_overflow_goes_to_sketch(self):
+        """
+        Values above max_exact are kept in the overflow sketch and still ranked after the exact values.
+        """
+        histogram = IntHistogram(max_exact=10)
+        for v in (1, 2, 500):
+            histogram.add(v)
+        assert histogram.distribution() == {1: 1, 2: 1}
+        assert histogram.quantile(1.0) == pytest.approx(500, rel=0.01)
+
+
+class TestTranscriptStatsAggregator:
+
+    def test_merge_of_partitions_matches_single_pass(self):
+        """
+        Two workers each aggregating whole genes, merged, give the same report as one pass.
+        """
+        rows = make_rows(300)
+        single = TranscriptStatsAggregator().add_all(rows)
+        split = next(i for i, r in enumerate(rows) if r["gene_id"] == "g150")
+        left = TranscriptStatsAggregator().add_all(rows[:split])
+        right = TranscriptStatsAggregator().add_all(rows[split:])
+        left.merge(right)
+        assert left.summary_metrics() == single.summary_metrics()
+        assert left.plot_inputs() == single.plot_inputs()
+
+    def test_round_trip_dict(self):
+        """
+        to_dict/from_dict preserve the aggregate (used to pass partial results between processes).
+        """
+        aggregator = TranscriptStatsAggregator().add_all(make_rows(50))
+        restored = TranscriptStatsAggregator.from_dict(aggregator.to_dict())
+        assert restored.summary_metrics() == aggregator.summary_metrics()
+        assert restored.plot_inputs() == aggregator.plot_inputs()
+
+    def test_summary_mid_stream_keeps_gene_open(self):
+        """
+        Asking for metrics mid-stream must not split the gene that is still receiving transcripts.
+        """
+        aggregator = TranscriptStatsAggregator()
+        aggregator.add({"gene_id": "g1", "transcript_id": "t1", "exon_count": 1, "has_cds": True, "flags": ""})
+        assert aggregator.summary_metrics()["total_genes"] == 1
+        aggregator.add({"gene_id": "g1", "transcript_id": "t2", "exon_count": 1, "has_cds": True, "flags": ""})
+        metrics = aggregator.summary_metrics()
+        assert metrics["total_genes"] == 1
+        assert metrics["transcript_max"] == 2
+
+    def test_interleaved_genes_match_dataframe(self):
+        """
+        With grouped=False, rows whose genes are not contiguous count each gene once, as the DataFrame path does.
+        """
+        rows = make_rows(40, seed=3)
+        random.Random(4).shuffle(rows)
+        aggregator = TranscriptStatsAggregator(grouped=False).add_all(rows)
+        df = pd.DataFrame(rows)
+        expected = compute_summary_metrics(df)
+        metrics = aggregator.summary_metrics()
+        assert metrics["total_genes"] == expected["total_genes"] == 40
+        assert metrics["transcript_mean"] == expected["transcript_mean"]
+        assert aggregator.plot_inputs()["transcripts_per_gene_bar_data"] == compute_transcripts_per_gene_distribution(df)
+
+        left = TranscriptStatsAggregator(grouped=False).add_all(rows[::2])
+        left.merge(TranscriptStatsAggregator(grouped=False).add_all(rows[1::2]))
+        assert left.summary_metrics() == metrics
+
+    def test_merge_of_gene_split_across_partitions(self):
+        """
+        A gene whose transcripts are cut between partitions (either end, or one gene spanning a whole partition) is
+        still one gene after merge().
+        """
+        rows = make_rows(20, seed=5)
+        single = TranscriptStatsAggregator().add_all(rows)
+        multi = [i for i in range(1, len(rows)) if rows[i]["gene_id"] == rows[i - 1]["gene_id"]] #cuts inside a gene
+        cuts = [0, multi[0], multi[0] + 1, multi[3], len(rows)]
+        merged = TranscriptStatsAggregator()
+        for lo, hi in itertools.pairwise(cuts):
+            part = TranscriptStatsAggregator.from_dict(TranscriptStatsAggregator().add_all(rows[lo:hi]).to_dict())
+            merged.merge(part)
+        assert merged.summary_metrics() == single.summary_metrics()
+        assert merged.plot_inputs() == single.plot_inputs()
+
+    def test_gene_memory_is_constant(self):
+        """
+        Grouped rows keep no per-gene state, and the histogram is built once until more rows arrive.
+        """
+        aggregator = TranscriptStatsAggregator().add_all(make_rows(500, seed=6))
+        assert aggregator.gene_transcripts == {}
+        assert len(aggregator.open_genes()) == 2
+        assert aggregator.summary_metrics()["total_genes"] == 500
+        assert aggregator.gene_histogram() is aggregator.gene_histogram()
+        histogram = aggregator.gene_histogram()
+        aggregator.add({"gene_id": "g500", "transcript_id": "t", "exon_count": 1, "has_cds": True, "flags": ""})
+        assert aggregator.gene_histogram() is not histogram
+        assert aggregator.summary_metrics()["total_genes"] == 501
@@ -0,0 +1,73 @@
+import csv
+
+import pytest
+
+from Gene_Model_Summariser.GroupB_Project5 import main
+from Gene_Model_Summariser.run_options import RunOptions
+from Gene_Model_Summariser.streaming import ChromosomeReference
+
+#synthetic GFF3 + FASTA pair spread over several chromosomes, with defects (synthetic_inputs, see conftest.py)
+pytestmark = pytest.mark.synthetic(seed=11)
+
+
+def read_rows(path):
+    with open(path, newline="") as handle:
+        return list(csv.DictReader(handle, delimiter="\t"))
+
+
+class TestStreaming:
+
+    def test_streaming_matches_default_outputs(self, tmp_path, synthetic_inputs):
+        """
+        Streaming mode writes the same TSV rows, BED lines and GFF records as the default mode, in (seqid, start) order.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        for streaming in (False, True):
+            main(str(gff_file), str(fasta_file), str(tmp_path / f"streaming_{streaming}"),
+                 RunOptions(chart_mode="inline", stage_cache=False, streaming=streaming))
+        default, streamed = tmp_path / "streaming_False", tmp_path / "streaming_True"
+
+        rows = read_rows(streamed / "transcript_summary.tsv")
+        assert len({row["chrom"] for row in rows}) > 1
+        assert sorted(map(tuple, (r.items() for r in rows))) == sorted(map(tuple, (r.items() for r in read_rows(default / "transcript_summary.tsv"))))
+        chrom_order = list(dict.fromkeys(row["chrom"] for row in rows))
+        assert chrom_order == sorted(chrom_order)
+        for chrom in chrom_order:
+            starts = [int(row["start"]) for row in rows if row["chrom"] == chrom]
+            assert starts == sorted(starts)
+        for name in ("qc_flagged.bed", "qc_flags.gff3"):
+            assert sorted((streamed / name).read_text().splitlines()) == sorted((default / name).read_text().splitlines())
+        assert (streamed / "explorer" / "index.js").exists()
+
+    def test_streaming_keeps_duplicated_exons(self, tmp_path, synthetic_inputs):
+        """
+        Two exon features with the same coordinates are both counted in streaming mode, as in the default mode.
+        """
+        gff_file, fasta_file = synthetic_inputs
+        lines = gff_file.read_text().splitlines(keepends=True)
+        exon = next(line for line in lines if "\texon\t" in line)
+        lines.insert(lines.index(exon) + 1, exon.replace("exon1;", "exon1_copy;"))
+        gff_file.write_text("".join(lines))
+        for streaming in (False, True):
+            main(str(gff_file), str(fasta_file), str(tmp_path / f"streaming_{streaming}"),
+                 RunOptions(chart_mode="inline", stage_cache=False, streaming=streaming, explorer=False))
+        default = {row["transcript_id"]: row for row in read_rows(tmp_path / "streaming_False" / "transcript_summary.tsv")}
+        streamed = {row["transcript_id"]: row for row in read_rows(tmp_path / "streaming_True" / "transcript_summary.tsv")}
+        assert streamed == default
+        transcript_id = exon.rstrip("\n").split("Parent=")[1]
+        assert "overlapping_exons" in streamed[transcript_id]["flags"]
+
+    def test_chromosome_reference_keeps_one_record(self, synthetic_inputs):
+        """
+        ChromosomeReference reads records on demand and only holds the last one requested.
+        """
+        _, fasta_file = synthetic_inputs
+        reference = ChromosomeReference(fasta_file)
+        names = list(reference)
+        assert len(names) > 1 and len(reference) == len(names)
+        first = reference[names[0]]
+        assert reference[names[0]] is first
+        second = reference.get(names[1])
+        assert reference.current == (names[1], second)
+        assert reference.get("missing") is None
+        reference.close()
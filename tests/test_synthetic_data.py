@@ -0,0 +1,88 @@
+import logging
+
+import gffutils
+import pytest
+
+from Gene_Model_Summariser import benchmark
+from Gene_Model_Summariser.benchmark import STAGES, compare_benchmarks, run_benchmarks
+from Gene_Model_Summariser.fasta_validator import FastaChecker
+from Gene_Model_Summariser.gff_validator import check_db, validate_raw_gff_lines
+from Gene_Model_Summariser.QC_check import QC_flags
+from Gene_Model_Summariser.synthetic_data import (
+    SyntheticConfig,
+    write_synthetic_dataset,
+)
+
+
+@pytest.fixture
+def synthetic_dataset(tmp_path):
+    """
+    Small synthetic dataset: 20 genes x 3 isoforms x 4 exons spread over several chromosomes.
+    """
+    config = SyntheticConfig(genes=20, isoforms=3, exons=4, chrom_size=30_000, seed=7)
+    return write_synthetic_dataset(tmp_path, config)
+
+
+class TestSyntheticData:
+
+    def test_deterministic(self, tmp_path):
+        """
+        The same config must always produce byte-identical files; a different seed must not.
+        """
+        config = SyntheticConfig(genes=10, seed=3)
+        gff_a, fasta_a = write_synthetic_dataset(tmp_path / "a", config)
+        gff_b, fasta_b = write_synthetic_dataset(tmp_path / "b", config)
+        gff_c, _ = write_synthetic_dataset(tmp_path / "c", SyntheticConfig(genes=10, seed=4))
+        assert gff_a.read_bytes() == gff_b.read_bytes()
+        assert fasta_a.read_bytes() == fasta_b.read_bytes()
+        assert gff_a.read_bytes() != gff_c.read_bytes()
+
+    def test_counts(self, tmp_path, synthetic_dataset):
+        """
+        Feature counts follow the config and genes spill onto more than one chromosome.
+        """
+        gff_file, fasta_file = synthetic_dataset
+        db = gffutils.create_db(str(gff_file), dbfn=str(tmp_path / "syn.db"), force=True, keep_order=True)
+        assert db.count_features_of_type("gene") == 20
+        assert db.count_features_of_type("mRNA") == 60
+        assert db.count_features_of_type("exon") == 240
+        assert fasta_file.read_text().count(">") > 1
+
+    def test_passes_validation_without_flags(self, tmp_path, synthetic_dataset):
+        """
+        Defect-free synthetic data passes every validator and produces no QC flags.
+        """
+        gff_file, fasta_file = synthetic_dataset
+        assert validate_raw_gff_lines(gff_file)
+        db = gffutils.create_db(str(gff_file), dbfn=str(tmp_path / "syn.db"), force=True, keep_order=True)
+        assert check_db(db)
+        checker = FastaChecker(fasta_file, logging.getLogger("GroupB_logger"))
+        assert checker.validate_fasta()
+        flags = QC_flags(db, checker.fasta_parse()).transcript_QC()
+        assert len(flags) == 60
+        assert all(not f for f in flags.values())
+
+    def test_defects_are_flagged(self, tmp_path):
+        """
+        With defect_rate=1 every transcript gets a non-ATG start codon.
+        """
+        gff_file, fasta_file = write_synthetic_dataset(tmp_path, SyntheticConfig(genes=5, defect_rate=1.0))
+        db = gffutils.create_db(str(gff_file), dbfn=str(tmp_path / "syn.db"), force=True, keep_order=True)
+        checker = FastaChecker(fasta_file, logging.getLogger("GroupB_logger"))
+        flags = QC_flags(db, checker.fasta_parse()).transcript_QC()
+        assert all(f == ["invalid_start_codon"] for f in flags.values())
+
+
+def test_benchmark_reports_every_stage(tmp_path, monkeypatch):
+    """
+    A tiny benchmark run reports timings and peak memory for every stage main() reports, writes its runs into the
+    given workdir without creating a temporary directory, and compares against itself with ratio 1.
+    """
+    monkeypatch.setattr(benchmark.tempfile, "TemporaryDirectory", None)
+    document = run_benchmarks([5], chrom_size=50_000, workdir=tmp_path, cold_start=False)
+    result = document["results"][0]
+    assert result["transcripts"] == 10
+    assert list(result["stages"]) == STAGES
+    assert all(stage["seconds"] >= 0 and stage["peak_bytes"] > 0 for stage in result["stages"].values())
+    assert (tmp_path / "genes_5" / "run_time" / "report.html").exists()
+    assert all(row["ratio"] == 1 for row in compare_benchmarks(document, document) if row["ratio"] is not None)
@@ -0,0 +1,78 @@
+import pytest
+
+from Gene_Model_Summariser.transcript_explorer import (
+    ExplorerWriter,
+    load_index,
+    read_shard,
+)
+
+
+def make_row(i: int, chrom: str, flags: str = "") -> dict:
+    return {"gene_id": f"g{i // 2}", "transcript_id": f"t{i}", "exon_count": 3, "has_cds": True,
+            "chrom": chrom, "start": 100 * i + 1, "end": 100 * i + 90, "strand": "+", "flags": flags}
+
+
+@pytest.fixture
+def rows():
+    """
+    25 transcripts over two chromosomes; every third one is flagged, every fifth has two flags.
+    """
+    rows = []
+    for i in range(25):
+        flags = "no_CDS" if i % 3 == 0 else ""
+        if i % 5 == 0:
+            flags = "invalid_start_codon,overlapping_exons"
+        rows.append(make_row(i, "chr1" if i < 15 else "chr2", flags))
+    return rows
+
+
+class TestExplorerWriter:
+
+    def test_shards_round_trip_and_index_counts(self, tmp_path, rows):
+        """
+        Every row ends up in exactly one single-chromosome shard, and the index counts match the rows.
+        """
+        writer = ExplorerWriter(tmp_path, shard_size=4)
+        for row in rows:
+            writer.add(row)
+        index = writer.close()
+
+        assert index == load_index(tmp_path)
+        assert index["total"] == 25
+        decoded = []
+        for shard in index["shards"]:
+            shard_rows = read_shard(tmp_path / "explorer" / shard["file"])
+            assert len(shard_rows) == shard["count"] <= 4
+            assert {r[4] for r in shard_rows} == {shard["chrom"]}
+            assert shard["flagged"] == sum(1 for r in shard_rows if r[8])
+            assert shard["start"] == min(r[5] for r in shard_rows)
+            decoded.extend(shard_rows)
+        assert sorted(r[1] for r in decoded) == sorted(r["transcript_id"] for r in rows)
+        assert sum(s["flags"].get("no_CDS", 0) for s in index["shards"]) == 7
+        assert set(index["chroms"]) == {"chr1", "chr2"}
+        for flag, shard_ids in index["flags"].items():
+            assert all(index["shards"][i]["flags"][flag] > 0 for i in shard_ids)
+
+    def test_interleaved_chromosomes_are_flushed(self, tmp_path):
+        """
+        Rows arriving from many chromosomes at once are written out once max_buffered rows are waiting.
+        """
+        writer = ExplorerWriter(tmp_path, shard_size=100, max_buffered=10)
+        for i in range(30):
+            writer.add(make_row(i, f"scaffold_{i % 7}"))
+            assert writer.buffered < 10
+        index = writer.close()
+        assert sum(s["count"] for s in index["shards"]) == 30
+
+    def test_stale_shards_removed(self, tmp_path, rows):
+        """
+        Re-running in the same directory must not leave shards from the previous run behind.
+        """
+        writer = ExplorerWriter(tmp_path, shard_size=2)
+        for row in rows:
+            writer.add(row)
+        writer.close()
+        writer = ExplorerWriter(tmp_path, shard_size=100)
+        writer.add(rows[0])
+        writer.close()
+        assert sorted(p.name for p in (tmp_path / "explorer").iterdir()) == ["index.js", "shard_00000.js"]